@@ -0,0 +1,145 @@
+import os
+import numpy as np
+from typing import Dict, Optional
+
+
+class ReductionPyramid:
+    """Bucketed min/max/mean summaries of a 1-D series at geometrically coarser resolutions.
+
+    Level 0 buckets hold ``base`` points, and each level above merges
+    ``factor`` buckets of the one below. ``view`` picks the coarsest level
+    that still gives at least one bucket per pixel, so a curve can be drawn
+    at screen resolution in time independent of the series length, while the
+    min/max band keeps every spike visible.
+    """
+    def __init__(self, values: np.ndarray, base: int = 16, factor: int = 4):
+        self.base = base
+        self.factor = factor
+        self.n = 0
+        self.values = values
+        self.levels = []
+        self.extend(values)
+
+    def extend(self, values: np.ndarray) -> "ReductionPyramid":
+        """Bring the pyramid up to values, whose first n entries are the ones it already summarizes.
+
+        Full buckets are final, so each level only recomputes from its last
+        partial bucket on; the result equals a pyramid built from scratch.
+        """
+        base, factor = self.base, self.factor
+        keep = self.n // base if self.levels else 0
+        self.n = len(values)
+        self.values = values
+        if self.n == 0:
+            self.levels = []
+            return self
+        starts = np.arange(keep * base, self.n, base)
+        tail = values[keep * base:]
+        offsets = starts - keep * base
+        level = self._splice(0, keep, {
+            "min": np.minimum.reduceat(tail, offsets),
+            "max": np.maximum.reduceat(tail, offsets),
+            "sum": np.add.reduceat(tail, offsets, dtype=np.float64),
+            "count": np.diff(np.append(starts, self.n)),
+        })
+        depth = 0
+        while len(level["count"]) > factor:
+            depth += 1
+            # A bucket is final once the factor buckets below it are
+            keep = keep // factor if depth < len(self.levels) else 0
+            lower = {key: column[keep * factor:] for key, column in level.items()}
+            starts = np.arange(0, len(lower["count"]), factor)
+            level = self._splice(depth, keep, {
+                "min": np.minimum.reduceat(lower["min"], starts),
+                "max": np.maximum.reduceat(lower["max"], starts),
+                "sum": np.add.reduceat(lower["sum"], starts),
+                "count": np.add.reduceat(lower["count"], starts),
+            })
+        del self.levels[depth + 1:]
+        return self
+
+    def _splice(self, depth: int, keep: int, fresh: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Level depth's first keep buckets followed by fresh ones"""
+        if depth < len(self.levels):
+            old = self.levels[depth]
+            self.levels[depth] = {key: np.concatenate([old[key][:keep], fresh[key]]) for key in fresh}
+        else:
+            self.levels.append(fresh)
+        return self.levels[depth]
+
+    def summarizes(self, values: np.ndarray) -> bool:
+        """Whether values starts with the series this pyramid was built on (checked on its last full bucket)"""
+        if len(values) < self.n:
+            return False
+        full = self.n // self.base
+        if full == 0:
+            return True
+        bucket = values[(full - 1) * self.base:full * self.base]
+        level = self.levels[0]
+        return (bucket.min() == level["min"][full - 1] and bucket.max() == level["max"][full - 1]
+                and np.add.reduceat(bucket, [0], dtype=np.float64)[0] == level["sum"][full - 1])
+
+    def bucket_size(self, level: int) -> int:
+        return self.base * self.factor ** level
+
+    def view(self, n_pixels: int, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """x, min, max and mean of [start, stop) with at least n_pixels points (raw values if short)"""
+        stop = self.n if stop is None else min(stop, self.n)
+        span = max(stop - start, 0)
+        level = -1
+        while level + 1 < len(self.levels) and span // self.bucket_size(level + 1) >= n_pixels:
+            level += 1
+        if level < 0:
+            raw = np.asarray(self.values[start:stop], dtype=np.float64)
+            x = np.arange(start, stop, dtype=np.float64)
+            return {"x": x, "min": raw, "max": raw, "mean": raw}
+
+        size = self.bucket_size(level)
+        data = self.levels[level]
+        lo, hi = start // size, -(-stop // size)
+        counts = data["count"][lo:hi]
+        x = np.arange(lo, hi) * size + (counts - 1) / 2
+        return {"x": x, "min": data["min"][lo:hi], "max": data["max"][lo:hi],
+                "mean": data["sum"][lo:hi] / counts}
+
+    def save(self, path: str):
+        arrays = {"n": np.array(self.n), "base": np.array(self.base), "factor": np.array(self.factor)}
+        for i, level in enumerate(self.levels):
+            for key, values in level.items():
+                arrays[f"{key}_{i}"] = values
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, values: np.ndarray) -> "ReductionPyramid":
+        with np.load(path) as data:
+            pyramid = cls.__new__(cls)
+            pyramid.n = int(data["n"])
+            pyramid.base = int(data["base"])
+            pyramid.factor = int(data["factor"])
+            pyramid.values = values
+            pyramid.levels = []
+            while f"count_{len(pyramid.levels)}" in data.files:
+                i = len(pyramid.levels)
+                pyramid.levels.append({key: data[f"{key}_{i}"] for key in ("min", "max", "sum", "count")})
+        return pyramid
+
+
+def cached_pyramid(aggregator, column: str = "cumulative_r") -> Optional[ReductionPyramid]:
+    """Pyramid over a MonitorAggregator column, stored next to its cache and extended as rows are appended"""
+    aggregator.update()
+    values = aggregator.column(column)
+    if values is None:
+        return None
+    path = os.path.join(aggregator.cache_dir, f"{aggregator.name}.{column}.pyramid.npz")
+    if os.path.exists(path):
+        pyramid = ReductionPyramid.load(path, values)
+        if pyramid.n == len(values):
+            return pyramid
+        if pyramid.summarizes(values):
+            pyramid.extend(values)
+        else:
+            pyramid = ReductionPyramid(values)  # log rewritten
+    else:
+        pyramid = ReductionPyramid(values)
+    pyramid.save(path)
+    return pyramid
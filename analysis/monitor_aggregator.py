@@ -0,0 +1,177 @@
+import hashlib
+import io
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+CACHE_DIR = "./logs/.cache"
+CHUNK_BYTES = 64 * 1024 * 1024  # parse appended rows in bounded chunks
+STATE_VERSION = 1
+DERIVED_COLUMNS = ("cumulative_r", "rolling_r")
+
+
+class MonitorAggregator:
+    """Incrementally mirrors one reward log into append-only float64 column files.
+
+    Works for SB3 monitor CSVs (``#{json}`` line, then ``r,l,t``) and plain
+    CSVs with an ``r`` column. Only bytes appended since the last ``update``
+    are parsed, and a trailing line that is still being written is left for
+    the next call. Besides the raw columns the cache keeps ``cumulative_r``
+    and ``rolling_r`` (mean of the last ``window`` rewards), so readers never
+    touch the CSV.
+
+    Cache layout in ``cache_dir``, where ``<name>`` is the log's stem plus a hash
+    of its absolute path: ``<name>.<column>.f64`` per column plus
+    ``<name>.state.json`` with the byte offset, row count, file header and
+    the last bytes parsed, which together detect a log rewritten in place.
+    """
+    def __init__(self, path: str, is_monitor: bool = True, cache_dir: str = CACHE_DIR, window: int = 100):
+        self.path = path
+        self.is_monitor = is_monitor
+        self.cache_dir = cache_dir
+        self.window = window
+        # Keyed on the absolute path: sweeps/a/trial/monitor.csv and sweeps/b/trial/monitor.csv must not
+        # collide; the stem only keeps cache files recognizable
+        absolute_path = os.path.abspath(path)
+        digest = hashlib.sha1(absolute_path.encode()).hexdigest()[:16]
+        self.name = f"{os.path.splitext(os.path.basename(absolute_path))[0]}_{digest}"
+        self._state_path = os.path.join(cache_dir, f"{self.name}.state.json")
+        self.state = self._load_state()
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.name}.{column}.f64")
+
+    def _empty_state(self) -> Dict:
+        return {"version": STATE_VERSION, "window": self.window, "offset": 0, "rows": 0,
+                "first_line": None, "columns": [], "marker": ""}
+
+    def _load_state(self) -> Dict:
+        if not os.path.exists(self._state_path):
+            return self._empty_state()
+        with open(self._state_path) as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION or state.get("window") != self.window:
+            return self._empty_state()
+        return state
+
+    def _save_state(self):
+        tmp_path = self._state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self._state_path)
+
+    def _all_columns(self):
+        return self.state["columns"] + list(DERIVED_COLUMNS)
+
+    def _reset(self):
+        for column in self._all_columns():
+            if os.path.exists(self._column_path(column)):
+                os.remove(self._column_path(column))
+        self.state = self._empty_state()
+
+    def _tail(self, column: str, n: int) -> np.ndarray:
+        """Last n cached values of a column"""
+        rows = self.state["rows"]
+        if rows == 0 or n <= 0:
+            return np.empty(0)
+        n = min(n, rows)
+        with open(self._column_path(column), "rb") as f:
+            f.seek((rows - n) * 8)
+            return np.fromfile(f, dtype=np.float64, count=n)
+
+    def update(self) -> int:
+        """Parse rows appended since the last call; returns how many were added"""
+        if not os.path.exists(self.path):
+            return 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.path, "rb") as f:
+            first_line = f.readline().decode(errors="replace")
+            size = os.fstat(f.fileno()).st_size
+            # The log was rewritten (new run, truncated file): start over
+            offset = self.state["offset"]
+            marker = bytes.fromhex(self.state.get("marker", ""))
+            if offset:
+                f.seek(offset - len(marker))
+            if (self.state["first_line"] not in (None, first_line) or size < offset
+                    or (offset and f.read(len(marker)) != marker)):
+                self._reset()
+
+            if self.state["offset"] == 0:
+                f.seek(0)
+                if self.is_monitor:
+                    f.readline()  # '#{"t_start": ...}' metadata
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return 0  # header not fully written yet
+                self.state["first_line"] = first_line
+                self.state["columns"] = header.decode().strip().split(",")
+                self.state["offset"] = f.tell()
+            self._truncate_columns()
+
+            added = 0
+            f.seek(self.state["offset"])
+            while True:
+                chunk = f.read(CHUNK_BYTES)
+                end = chunk.rfind(b"\n") + 1
+                if end == 0:
+                    break  # nothing left, or only a line still being written
+                f.seek(self.state["offset"] + end)
+                added += self._append(chunk[:end])
+                self.state["offset"] += end
+                self.state["marker"] = chunk[max(0, end - 64):end].hex()
+        if added:
+            self._save_state()
+        return added
+
+    def _truncate_columns(self):
+        """Drop values written after the last saved state, e.g. by an interrupted update"""
+        expected = self.state["rows"] * 8
+        for column in self._all_columns():
+            path = self._column_path(column)
+            if os.path.exists(path) and os.path.getsize(path) != expected:
+                with open(path, "r+b") as f:
+                    f.truncate(expected)
+
+    def _append(self, data: bytes) -> int:
+        columns = self.state["columns"]
+        frame = pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=np.float64)
+        if not len(frame):
+            return 0
+        rewards = frame["r"].to_numpy()
+
+        previous_total = self._tail("cumulative_r", 1)
+        cumulative = np.cumsum(rewards) + (previous_total[0] if len(previous_total) else 0.0)
+        # Rolling mean over the last `window` rewards, continuing from the cached tail
+        history = np.concatenate([self._tail("r", self.window - 1), rewards])
+        sums = np.concatenate([[0.0], np.cumsum(history)])
+        end = np.arange(len(history) - len(rewards), len(history)) + 1
+        start = np.maximum(end - self.window, 0)
+        rolling = (sums[end] - sums[start]) / (end - start)
+
+        series = {column: frame[column].to_numpy() for column in columns}
+        series["cumulative_r"] = cumulative
+        series["rolling_r"] = rolling
+        for column, values in series.items():
+            with open(self._column_path(column), "ab") as f:
+                np.ascontiguousarray(values, dtype=np.float64).tofile(f)
+        self.state["rows"] += len(frame)
+        return len(frame)
+
+    def column(self, column: str) -> Optional[np.ndarray]:
+        """Read-only memory map of a cached column (None if nothing has been cached yet)"""
+        if self.state["rows"] == 0:
+            return None
+        return np.memmap(self._column_path(column), dtype=np.float64, mode="r", shape=(self.state["rows"],))
+
+    def summary(self) -> Dict[str, float]:
+        """Constant-time latest statistics, suitable for dashboard polling"""
+        if self.state["rows"] == 0:
+            return {"episodes": 0}
+        return {
+            "episodes": self.state["rows"],
+            "cumulative_r": float(self._tail("cumulative_r", 1)[0]),
+            "rolling_r": float(self._tail("rolling_r", 1)[0]),
+            "last_r": float(self._tail("r", 1)[0]),
+        }
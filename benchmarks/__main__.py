@@ -0,0 +1,4 @@
+import runpy
+
+# `python -m benchmarks ...` runs the suite
+runpy.run_module("benchmarks.suite", run_name="__main__", alter_sys=True)
@@ -0,0 +1,54 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.distance_field import cells_distance_field
+
+
+def scan_distance(location, opportunity_cells):
+    """The per-call scan CustomCareerEnv used before distance fields"""
+    if not opportunity_cells:
+        return 0
+    return min(abs(location[0] - opp["pos"][0]) + abs(location[1] - opp["pos"][1]) for opp in opportunity_cells)
+
+
+def run_benchmark(grid_sizes=(8, 32, 128, 512), goal_counts=(1, 4, 16, 64), lookups=20000, builds=20, seed=0):
+    rng = np.random.default_rng(seed)
+    print(f"{'grid':>6} {'goals':>6} {'scan ns/call':>13} {'lookup ns/call':>15} {'field build us':>15} "
+          f"{'break-even calls':>17}")
+    for grid_size in grid_sizes:
+        for n_goals in goal_counts:
+            cells = rng.choice(grid_size * grid_size, size=n_goals, replace=False)
+            opportunity_cells = [{"pos": divmod(int(c), grid_size), "type": "job"} for c in cells]
+            locations = rng.integers(0, grid_size, size=(lookups, 2)).tolist()
+
+            start = time.perf_counter()
+            scanned = [scan_distance(loc, opportunity_cells) for loc in locations]
+            scan_ns = (time.perf_counter() - start) / lookups * 1e9
+
+            positions = [opp["pos"] for opp in opportunity_cells]
+            cells_distance_field(positions, grid_size)  # warm-up
+            start = time.perf_counter()
+            for _ in range(builds):
+                rows = cells_distance_field(positions, grid_size).tolist()
+            build_us = (time.perf_counter() - start) / builds * 1e6
+
+            start = time.perf_counter()
+            looked_up = [rows[loc[0]][loc[1]] for loc in locations]
+            lookup_ns = (time.perf_counter() - start) / lookups * 1e9
+            assert looked_up == scanned
+
+            saving = scan_ns - lookup_ns
+            break_even = f"{build_us * 1e3 / saving:,.0f}" if saving > 0 else "never"
+            print(f"{grid_size:>6} {n_goals:>6} {scan_ns:>13,.0f} {lookup_ns:>15,.0f} {build_us:>15,.1f} "
+                  f"{break_even:>17}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distance-to-closest-goal: per-call scan vs precomputed field")
+    parser.add_argument("--grids", type=int, nargs="+", default=[8, 32, 128, 512])
+    parser.add_argument("--goals", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    run_benchmark(args.grids, args.goals)
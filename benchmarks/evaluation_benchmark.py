@@ -0,0 +1,36 @@
+import argparse
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3 import PPO
+from stable_baselines3.common.evaluation import evaluate_policy
+from training.env_factory import make_training_env
+from training.evaluation import evaluate, load_policy
+
+
+def run_benchmark(model_path="models/ppo/custom_env_ppo.zip", n_episodes=1000, n_envs=256):
+    """Episodes/s of SB3's serial evaluate_policy (as EvalCallback runs it) vs one batched CareerVecEnv"""
+    model = PPO.load(model_path, device="cpu")
+    env = make_training_env(1, seed=0)
+    serial_episodes = max(1, n_episodes // 20)
+    start = time.perf_counter()
+    evaluate_policy(model, env, n_eval_episodes=serial_episodes, deterministic=True)
+    serial_rate = serial_episodes / (time.perf_counter() - start)
+    env.close()
+
+    act = load_policy(model_path)
+    start = time.perf_counter()
+    evaluate(act, n_episodes, n_envs)
+    batched_rate = n_episodes / (time.perf_counter() - start)
+    print(f"evaluate_policy, 1 env       {serial_rate:>10,.0f} episodes/s")
+    print(f"evaluate, {n_envs} envs batched {batched_rate:>10,.0f} episodes/s ({batched_rate / serial_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluation throughput, serial vs batched")
+    parser.add_argument("--model", default="models/ppo/custom_env_ppo.zip")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--envs", type=int, default=256)
+    args = parser.parse_args()
+    run_benchmark(args.model, args.episodes, args.envs)
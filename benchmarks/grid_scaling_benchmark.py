@@ -0,0 +1,53 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.custom_env import CustomCareerEnv
+from environment.vec_env import CareerVecEnv
+
+# (grid_size, num_jobs, num_distractions)
+CONFIGS = [(8, 1, 3), (16, 4, 16), (32, 8, 64), (64, 16, 256), (128, 32, 512), (256, 64, 1024)]
+
+
+def _rate(fn, units):
+    start = time.perf_counter()
+    fn()
+    return units / (time.perf_counter() - start)
+
+
+def run_benchmark(n_steps=5000, resets=1000, num_envs=64, seed=0):
+    print(f"{'grid':>6} {'jobs':>5} {'distr':>6} {'env steps/s':>12} {'env resets/s':>13} {'vec steps/s':>12}")
+    for grid_size, num_jobs, num_distractions in CONFIGS:
+        config = dict(grid_size=grid_size, num_jobs=num_jobs, num_distractions=num_distractions)
+        actions = np.random.default_rng(seed).integers(0, 5, size=(n_steps, num_envs))
+
+        env = CustomCareerEnv(**config)
+        env.reset(seed=seed)
+
+        def run_env():
+            for action in actions[:, 0]:
+                _, _, terminated, truncated, _ = env.step(action)
+                if terminated or truncated:
+                    env.reset()
+
+        step_rate = _rate(run_env, n_steps)
+        reset_rate = _rate(lambda: [env.reset() for _ in range(resets)], resets)
+
+        venv = CareerVecEnv(num_envs, **config)
+        venv.seed(seed)
+        venv.reset()
+        vec_rate = _rate(lambda: [venv.step(step_actions) for step_actions in actions[:n_steps // 10]],
+                         n_steps // 10 * num_envs)
+        print(f"{grid_size:>6} {num_jobs:>5} {num_distractions:>6} {step_rate:>12,.0f} {reset_rate:>13,.0f} "
+              f"{vec_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Step and reset throughput as grid size and entity counts grow")
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--resets", type=int, default=1000)
+    parser.add_argument("--envs", type=int, default=64)
+    args = parser.parse_args()
+    run_benchmark(args.steps, args.resets, args.envs)
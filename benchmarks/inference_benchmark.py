@@ -0,0 +1,95 @@
+import argparse
+import socket
+import threading
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from serving.policy_server import MODEL_PATHS, PolicyServer, PolicyTCPServer, load_batch_policy
+
+
+def _random_obs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    obs = np.zeros((n, 3), dtype=np.float32)
+    obs[:, :2] = rng.integers(0, 8, size=(n, 2))
+    obs[:, 2] = rng.choice([0, 50], size=n)
+    return obs
+
+
+def _report(label, latencies, elapsed):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{label:<28} {len(latencies) / elapsed:>10.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+def _load(clients, requests_per_client, send):
+    """Closed-loop load: each client thread sends its next request as soon as the last one returns"""
+    latencies = [[] for _ in range(clients)]
+
+    def client(i):
+        for obs in _random_obs(requests_per_client, seed=i):
+            start = time.perf_counter()
+            send(i, obs)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate(latencies), time.perf_counter() - start
+
+
+def run_benchmark(model="ppo", clients=64, requests_per_client=200, max_batch=256, max_latency_ms=2.0):
+    n = clients * requests_per_client
+    print(f"model {model}, {clients} concurrent clients, {n} requests")
+
+    # Baseline: one SB3 predict() per observation
+    if model == "reinforce":
+        act = load_batch_policy(model, MODEL_PATHS[model])
+        predict = lambda obs: act(obs[None])
+    else:
+        from stable_baselines3 import A2C, DQN, PPO
+        sb3_model = {"dqn": DQN, "ppo": PPO, "a2c": A2C}[model].load(MODEL_PATHS[model], device="cpu")
+        predict = lambda obs: sb3_model.predict(obs, deterministic=True)
+    latencies, elapsed = _load(1, min(n, 2000), lambda i, obs: predict(obs))
+    _report("single-obs predict", latencies, elapsed)
+
+    server = PolicyServer({model: MODEL_PATHS[model]}, max_batch=max_batch, max_latency_ms=max_latency_ms)
+    latencies, elapsed = _load(clients, requests_per_client, lambda i, obs: server.act(model, obs))
+    _report("batched, in-process", latencies, elapsed)
+
+    with PolicyTCPServer(server, port=0) as tcp_server:
+        threading.Thread(target=tcp_server.serve_forever, daemon=True).start()
+        address = tcp_server.server_address
+        connections = [socket.create_connection(address) for _ in range(clients)]
+        for connection in connections:
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        readers = [connection.makefile("rb") for connection in connections]
+
+        def send(i, obs):
+            connections[i].sendall(f"{model} {obs[0]} {obs[1]} {obs[2]}\n".encode())
+            int(readers[i].readline())
+
+        latencies, elapsed = _load(clients, requests_per_client, send)
+        _report("batched, localhost TCP", latencies, elapsed)
+        for connection in connections:
+            connection.close()
+        tcp_server.shutdown()
+
+    stats = server.metrics()[model]
+    print(f"server: {stats['batches']} batches, mean batch {stats['mean_batch']:.1f}, "
+          f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms (queue + forward)")
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-generate against the batched policy server")
+    parser.add_argument("--model", default="ppo", choices=sorted(MODEL_PATHS))
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    run_benchmark(args.model, args.clients, args.requests, args.max_batch, args.max_latency_ms)
@@ -0,0 +1,61 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis.monitor_aggregator import MonitorAggregator
+
+
+def _write_rows(path, n, rng, mode="a"):
+    rewards = rng.normal(20, 30, n).round(2)
+    lengths = rng.integers(10, 201, n)
+    frame = pd.DataFrame({"r": rewards, "l": lengths, "t": np.arange(n) * 0.01})
+    frame.to_csv(path, mode=mode, header=False, index=False)
+
+
+def run_benchmark(episodes=1_000_000, appended=1000):
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "monitor.csv")
+        cache_dir = os.path.join(workdir, "cache")
+        rng = np.random.default_rng(0)
+        with open(path, "w") as f:
+            f.write('#{"t_start": 0, "env_id": "None"}\nr,l,t\n')
+        _write_rows(path, episodes, rng)
+        print(f"{episodes} episodes, {os.path.getsize(path) / 1e6:.1f} MB monitor file")
+
+        start = time.perf_counter()
+        pd.read_csv(path, skiprows=1)["r"].cumsum()
+        print(f"full pandas re-read:       {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        start = time.perf_counter()
+        MonitorAggregator(path, cache_dir=cache_dir).update()
+        print(f"first ingest into cache:   {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        start = time.perf_counter()
+        aggregator = MonitorAggregator(path, cache_dir=cache_dir)
+        aggregator.update()
+        aggregator.column("cumulative_r")
+        print(f"refresh, nothing appended: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        _write_rows(path, appended, rng)
+        start = time.perf_counter()
+        aggregator = MonitorAggregator(path, cache_dir=cache_dir)
+        added = aggregator.update()
+        summary = aggregator.summary()
+        print(f"refresh, {added} appended:  {(time.perf_counter() - start) * 1000:9.1f} ms")
+        print(f"summary: {summary}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental monitor aggregation vs re-reading the CSV")
+    parser.add_argument("--episodes", type=int, default=1_000_000)
+    parser.add_argument("--appended", type=int, default=1000)
+    args = parser.parse_args()
+    run_benchmark(args.episodes, args.appended)
@@ -0,0 +1,73 @@
+import argparse
+import subprocess
+import time
+import sys
+import os
+import numpy as np
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from serving.numpy_policy import EXPORT_DIR, export_all
+from serving.policy_server import MODEL_PATHS, load_batch_policy
+
+# Child process: load one policy, act once, report load time and peak RSS (Linux /proc, in kB)
+_WORKER = """
+import time, numpy as np
+start = time.perf_counter()
+from serving.policy_server import load_batch_policy
+act = load_batch_policy({name!r}, {path!r})
+act(np.zeros((1, 3), dtype=np.float32))
+peak = [line for line in open("/proc/self/status") if line.startswith("VmHWM")][0]
+print(time.perf_counter() - start, peak.split()[1])
+"""
+
+
+def _worker_cost(name, path, repeats):
+    times, rss = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", _WORKER.format(name=name, path=path)],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+        times.append(time.perf_counter() - start)
+        rss.append(int(out[1]) / 1024)
+    return min(times), min(rss)
+
+
+def _batch_latency(act, batch, repeats=200):
+    obs = np.random.default_rng(0).uniform([0, 0, 0], [7, 7, 100], size=(batch, 3)).astype(np.float32)
+    act(obs)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        act(obs)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def run_benchmark(models=("dqn", "ppo", "reinforce"), batches=(1, 64, 1024), repeats=3):
+    exported = {name: os.path.join(EXPORT_DIR, f"{name}.npz") for name in models}
+    exported = {name: path for name, path in exported.items() if os.path.exists(path)}
+    missing = [name for name in models if name not in exported]
+    if missing:
+        exported.update(export_all({name: MODEL_PATHS[name] for name in missing}))
+    # export_all skips models it cannot export faithfully (e.g. DQN without its saved statistics)
+    skipped = [name for name in models if name not in exported]
+    if skipped:
+        print(f"No NumPy export for {', '.join(skipped)}; skipped")
+
+    print(f"{'model':<10} {'runtime':<8} {'start+first act':>16} {'peak RSS':>10}"
+          + "".join(f"{f'batch {b}':>12}" for b in batches))
+    for name in models:
+        if name in skipped:
+            continue
+        for runtime, path in (("torch", MODEL_PATHS[name]), ("numpy", exported[name])):
+            seconds, rss = _worker_cost(name, path, repeats)
+            act = load_batch_policy(name, path)
+            latencies = "".join(f"{_batch_latency(act, b):>10.1f}us" for b in batches)
+            print(f"{name:<10} {runtime:<8} {seconds * 1000:>14.0f}ms {rss:>8.0f}MB{latencies}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process cost and batch latency: torch/SB3 vs exported NumPy policies")
+    parser.add_argument("--models", nargs="+", default=["dqn", "ppo", "reinforce"], choices=sorted(MODEL_PATHS))
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.models, args.batches, args.repeats)
@@ -0,0 +1,75 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis.monitor_aggregator import MonitorAggregator
+from analysis.downsample import cached_pyramid
+import plot_rewards
+
+
+def _synthetic_monitor(path, episodes, seed, chunk=1_000_000):
+    """Write an SB3-style monitor CSV with a slowly improving reward signal"""
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        f.write('#{"t_start": 0, "env_id": "None"}\nr,l,t\n')
+    for start in range(0, episodes, chunk):
+        n = min(chunk, episodes - start)
+        progress = np.arange(start, start + n) / episodes
+        rewards = (rng.normal(60 * progress, 30)).round(2)
+        frame = pd.DataFrame({"r": rewards, "l": rng.integers(10, 201, n), "t": np.zeros(n)})
+        frame.to_csv(path, mode="a", header=False, index=False)
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<42} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def run_benchmark(episodes=10_000_000, exports=8, workers=None):
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)  # caches go to ./logs/.cache, i.e. inside workdir (also for pool workers)
+    try:
+        path = os.path.join(workdir, "monitor.csv")
+        _timed(f"write {episodes} synthetic episodes", lambda: _synthetic_monitor(path, episodes, 0))
+        aggregator = MonitorAggregator(path)
+        _timed("ingest into column cache", aggregator.update)
+        _timed("build min/max/mean pyramid", lambda: cached_pyramid(aggregator))
+        _timed("reload cached pyramid", lambda: cached_pyramid(MonitorAggregator(path)))
+
+        def full_resolution():
+            fig = Figure(figsize=(12, 6))
+            fig.add_subplot().plot(aggregator.column("cumulative_r"))
+            fig.savefig(os.path.join(workdir, "full.png"))
+
+        def downsampled():
+            plot_rewards.export_plot({"synthetic": (path, True)}, os.path.join(workdir, "downsampled.png"))
+
+        _timed("draw + save, every episode point", full_resolution)
+        _timed("draw + save, screen-resolution pyramid", downsampled)
+
+        jobs = [({"synthetic": (path, True)}, os.path.join(workdir, f"run_{i}.png")) for i in range(exports)]
+        _timed(f"export {exports} figures, one process", lambda: [plot_rewards.export_plot(*job) for job in jobs])
+        _timed(f"export {exports} figures, process pool", lambda: plot_rewards.export_plots(jobs, workers))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reward-curve plotting cost on very long synthetic runs")
+    parser.add_argument("--episodes", type=int, default=10_000_000)
+    parser.add_argument("--exports", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    run_benchmark(args.episodes, args.exports, args.workers)
@@ -0,0 +1,40 @@
+import argparse
+import time
+import sys
+import os
+import torch
+import torch.optim as optim
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.vec_env import CareerVecEnv
+from training.reinfore_pg_training import PolicyNetwork, EpisodeBatch, collect_episodes, reinforce_update
+
+
+def run_benchmark(env_counts=(1, 16, 64, 256), episodes=512, seed=0):
+    print(f"{'n_envs':>8} {'episodes/s':>12} {'steps/s':>12} {'mean reward':>12}")
+    for n_envs in env_counts:
+        torch.manual_seed(seed)
+        venv = CareerVecEnv(n_envs)
+        venv.seed(seed)
+        policy = PolicyNetwork(venv.observation_space.shape[0], venv.action_space.n)
+        optimizer = optim.Adam(policy.parameters(), lr=1e-2)
+        batch = EpisodeBatch(venv.max_steps, n_envs, venv.observation_space.shape[0])
+
+        done_episodes, steps, total = 0, 0, 0.0
+        start = time.perf_counter()
+        while done_episodes < max(episodes, n_envs):
+            rewards = collect_episodes(policy, venv, batch)
+            reinforce_update(policy, optimizer, batch, 0.99)
+            done_episodes += n_envs
+            steps += int(batch.mask.sum())
+            total += float(rewards.sum())
+        elapsed = time.perf_counter() - start
+        print(f"{n_envs:>8} {done_episodes / elapsed:>12.1f} {steps / elapsed:>12.0f} "
+              f"{total / done_episodes:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched REINFORCE throughput against n_envs")
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--episodes", type=int, default=512)
+    args = parser.parse_args()
+    run_benchmark(args.envs, args.episodes)
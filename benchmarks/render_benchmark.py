@@ -0,0 +1,69 @@
+import argparse
+import time
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from environment.custom_env import CustomCareerEnv
+
+
+def frames_per_sec(draw, n_frames):
+    draw()
+    start = time.perf_counter()
+    for _ in range(n_frames):
+        draw()
+    return n_frames / (time.perf_counter() - start)
+
+
+def particle_frames_per_sec(env, n_particles, n_frames):
+    """rgb_array fps with n_particles kept alive for the whole run"""
+    renderer = env.renderer
+
+    def draw():
+        missing = n_particles - len(renderer.particles)
+        if missing > 0:
+            renderer.add_particles(env.window_size / 2, env.window_size / 2,
+                                   renderer.colors['particle_job'], missing)
+        renderer.particles.lifetime[:len(renderer.particles)] = 1.0
+        return env.render()
+
+    return frames_per_sec(draw, n_frames)
+
+
+def run_benchmark(n_frames=200, window_size=800, particle_counts=(0, 100, 10000)):
+    env = CustomCareerEnv(render_mode="rgb_array", window_size=window_size)
+    env.reset(seed=0)
+    env.render()
+    renderer = env.renderer
+
+    def draw_environment():
+        renderer.update_animations(1.0 / 15)
+        return renderer.draw_environment(None, env.agent_location, env.opportunity_cells,
+                                         env.distraction_cells, env.readiness_score,
+                                         env.steps_taken, env.max_steps)
+
+    def draw_environment_array():
+        canvas = draw_environment()
+        return np.transpose(pygame.surfarray.array3d(canvas), (1, 0, 2))
+
+    draw_only = frames_per_sec(draw_environment, n_frames)
+    baseline = frames_per_sec(draw_environment_array, n_frames)
+    fast = frames_per_sec(env.render, n_frames)
+    print(f"draw_environment:           {draw_only:8.1f} fps ({1e3 / draw_only:.2f} ms/frame)")
+    print(f"draw_environment + array3d: {baseline:8.1f} fps")
+    print(f"render() rgb_array:         {fast:8.1f} fps ({fast / baseline:.1f}x)")
+    for n_particles in particle_counts:
+        fps = particle_frames_per_sec(env, n_particles, n_frames)
+        print(f"rgb_array, {n_particles:>6} particles: {fps:8.1f} fps")
+    env.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offscreen frames/sec of the rgb_array render path")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--window-size", type=int, default=800)
+    parser.add_argument("--particles", type=int, nargs="+", default=[0, 100, 10000])
+    args = parser.parse_args()
+    run_benchmark(args.frames, args.window_size, args.particles)
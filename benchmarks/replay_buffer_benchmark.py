@@ -0,0 +1,75 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3.common.buffers import ReplayBuffer
+from environment.vec_env import CareerVecEnv
+from training.replay_buffer import CompactReplayBuffer
+
+
+def _buffer_bytes(buffer):
+    if isinstance(buffer, CompactReplayBuffer):
+        return buffer.nbytes
+    return sum(a.nbytes for a in (buffer.observations, buffer.next_observations, buffer.actions,
+                                  buffer.rewards, buffer.dones, buffer.timeouts))
+
+
+def fill(buffers, n_steps, n_envs, seed=0):
+    """Add the same CareerVecEnv transitions (random actions) to every buffer"""
+    venv = CareerVecEnv(n_envs)
+    venv.seed(seed)
+    obs = venv.reset()
+    rng = np.random.default_rng(seed)
+    for _ in range(n_steps):
+        actions = rng.integers(0, 5, size=n_envs)
+        new_obs, rewards, dones, infos = venv.step(actions)
+        next_obs = new_obs.copy()
+        for i in np.flatnonzero(dones):
+            next_obs[i] = infos[i]["terminal_observation"]
+        for buffer in buffers:
+            buffer.add(obs, next_obs, actions.reshape(-1, 1), rewards, dones, infos)
+        obs = new_obs
+
+
+def check_parity(n_steps=5000, n_envs=4, batch_size=4096):
+    """Same rows from both buffers must give identical obs/actions/next_obs/dones and rewards"""
+    venv = CareerVecEnv(n_envs)
+    reference = ReplayBuffer(n_steps * n_envs, venv.observation_space, venv.action_space, "cpu", n_envs=n_envs)
+    compact = CompactReplayBuffer(n_steps * n_envs, venv.observation_space, venv.action_space, "cpu", n_envs=n_envs)
+    fill([reference, compact], n_steps, n_envs)
+    batch_inds = np.random.default_rng(1).integers(0, n_steps - 1, size=batch_size)
+    np.random.seed(2)
+    expected = reference._get_samples(batch_inds)
+    np.random.seed(2)
+    actual = compact._get_samples(batch_inds)
+    for field in ("observations", "actions", "next_observations", "dones"):
+        assert (getattr(expected, field) == getattr(actual, field)).all(), f"{field} differ"
+    return float((expected.rewards - actual.rewards).abs().max())
+
+
+def run_benchmark(sizes=(100_000, 1_000_000), batch_size=64, n_samples=5000):
+    venv = CareerVecEnv(1)
+    print(f"max |reward error| vs ReplayBuffer: {check_parity():.4f}")
+    print(f"{'buffer':>22} {'size':>10} {'bytes/transition':>17} {'10M transitions':>16} {'samples/s':>12}")
+    for size in sizes:
+        for cls in (ReplayBuffer, CompactReplayBuffer):
+            buffer = cls(size, venv.observation_space, venv.action_space, "cpu")
+            fill([buffer], min(size, 20000), 1)
+            per_transition = _buffer_bytes(buffer) / size
+            start = time.perf_counter()
+            for _ in range(n_samples):
+                buffer.sample(batch_size)
+            rate = n_samples * batch_size / (time.perf_counter() - start)
+            print(f"{cls.__name__:>22} {size:>10,} {per_transition:>17.1f} "
+                  f"{per_transition * 10_000_000 / 2**20:>13,.0f} MB {rate:>12,.0f}")
+            del buffer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay buffer memory and sampling throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.batch_size)
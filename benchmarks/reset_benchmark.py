@@ -0,0 +1,40 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.custom_env import CustomCareerEnv
+from environment.vec_env import CareerVecEnv
+from environment.layout_sampler import get_layout_sampler
+
+
+def _rate(fn, units):
+    start = time.perf_counter()
+    fn()
+    return units / (time.perf_counter() - start)
+
+
+def run_benchmark(resets=20000, num_envs=256, seed=0):
+    env = CustomCareerEnv()
+    env.reset(seed=seed)
+    print(f"CustomCareerEnv.reset      {_rate(lambda: [env.reset() for _ in range(resets)], resets):>14,.0f} resets/s")
+
+    venv = CareerVecEnv(num_envs)
+    venv.seed(seed)
+    venv.reset()
+    rounds = max(1, resets // num_envs)
+    print(f"CareerVecEnv({num_envs}) auto-reset "
+          f"{_rate(lambda: [venv._reset_envs(venv._arange) for _ in range(rounds)], rounds * num_envs):>14,.0f} resets/s")
+
+    sampler = get_layout_sampler()
+    rng = np.random.default_rng(seed)
+    print(f"LayoutSampler.sample batch {_rate(lambda: sampler.sample(rng, resets), resets):>14,.0f} layouts/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Environment reset throughput")
+    parser.add_argument("--resets", type=int, default=20000)
+    parser.add_argument("--envs", type=int, default=256)
+    args = parser.parse_args()
+    run_benchmark(args.resets, args.envs)
@@ -0,0 +1,65 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+import torch as th
+from gymnasium import spaces
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.vec_env import VecNormalize
+from environment.vec_env import CareerVecEnv
+from training.rollout_utils import GAERolloutBuffer, ObservationNormalizer
+
+
+def _per_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def gae_times(n_steps, n_envs, repeats=20, seed=0):
+    """ms per compute_returns_and_advantage for SB3's RolloutBuffer and GAERolloutBuffer"""
+    rng = np.random.default_rng(seed)
+    rewards, values = rng.normal(size=(2, n_steps, n_envs))
+    episode_starts = rng.random((n_steps, n_envs)) < 0.01
+    last_values, dones = th.from_numpy(rng.normal(size=(n_envs, 1))), np.zeros(n_envs, dtype=bool)
+    times = {}
+    for cls in (RolloutBuffer, GAERolloutBuffer):
+        buffer = cls(n_steps, spaces.Box(0, 1, (3,), np.float32), spaces.Discrete(5), n_envs=n_envs)
+        buffer.rewards[:], buffer.values[:], buffer.episode_starts[:] = rewards, values, episode_starts
+        times[cls.__name__] = 1e3 * _per_call(lambda: buffer.compute_returns_and_advantage(last_values, dones),
+                                              repeats)
+    return times
+
+
+def normalizer_times(n_envs, n_steps=2000, seed=0):
+    """us per CareerVecEnv step, raw and under each observation normalizer"""
+    actions = np.random.default_rng(seed).integers(0, 5, size=(n_steps, n_envs))
+    wrappers = {"raw": lambda venv: venv, "VecNormalize": lambda venv: VecNormalize(venv, norm_reward=False),
+                "ObservationNormalizer": ObservationNormalizer}
+    times = {}
+    for name, wrap in wrappers.items():
+        venv = wrap(CareerVecEnv(n_envs))
+        venv.seed(seed)
+        venv.reset()
+        steps = iter(actions)
+        times[name] = 1e6 * _per_call(lambda: venv.step(next(steps)), n_steps)
+    return times
+
+
+def run_benchmark():
+    print(f"{'rollout':>12} {'RolloutBuffer ms':>17} {'GAERolloutBuffer ms':>20}")
+    for n_steps, n_envs in [(4096, 1), (2048, 8), (512, 64), (5, 16)]:
+        times = gae_times(n_steps, n_envs)
+        print(f"{n_steps:>6}x{n_envs:<5} {times['RolloutBuffer']:>17.2f} {times['GAERolloutBuffer']:>20.2f}")
+    print(f"\n{'envs':>6} {'raw us':>8} {'VecNormalize us':>16} {'ObservationNormalizer us':>25}")
+    for n_envs in (1, 16, 256):
+        times = normalizer_times(n_envs)
+        print(f"{n_envs:>6} {times['raw']:>8.0f} {times['VecNormalize']:>16.0f} {times['ObservationNormalizer']:>25.0f}")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Advantage computation and observation normalization cost").parse_args()
+    run_benchmark()
@@ -0,0 +1,43 @@
+import argparse
+import time
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from training.env_factory import make_training_env
+
+
+def steps_per_sec(venv, n_steps, seed=0):
+    actions = np.random.default_rng(seed).integers(0, 5, size=(n_steps, venv.num_envs))
+    venv.reset()
+    start = time.perf_counter()
+    for t in range(n_steps):
+        venv.step(actions[t])
+    return n_steps * venv.num_envs / (time.perf_counter() - start)
+
+
+def run_benchmark(worker_counts, envs_per_worker=8, n_steps=500, backends=("subproc", "shm")):
+    print(f"CPUs: {os.cpu_count()}, envs per worker: {envs_per_worker}")
+    print(f"{'workers':>8} {'backend':>8} {'steps/sec':>12}")
+    baseline = make_training_env(envs_per_worker, "dummy", seed=0)
+    print(f"{0:>8} {'dummy':>8} {steps_per_sec(baseline, n_steps):>12,.0f}")
+    baseline.close()
+    for n_workers in worker_counts:
+        n_envs = n_workers * envs_per_worker
+        for backend in backends:
+            if backend == "subproc":
+                # SubprocVecEnv always runs one env per process
+                venv = make_training_env(n_workers, backend, seed=0)
+            else:
+                venv = make_training_env(n_envs, backend, seed=0, n_workers=n_workers)
+            print(f"{n_workers:>8} {backend:>8} {steps_per_sec(venv, n_steps):>12,.0f}")
+            venv.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Env-steps/sec of multiprocess backends vs worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--envs-per-worker", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+    run_benchmark(args.workers, args.envs_per_worker, args.steps)
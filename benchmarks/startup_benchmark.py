@@ -0,0 +1,52 @@
+import argparse
+import subprocess
+import sys
+import time
+import tracemalloc
+import os
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import environment.custom_env
+elapsed = time.perf_counter() - start
+print(elapsed, int('pygame' in sys.modules), int('imageio' in sys.modules))
+"""
+
+
+def import_time(repeats=5):
+    """Time `import environment.custom_env` in fresh interpreters"""
+    times = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+    return min(times), out[1] == "1", out[2] == "1"
+
+
+def construction_cost(n_instances=1000):
+    """Mean seconds and traced bytes per CustomCareerEnv instance"""
+    from environment.custom_env import CustomCareerEnv
+    CustomCareerEnv(render_mode="rgb_array")
+    tracemalloc.start()
+    start = time.perf_counter()
+    envs = [CustomCareerEnv(render_mode="rgb_array") for _ in range(n_instances)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del envs
+    return elapsed / n_instances, current / n_instances
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import and construction cost of CustomCareerEnv")
+    parser.add_argument("--instances", type=int, default=1000)
+    args = parser.parse_args()
+
+    seconds, has_pygame, has_imageio = import_time()
+    print(f"import environment.custom_env: {seconds * 1e3:.1f} ms "
+          f"(pygame loaded: {has_pygame}, imageio loaded: {has_imageio})")
+    per_instance, per_bytes = construction_cost(args.instances)
+    print(f"CustomCareerEnv(): {per_instance * 1e6:.1f} us, {per_bytes / 1024:.1f} KiB per instance")
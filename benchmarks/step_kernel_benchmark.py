@@ -0,0 +1,58 @@
+import argparse
+import time
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3.common.vec_env import DummyVecEnv
+from environment.custom_env import CustomCareerEnv
+from environment.compiled_env import CompiledCareerEnv
+from environment.step_kernel import python_step
+
+
+def _python_kernel_env():
+    env = CompiledCareerEnv()
+    env._step_kernel = python_step
+    return env
+
+
+ENVS = {
+    "CustomCareerEnv": CustomCareerEnv,
+    "CompiledCareerEnv (python kernel)": _python_kernel_env,
+    "CompiledCareerEnv": CompiledCareerEnv,
+}
+
+
+def steps_per_sec(env, actions):
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return len(actions) / (time.perf_counter() - start)
+
+
+def vec_steps_per_sec(venv, actions):
+    start = time.perf_counter()
+    for action in actions:
+        venv.step(action.reshape(1))
+    return len(actions) / (time.perf_counter() - start)
+
+
+def run_benchmark(n_steps=100_000, seed=0):
+    actions = np.random.default_rng(seed).integers(0, 5, size=n_steps)
+    print(f"{'env':<36} {'env.step/s':>12} {'DummyVecEnv step/s':>20}")
+    for name, make in ENVS.items():
+        env = make()
+        env.reset(seed=seed)
+        venv = DummyVecEnv([make])
+        venv.seed(seed)
+        venv.reset()
+        print(f"{name:<36} {steps_per_sec(env, actions):>12,.0f} {vec_steps_per_sec(venv, actions):>20,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-env step throughput, Python vs compiled kernel")
+    parser.add_argument("--steps", type=int, default=100_000)
+    args = parser.parse_args()
+    run_benchmark(args.steps)
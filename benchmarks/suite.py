@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+# Not committed: timings only compare on the machine that recorded them. Record one with
+# `python -m benchmarks --save-baseline` before making changes.
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _best_rate(fn, units, repeats):
+    """Best units/sec over repeats runs of fn (one warm-up call first)"""
+    fn()
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = max(best, units / (time.perf_counter() - start))
+    return best
+
+
+def bench_env(repeats, scale):
+    from environment.custom_env import CustomCareerEnv
+    env = CustomCareerEnv()
+    env.reset(seed=0)
+    n = int(20000 * scale)
+    actions = np.random.default_rng(0).integers(0, 5, size=n)
+
+    def steps():
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+
+    def resets():
+        for _ in range(n // 4):
+            env.reset()
+
+    return {"steps_per_sec": _best_rate(steps, n, repeats),
+            "resets_per_sec": _best_rate(resets, n // 4, repeats)}
+
+
+def bench_compiled_env(repeats, scale):
+    from environment.compiled_env import CompiledCareerEnv
+    env = CompiledCareerEnv()
+    env.reset(seed=0)
+    n = int(20000 * scale)
+    actions = np.random.default_rng(0).integers(0, 5, size=n)
+
+    def steps():
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+
+    return {"steps_per_sec": _best_rate(steps, n, repeats)}
+
+
+def bench_vec_env(repeats, scale, num_envs=256):
+    from environment.vec_env import CareerVecEnv
+    env = CareerVecEnv(num_envs)
+    env.seed(0)
+    env.reset()
+    n = int(500 * scale)
+    actions = np.random.default_rng(0).integers(0, 5, size=(n, num_envs))
+
+    def steps():
+        for t in range(n):
+            env.step(actions[t])
+
+    return {"steps_per_sec": _best_rate(steps, n * num_envs, repeats)}
+
+
+def bench_render(repeats, scale):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from environment.custom_env import CustomCareerEnv
+    env = CustomCareerEnv(render_mode="rgb_array")
+    env.reset(seed=0)
+    env.render()
+    renderer = env.renderer
+    n = int(100 * scale)
+
+    def frames():
+        for _ in range(n):
+            env.render()
+
+    def draw_environment():
+        for _ in range(n):
+            renderer.draw_environment(None, env.agent_location, env.opportunity_cells, env.distraction_cells,
+                                      env.readiness_score, env.steps_taken, env.max_steps)
+
+    return {"rgb_array_fps": _best_rate(frames, n, repeats),
+            "draw_environment_fps": _best_rate(draw_environment, n, repeats)}
+
+
+def _bench_learn(algorithm, repeats, scale):
+    import contextlib
+    import io
+    from stable_baselines3 import A2C, DQN, PPO
+    from training.env_factory import make_training_env
+    total = int(4096 * scale)
+    kwargs = {"dqn": dict(learning_starts=total // 4, buffer_size=total),
+              "ppo": dict(n_steps=total // 4, batch_size=64),
+              "a2c": dict()}[algorithm]
+    cls = {"dqn": DQN, "ppo": PPO, "a2c": A2C}[algorithm]
+
+    def learn():
+        env = make_training_env(1, seed=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls("MlpPolicy", env, seed=0, verbose=0, **kwargs).learn(total_timesteps=total)
+        env.close()
+
+    return {"timesteps_per_sec": _best_rate(learn, total, repeats)}
+
+
+def bench_learn_dqn(repeats, scale):
+    return _bench_learn("dqn", repeats, scale)
+
+
+def bench_learn_ppo(repeats, scale):
+    return _bench_learn("ppo", repeats, scale)
+
+
+def bench_learn_a2c(repeats, scale):
+    return _bench_learn("a2c", repeats, scale)
+
+
+def bench_reinforce(repeats, scale, n_envs=64):
+    import torch
+    import torch.optim as optim
+    from environment.vec_env import CareerVecEnv
+    from training.reinfore_pg_training import PolicyNetwork, EpisodeBatch, collect_episodes, reinforce_update
+    torch.manual_seed(0)
+    venv = CareerVecEnv(n_envs)
+    venv.seed(0)
+    policy = PolicyNetwork(3, 5)
+    optimizer = optim.Adam(policy.parameters(), lr=1e-2)
+    batch = EpisodeBatch(venv.max_steps, n_envs, 3)
+    updates = max(1, int(4 * scale))
+
+    def train():
+        for _ in range(updates):
+            collect_episodes(policy, venv, batch)
+            reinforce_update(policy, optimizer, batch, 0.99)
+
+    return {"episodes_per_sec": _best_rate(train, updates * n_envs, repeats)}
+
+
+BENCHMARKS = {
+    "env": bench_env,
+    "compiled_env": bench_compiled_env,
+    "vec_env": bench_vec_env,
+    "render": bench_render,
+    "learn_dqn": bench_learn_dqn,
+    "learn_ppo": bench_learn_ppo,
+    "learn_a2c": bench_learn_a2c,
+    "reinforce": bench_reinforce,
+}
+
+
+def _lower_is_better(metric: str) -> bool:
+    return metric.endswith("_mb") or metric.endswith("_ms")
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def machine_metadata():
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "processor": platform.processor(),
+    }
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            models = [line.split(":", 1)[1].strip() for line in f if line.startswith("model name")]
+        if models:
+            meta["processor"] = models[0]
+    try:
+        meta["git_commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    for package in ("numpy", "torch", "stable_baselines3", "gymnasium", "pygame"):
+        try:
+            from importlib.metadata import version
+            meta[package] = version(package)
+        except Exception:
+            pass
+    return meta
+
+
+def run_one(name, repeats, scale):
+    """Run one benchmark in this process; peak RSS covers its imports and data"""
+    metrics = BENCHMARKS[name](repeats, scale)
+    metrics["peak_rss_mb"] = _peak_rss_mb()
+    return metrics
+
+
+def run_suite(names, repeats=3, scale=1.0):
+    """Run each benchmark in a fresh subprocess so timings and peak RSS do not leak between them"""
+    results = {"metadata": {**machine_metadata(), "repeats": repeats, "scale": scale}, "benchmarks": {},
+               "failed": []}
+    for name in names:
+        out = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--single", name,
+                              "--repeats", str(repeats), "--scale", str(scale)],
+                             cwd=ROOT, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"{name:<12} FAILED\n{out.stderr.strip()}")
+            results["failed"].append(name)
+            continue
+        metrics = json.loads(out.stdout.strip().splitlines()[-1])
+        results["benchmarks"][name] = metrics
+        print(f"{name:<12} " + "  ".join(f"{metric} {value:,.1f}" for metric, value in metrics.items()))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print per-metric change against baseline; returns the metrics that regressed by more than threshold"""
+    regressions = []
+    for key in ("scale", "processor", "cpu_count"):
+        if baseline.get("metadata", {}).get(key) != results["metadata"].get(key):
+            print(f"warning: baseline {key} {baseline.get('metadata', {}).get(key)!r} differs from "
+                  f"{results['metadata'].get(key)!r}, comparison may not be meaningful")
+    for name, metrics in results["benchmarks"].items():
+        for metric, value in metrics.items():
+            reference = baseline.get("benchmarks", {}).get(name, {}).get(metric)
+            if not reference:
+                continue
+            change = value / reference - 1
+            worse = change > threshold if _lower_is_better(metric) else change < -threshold
+            flag = "REGRESSION" if worse else ""
+            print(f"{name + '.' + metric:<34} {reference:>14,.1f} -> {value:>14,.1f} {change:>+8.1%} {flag}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput/latency/memory benchmark suite")
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS), help=f"subset of {list(BENCHMARKS)}")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every workload size (e.g. 0.2 for a smoke run)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="results JSON to compare against (record it with --save-baseline)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown before failing")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_one(args.single, args.repeats, args.scale)))
+        sys.exit(0)
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks {sorted(unknown)}")
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; record one on this machine first with "
+                     f"`python -m benchmarks --save-baseline` (add --scale/--repeats to match later runs)")
+    suite_results = run_suite(args.benchmarks, args.repeats, args.scale)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite_results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(suite_results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    else:
+        with open(args.baseline) as f:
+            regressed = compare(suite_results, json.load(f), args.threshold)
+        if regressed:
+            print(f"{len(regressed)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+    if suite_results["failed"]:
+        sys.exit(1)
@@ -0,0 +1,36 @@
+import argparse
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.vec_env import CareerVecEnv
+from environment.tabular_solver import CareerMDP, value_iteration, policy_iteration
+
+
+def run_benchmark(n_layouts=4096, gamma=0.99):
+    venv = CareerVecEnv(n_layouts)
+    venv.seed(0)
+    venv.reset()
+
+    start = time.perf_counter()
+    mdp = CareerMDP(venv.goal_cells[:, 0], venv.distraction_cells, venv.grid_size)
+    built = time.perf_counter()
+    solution = value_iteration(mdp, gamma)
+    solved = time.perf_counter()
+    policy_iteration(mdp, gamma)
+    pi_solved = time.perf_counter()
+
+    per_layout = 1e6 / n_layouts
+    print(f"{n_layouts} layouts, {mdp.n_states} states x {mdp.n_actions} actions each")
+    print(f"build tensors:    {(built - start) * per_layout:8.1f} us/layout")
+    print(f"value iteration:  {(solved - built) * per_layout:8.1f} us/layout ({solution.iterations} sweeps)")
+    print(f"policy iteration: {(pi_solved - solved) * per_layout:8.1f} us/layout")
+    print(f"mean optimal start value: {solution.start_values().mean():.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched exact solve of CustomCareerEnv layouts")
+    parser.add_argument("--layouts", type=int, default=4096)
+    parser.add_argument("--gamma", type=float, default=0.99)
+    args = parser.parse_args()
+    run_benchmark(args.layouts, args.gamma)
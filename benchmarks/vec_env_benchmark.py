@@ -0,0 +1,38 @@
+import argparse
+import time
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3.common.vec_env import DummyVecEnv
+from environment.custom_env import CustomCareerEnv
+from environment.vec_env import CareerVecEnv
+
+
+def steps_per_sec(env, n_steps, seed=0):
+    """Step a vectorized env with pre-sampled random actions and return env-steps/sec"""
+    actions = np.random.default_rng(seed).integers(0, 5, size=(n_steps, env.num_envs))
+    env.seed(seed)
+    env.reset()
+    start = time.perf_counter()
+    for t in range(n_steps):
+        env.step(actions[t])
+    elapsed = time.perf_counter() - start
+    return n_steps * env.num_envs / elapsed
+
+
+def run_benchmark(num_envs=(1, 64, 1024), n_steps=2000, dummy_steps=200):
+    print(f"{'N':>6} {'DummyVecEnv':>16} {'CareerVecEnv':>16} {'speedup':>9}")
+    for n in num_envs:
+        dummy = DummyVecEnv([lambda: CustomCareerEnv(render_mode="rgb_array") for _ in range(n)])
+        scalar_rate = steps_per_sec(dummy, dummy_steps)
+        vec_rate = steps_per_sec(CareerVecEnv(n), n_steps)
+        print(f"{n:>6} {scalar_rate:>16,.0f} {vec_rate:>16,.0f} {vec_rate / scalar_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Env-steps/sec of DummyVecEnv vs CareerVecEnv")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+    run_benchmark(args.num_envs, args.steps)
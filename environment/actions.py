@@ -0,0 +1,5 @@
+import numpy as np
+
+# Row/column deltas for actions 0-4 (up, down, left, right, use opportunity)
+ACTION_DELTAS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1], [0, 0]], dtype=np.int64)
+USE_ACTION = 4
@@ -0,0 +1,93 @@
+from array import array
+import numpy as np
+from .custom_env import CustomCareerEnv, DISTRACTION_TYPES
+from .step_kernel import (load_kernel, python_step, state_size, ROW, COL, READINESS, STEPS, STREAK, JOB_ROW,
+                          JOB_COL, JOB_ALIVE, GRID, MAX_STEPS, N_DISTRACTIONS, DISTRACTIONS, TERMINATED, TRUNCATED)
+
+
+class CompiledCareerEnv(CustomCareerEnv):
+    """CustomCareerEnv whose step runs in a compiled kernel over an int32 state record.
+
+    Same spaces, rules, seeding and layouts as CustomCareerEnv: a seeded
+    rollout is bit-identical. The usual attributes (agent_location,
+    opportunity_cells, ...) are views of the state record, so rendering and
+    inspection work unchanged. The kernel writes each observation into one
+    preallocated scratch buffer and step() returns a copy of it, so returned
+    observations belong to the caller as Gymnasium expects. Falls back to the Python
+    kernel if no C compiler is available. The state record has room for a
+    single job, so only ``num_jobs=1`` is supported.
+    """
+    def __init__(self, *args, num_jobs=1, num_distractions=3, **kwargs):
+        if num_jobs != 1:
+            raise ValueError(f"CompiledCareerEnv supports a single job, got num_jobs={num_jobs}")
+        # The state record must exist before CustomCareerEnv.__init__ assigns the attributes below
+        self._state = array("i", [0] * state_size(num_distractions))
+        super().__init__(*args, num_jobs=num_jobs, num_distractions=num_distractions, **kwargs)
+        self._state[GRID] = self.grid_size
+        self._state[MAX_STEPS] = self.max_steps
+        kernel = load_kernel()
+        self._step_kernel = kernel.step if kernel is not None else python_step
+        self._obs = np.zeros(3, dtype=np.float32)
+
+    @property
+    def agent_location(self):
+        return [self._state[ROW], self._state[COL]]
+
+    @agent_location.setter
+    def agent_location(self, value):
+        self._state[ROW], self._state[COL] = value
+
+    @property
+    def readiness_score(self):
+        return self._state[READINESS]
+
+    @readiness_score.setter
+    def readiness_score(self, value):
+        self._state[READINESS] = value
+
+    @property
+    def steps_taken(self):
+        return self._state[STEPS]
+
+    @steps_taken.setter
+    def steps_taken(self, value):
+        self._state[STEPS] = value
+
+    @property
+    def consecutive_positive_rewards(self):
+        return self._state[STREAK]
+
+    @consecutive_positive_rewards.setter
+    def consecutive_positive_rewards(self, value):
+        self._state[STREAK] = value
+
+    @property
+    def opportunity_cells(self):
+        if not self._state[JOB_ALIVE]:
+            return []
+        return [{"pos": (self._state[JOB_ROW], self._state[JOB_COL]), "type": "job"}]
+
+    @opportunity_cells.setter
+    def opportunity_cells(self, cells):
+        self._state[JOB_ALIVE] = len(cells)
+        if cells:
+            self._state[JOB_ROW], self._state[JOB_COL] = cells[0]["pos"]
+
+    @property
+    def distraction_cells(self):
+        s = self._state
+        return [{"pos": (s[DISTRACTIONS + 2 * k], s[DISTRACTIONS + 2 * k + 1]),
+                 "type": DISTRACTION_TYPES[k % len(DISTRACTION_TYPES)]} for k in range(s[N_DISTRACTIONS])]
+
+    @distraction_cells.setter
+    def distraction_cells(self, cells):
+        self._state[N_DISTRACTIONS] = len(cells)
+        for k, cell in enumerate(cells):
+            self._state[DISTRACTIONS + 2 * k], self._state[DISTRACTIONS + 2 * k + 1] = cell["pos"]
+
+    def step(self, action):
+        reward, flags = self._step_kernel(self._state, action, self._obs)
+        self.last_reward = reward
+        if self.render_mode == "human":
+            self.render()
+        return self._obs.copy(), reward, bool(flags & TERMINATED), bool(flags & TRUNCATED), {}
@@ -1,88 +1,84 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-import pygame
-import random
 import time
-from .rendering import Rendering
-import imageio
+from .layout_sampler import get_layout_sampler
+from .distance_field import cells_distance_field
 
-pygame.init()
+DISTRACTION_TYPES = ["phone", "drugs_alcohol", "social_media"]
+
+# Up to this many opportunities the closest one is found directly, which is cheaper than
+# building (on reset) and indexing the distance field; past it the field is built lazily
+DIRECT_DISTANCE_LIMIT = 4
 
 class CustomCareerEnv(gym.Env):
     metadata = {
-        "render_modes": ["human"],
+        "render_modes": ["human", "rgb_array"],
         "render_fps": 15
     }
 
-    def __init__(self, render_mode=None, window_size=800, record_gif=False, gif_path="career_env_demo.gif"):
+    def __init__(self, render_mode=None, window_size=800, record_gif=False, gif_path="career_env_demo.gif",
+                 record_downscale=1, grid_size=8, max_steps=200, num_jobs=1, num_distractions=3,
+                 record_max_frames=200):
         super().__init__()
-        self.grid_size = 8
-        self.max_steps = 200
+        self.grid_size = grid_size
+        self.max_steps = max_steps
+        self.num_jobs = num_jobs
+        self.num_distractions = num_distractions
+        self._sampler = get_layout_sampler(grid_size, num_distractions, num_jobs)  # validates the configuration
         self.steps_taken = 0
         self.readiness_score = 0
         self.window_size = window_size
         self.agent_location = [0, 0]
         self.opportunity_cells = [] 
         self.distraction_cells = []
+        # pos -> cell dict, so a step looks up the agent's cell instead of scanning every entity
+        self._opportunity_index = {}
+        self._distraction_index = {}
         self.render_mode = render_mode
-        self.renderer = Rendering(window_size)
+        self.renderer = None  # built on the first render() call
         self.last_time = time.time()
         self.last_reward = 0
         self.consecutive_positive_rewards = 0
         self.action_space = spaces.Discrete(5)
         self.observation_space = spaces.Box(
             low=np.array([0, 0, 0]),
-            high=np.array([self.grid_size-1, self.grid_size-1, 100]),
+            high=np.array([self.grid_size-1, self.grid_size-1, max(100, 50 * num_jobs)]),
             dtype=np.float32
         )
         self.window = None
         self.clock = None
         self.record_gif = record_gif
         self.gif_path = gif_path
-        self.frames = []
+        self.record_downscale = record_downscale
+        self.record_max_frames = record_max_frames  # None records until close()
+        self.recorder = None  # streams every second frame to gif_path (.gif or .mp4)
 
     def _get_observation(self):
         return np.array([self.agent_location[0], self.agent_location[1], self.readiness_score], dtype=np.float32)
 
-    def _generate_opportunities(self):
-        possible = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size)
-                    if (i, j) != tuple(self.agent_location)]
-        random.shuffle(possible)
-        # Single job goal in bottom-right quadrant
-        candidates = [(i, j) for i in range(self.grid_size//2, self.grid_size) 
-                     for j in range(self.grid_size//2, self.grid_size)]
-        candidates = [pos for pos in candidates if pos in possible]
-        if candidates:
-            pos = random.choice(candidates)
-            return [{"pos": pos, "type": "job"}]
-        return []
-
-    def _generate_distractions(self):
-        possible = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size)
-                    if (i, j) != tuple(self.agent_location) and
-                    all((i, j) != opp["pos"] for opp in self.opportunity_cells)]
-        random.shuffle(possible)
-        distraction_types = ["phone", "drugs_alcohol", "social_media"]
-        distractions = []
-        num_distractions = 3
-        for i, dist_type in enumerate(distraction_types):
-            if possible:
-                pos = possible.pop(0)
-                distractions.append({"pos": pos, "type": dist_type})
-        return distractions
+    def _generate_layout(self):
+        """Job and distraction cells from one draw of self.np_random over all valid layouts"""
+        jobs, distractions = self._sampler.draw(self.np_random)
+        opportunity_cells = [{"pos": pos, "type": "job"} for pos in jobs]
+        distraction_cells = [{"pos": pos, "type": DISTRACTION_TYPES[k % len(DISTRACTION_TYPES)]}
+                             for k, pos in enumerate(distractions)]
+        return opportunity_cells, distraction_cells
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
+        if seed is not None and self.renderer is not None:
+            self.renderer.seed(self._render_np_random())
         self.agent_location = [0, 0]
         self.steps_taken = 0
         self.readiness_score = 0
-        self.opportunity_cells = self._generate_opportunities()
-        self.distraction_cells = self._generate_distractions()
+        self.opportunity_cells, self.distraction_cells = self._generate_layout()
+        self._opportunity_index = {opp["pos"]: opp for opp in self.opportunity_cells}
+        self._distraction_index = {dist["pos"]: dist for dist in self.distraction_cells}
+        self._update_distance_field()
         self.last_time = time.time()
         self.last_reward = 0
         self.consecutive_positive_rewards = 0
-        self.frames = []
         if self.render_mode == "human":
             self.render()
         return self._get_observation(), {}
@@ -106,12 +102,12 @@ class CustomCareerEnv(gym.Env):
         elif action == 3 and self.agent_location[1] < self.grid_size - 1:
             self.agent_location[1] += 1
         elif action == 4:  # Use opportunity
-            for opp in self.opportunity_cells[:]:
-                if tuple(self.agent_location) == opp["pos"]:
-                    reward += 50.0
-                    self.readiness_score += 50
-                    self.opportunity_cells.remove(opp)
-                    break
+            opp = self._opportunity_index.pop(tuple(self.agent_location), None)
+            if opp is not None:
+                reward += 50.0
+                self.readiness_score += 50
+                self.opportunity_cells.remove(opp)
+                self._update_distance_field()
 
         # Distance-based shaping
         new_distance = self._distance_to_closest_opportunity()
@@ -121,11 +117,9 @@ class CustomCareerEnv(gym.Env):
             reward -= 0.1
 
         # Distraction penalty
-        for dist in self.distraction_cells:
-            if tuple(self.agent_location) == dist["pos"]:
-                reward = -2.0
-                self.readiness_score = max(0, self.readiness_score - 2)
-                break
+        if tuple(self.agent_location) in self._distraction_index:
+            reward = -2.0
+            self.readiness_score = max(0, self.readiness_score - 2)
 
         # Reward streak bonus
         if reward > 0:
@@ -150,15 +144,41 @@ class CustomCareerEnv(gym.Env):
 
         return self._get_observation(), reward, done, truncated, {}
     
+    def _update_distance_field(self):
+        """Drop the distance field on reset and when an opportunity is used; the next lookup rebuilds it if needed"""
+        self._distance_rows = None
+
     def _distance_to_closest_opportunity(self):
-        if not self.opportunity_cells:
-            return 0
-        return min(
-            abs(self.agent_location[0] - opp["pos"][0]) + abs(self.agent_location[1] - opp["pos"][1])
-            for opp in self.opportunity_cells
-        )
+        row, col = self.agent_location
+        if len(self.opportunity_cells) <= DIRECT_DISTANCE_LIMIT:
+            return min((abs(row - r) + abs(col - c) for r, c in self._opportunity_index), default=0)
+        if self._distance_rows is None:
+            # Plain lists: cheaper to index per step
+            self._distance_rows = cells_distance_field([opp["pos"] for opp in self.opportunity_cells],
+                                                       self.grid_size).tolist()
+        return self._distance_rows[row][col]
+
+    def _render_np_random(self):
+        """Generator for visual effects, spawned from the episode seed but separate from self.np_random.
+
+        Rendering never consumes the environment's stream, so a rendered run
+        and a headless run with the same seed see the same episodes.
+        """
+        return np.random.Generator(np.random.PCG64(self.np_random.bit_generator.seed_seq.spawn(1)[0]))
+
+    def _init_renderer(self):
+        """Import pygame and build the Rendering object the first time a frame is needed"""
+        import pygame
+        from .rendering import Rendering
+        pygame.init()
+        self.renderer = Rendering(self.window_size, np_random=self._render_np_random(), grid_size=self.grid_size)
 
     def render(self):
+        if self.renderer is None:
+            self._init_renderer()
+        if self.render_mode == "rgb_array":
+            return self._render_frame()
+        import pygame
         if self.window is None and self.render_mode == "human":
             self.window = pygame.display.set_mode((self.window_size, self.window_size))
             pygame.display.set_caption("Career Path Environment - Random Demo")
@@ -178,25 +198,67 @@ class CustomCareerEnv(gym.Env):
             self.max_steps
         )
         self.window.blit(canvas, canvas.get_rect())
-        if self.record_gif and self.steps_taken % 2 == 0 and len(self.frames) < 200:  # Limit to 200 frames
+        if self.record_gif and self.steps_taken % 2 == 0:
             frame = pygame.surfarray.array3d(canvas)
-            frame = np.transpose(frame, (1, 0, 2))
-            self.frames.append(frame)
+            self._record_frame(np.transpose(frame, (1, 0, 2)))
         pygame.event.pump()
         pygame.display.update()
         self.clock.tick(self.metadata["render_fps"])
 
+    def _render_frame(self):
+        """Offscreen frame as an (H, W, 3) uint8 array; no window, no frame-rate throttling"""
+        import pygame
+        # Advance animations by one video frame so output does not depend on wall-clock time
+        self.renderer.update_animations(1.0 / self.metadata["render_fps"])
+        canvas = self.renderer.draw_frame(
+            self.agent_location,
+            self.opportunity_cells,
+            self.distraction_cells,
+            self.readiness_score,
+            self.steps_taken,
+            self.max_steps
+        )
+        frame = np.frombuffer(bytearray(pygame.image.tobytes(canvas, "RGB")), dtype=np.uint8)
+        frame = frame.reshape(canvas.get_height(), canvas.get_width(), 3)
+        if self.record_gif and self.steps_taken % 2 == 0:
+            self._record_frame(frame.copy())
+        return frame
+
+    def _record_frame(self, frame):
+        """Hand a frame to the background recorder.
+
+        Offscreen (rgb_array) recordings wait for the writer so they are
+        complete and reproducible; a human window drops frames instead of
+        stalling.
+        """
+        if self.recorder is None:
+            from .recorder import FrameRecorder
+            self.recorder = FrameRecorder(self.gif_path, fps=self.metadata["render_fps"],
+                                          downscale=self.record_downscale, max_frames=self.record_max_frames,
+                                          drop_when_full=self.render_mode == "human")
+        self.recorder.add(frame)
+
     def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Recording saved to {self.gif_path}")
+            if self.recorder.dropped:
+                print(f"{self.recorder.dropped} frames dropped because the writer fell behind "
+                      f"({self.recorder.frames_written} written)")
+            if self.recorder.over_limit:
+                print(f"{self.recorder.over_limit} frames dropped past the {self.record_max_frames}-frame limit")
+            self.recorder = None
+        if self.renderer is None:
+            return
+        import pygame
         if self.window is not None:
-            if self.record_gif and self.frames:
-                imageio.mimsave(self.gif_path, self.frames, fps=15)
-                print(f"GIF saved to {self.gif_path}")
             pygame.display.quit()
             self.window = None
         pygame.quit()
 
 # DEMO with random actions
 if __name__ == "__main__":
+    import pygame
     env = CustomCareerEnv(render_mode="human", window_size=800, record_gif=True, gif_path="career_env_demo.gif")
     obs, info = env.reset()
     done = False
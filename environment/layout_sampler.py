@@ -0,0 +1,107 @@
+import math
+import numpy as np
+from functools import lru_cache
+from typing import List, Tuple
+
+# Largest (job candidates x free cells) table kept for index-based sampling
+INDEX_TABLE_LIMIT = 1 << 16
+
+
+class LayoutSampler:
+    """Uniform sampler over every valid layout of the grid.
+
+    A layout is ``num_jobs`` distinct job cells in the bottom-right quadrant
+    (never the start cell) followed by ``num_distractions`` distinct cells
+    that are neither the start nor a job, in distraction-type order.
+
+    With one job on a small grid and few enough layouts to number in int64
+    (``indexed``), layouts are numbered
+    ``0 .. n_layouts - 1`` in mixed radix (job, then one digit per
+    distraction), so a reset is one ``rng.integers(n_layouts)`` call plus a
+    few integer ops and batches decode with array ops. The only precomputed
+    table is the free-cell list of each job, a small ``(n_jobs, n_free)``
+    integer array. Other configurations draw jobs and distractions with
+    ``rng.choice`` without replacement, in O(entities) whatever the grid size.
+    """
+    def __init__(self, grid_size: int = 8, num_distractions: int = 3, start: Tuple[int, int] = (0, 0),
+                 num_jobs: int = 1):
+        self.grid_size = grid_size
+        self.num_distractions = num_distractions
+        self.num_jobs = num_jobs
+        half = grid_size // 2
+        start_cell = start[0] * grid_size + start[1]
+        cell_dtype = np.min_scalar_type(grid_size * grid_size)
+        # Same row-major candidate order CustomCareerEnv has always used
+        self.jobs = np.array([i * grid_size + j for i in range(half, grid_size) for j in range(half, grid_size)
+                              if i * grid_size + j != start_cell], dtype=cell_dtype)
+        n_free = grid_size * grid_size - 1 - num_jobs
+        if not 1 <= num_jobs <= len(self.jobs):
+            raise ValueError(f"{num_jobs} jobs do not fit in {len(self.jobs)} job cells")
+        if num_distractions > n_free:
+            raise ValueError(f"{num_distractions} distractions do not fit in {n_free} free cells")
+        self._start_cell = start_cell
+        self.indexed = num_jobs == 1 and len(self.jobs) * n_free <= INDEX_TABLE_LIMIT
+        if self.indexed:
+            self.layouts_per_job = math.prod(range(n_free, n_free - num_distractions, -1))
+            self.n_layouts = len(self.jobs) * self.layouts_per_job
+            self.indexed = self.n_layouts <= np.iinfo(np.int64).max
+        if not self.indexed:
+            return
+        cells = np.arange(grid_size * grid_size)
+        self.free_cells = np.stack([cells[(cells != start_cell) & (cells != job)] for job in self.jobs]).astype(cell_dtype)
+        self.radices = np.arange(n_free, n_free - num_distractions, -1)
+        # Plain-int copies for the one-layout path, where NumPy call overhead dominates
+        self._job_list = [divmod(int(job), grid_size) for job in self.jobs]
+        self._free_list = [[divmod(int(cell), grid_size) for cell in row] for row in self.free_cells]
+        self._radix_list = [int(radix) for radix in self.radices]
+
+    def decode(self, index) -> Tuple[np.ndarray, np.ndarray]:
+        """Job cells (B, 2) and distraction cells (B, num_distractions, 2) for layout indices (B,)"""
+        index = np.asarray(index, dtype=np.int64).reshape(-1)
+        job_slot, rest = np.divmod(index, self.layouts_per_job)
+        positions = np.empty((len(index), self.num_distractions), dtype=np.int64)
+        for k, radix in enumerate(self.radices):
+            rest, digit = np.divmod(rest, radix)
+            # digit counts among the cells not taken yet; skip over earlier picks in ascending order
+            for taken in np.sort(positions[:, :k], axis=1).T:
+                digit += digit >= taken
+            positions[:, k] = digit
+        jobs = self.jobs[job_slot].astype(np.int64)
+        distractions = self.free_cells[job_slot[:, None], positions].astype(np.int64)
+        return (np.stack(np.divmod(jobs, self.grid_size), axis=-1),
+                np.stack(np.divmod(distractions, self.grid_size), axis=-1))
+
+    def layout(self, index: int) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """Job cell and distraction cells of one layout index, as plain (row, col) tuples"""
+        job_slot, rest = divmod(int(index), self.layouts_per_job)
+        free = self._free_list[job_slot]
+        taken: List[int] = []
+        for radix in self._radix_list:
+            rest, digit = divmod(rest, radix)
+            for position in sorted(taken):
+                digit += digit >= position
+            taken.append(digit)
+        return self._job_list[job_slot], [free[position] for position in taken]
+
+    def sample(self, rng: np.random.Generator, size: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw size layouts from one generator with a single integers() call (indexed samplers only)"""
+        return self.decode(rng.integers(self.n_layouts, size=size))
+
+    def draw(self, rng: np.random.Generator) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Job cells and distraction cells of one layout drawn from rng, for any configuration"""
+        if self.indexed:
+            job, distractions = self.layout(rng.integers(self.n_layouts))
+            return [job], distractions
+        jobs = self.jobs[rng.choice(len(self.jobs), self.num_jobs, replace=False)].astype(np.int64)
+        # Rank r among the cells that are neither start nor job is cell r + (excluded cells at or below it)
+        excluded = np.sort(np.append(jobs, self._start_cell))
+        ranks = rng.choice(self.grid_size * self.grid_size - len(excluded), self.num_distractions, replace=False)
+        distractions = ranks + np.searchsorted(excluded - np.arange(len(excluded)), ranks, side="right")
+        return ([divmod(int(cell), self.grid_size) for cell in jobs],
+                [divmod(int(cell), self.grid_size) for cell in distractions])
+
+
+@lru_cache(maxsize=None)
+def get_layout_sampler(grid_size: int = 8, num_distractions: int = 3, num_jobs: int = 1) -> LayoutSampler:
+    """Shared sampler per grid configuration, built once per process"""
+    return LayoutSampler(grid_size, num_distractions, num_jobs=num_jobs)
@@ -0,0 +1,117 @@
+import io
+import os
+import queue
+import struct
+import threading
+import numpy as np
+from typing import Optional
+
+
+class _GifStream:
+    """Append-only animated GIF writer; every frame is written to disk as soon as it arrives.
+
+    Each frame is encoded by Pillow as a standalone GIF, then spliced in with
+    its palette moved into a local colour table.
+    """
+    def __init__(self, path: str, fps: float):
+        self.fp = open(path, "wb")
+        self.delay = max(1, int(round(100 / fps)))  # centiseconds
+
+    @staticmethod
+    def _split(data: bytes):
+        """Split a single-frame GIF into (header, image block carrying a local colour table)"""
+        flags = data[10]
+        pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+        header, palette = data[:pos], data[13:pos]
+        while data[pos:pos + 1] == b"!":  # skip Pillow's own extension blocks
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+        block = data[pos:-1]  # image descriptor + LZW data, without the trailer
+        if palette:
+            block = block[:9] + bytes([block[9] | 0x80 | (flags & 7)]) + palette + block[10:]
+        return header, block
+
+    def append_data(self, frame: np.ndarray):
+        from PIL import Image
+        image = Image.fromarray(np.ascontiguousarray(frame[..., :3])).quantize(256)
+        buffer = io.BytesIO()
+        image.save(buffer, format="GIF")
+        header, block = self._split(buffer.getvalue())
+        if self.fp.tell() == 0:
+            self.fp.write(b"GIF89a" + header[6:])  # 89a for the loop and delay extensions
+            self.fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")  # loop forever
+        self.fp.write(b"!\xf9\x04\x00" + struct.pack("<H", self.delay) + b"\x00\x00")
+        self.fp.write(block)
+
+    def close(self):
+        if self.fp.tell():
+            self.fp.write(b";")
+        self.fp.close()
+
+
+class FrameRecorder:
+    """Streams frames to a GIF/MP4 file from a background thread.
+
+    Frames go through a bounded queue, so memory stays constant however long
+    the episode runs. When the writer falls behind, ``add`` waits for room and
+    every frame is recorded; with ``drop_when_full`` it returns at once
+    instead and the frame is dropped (and counted in ``dropped``), which keeps
+    an interactive window smooth at the cost of gaps. At most ``max_frames``
+    frames (None: no limit) are recorded; later ones are counted in
+    ``over_limit``.
+    """
+    def __init__(self, path: str, fps: float = 15, downscale: int = 1, max_queue: int = 32,
+                 max_frames: Optional[int] = None, drop_when_full: bool = False):
+        self.path = path
+        self.downscale = downscale
+        self.max_frames = max_frames
+        self.drop_when_full = drop_when_full
+        self.frames_queued = 0
+        self.frames_written = 0
+        self.dropped = 0
+        self.over_limit = 0
+        self._error: Optional[BaseException] = None
+        if os.path.splitext(path)[1].lower() == ".gif":
+            self._writer = _GifStream(path, fps)
+        else:
+            import imageio
+            self._writer = imageio.get_writer(path, fps=fps)  # MP4 etc. need imageio-ffmpeg
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def add(self, frame: np.ndarray):
+        """Queue an (H, W, 3) uint8 frame; the caller must not modify it afterwards"""
+        if self.max_frames is not None and self.frames_queued >= self.max_frames:
+            self.over_limit += 1
+            return
+        try:
+            self._queue.put(frame, block=not self.drop_when_full)
+            self.frames_queued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                if self.downscale > 1:
+                    frame = frame[::self.downscale, ::self.downscale]
+                self._writer.append_data(frame)
+                self.frames_written += 1
+            except BaseException as e:  # surfaced from close()
+                self._error = e
+
+    def close(self):
+        """Flush queued frames, finish the file and re-raise any writer error"""
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.close()
+        if self._error is not None:
+            raise self._error
@@ -1,41 +1,102 @@
 import pygame
 import numpy as np
 import math
-import random
 from typing import List, Dict, Tuple, Optional
+from .sprite_atlas import SpriteAtlas, ICON_TYPES, UI_HEIGHT, PROGRESS_HEIGHT, PROGRESS_X, PROGRESS_Y
 
 
-class Particle:
-    """Particle for visual effects"""
-    def __init__(self, x: float, y: float, vx: float, vy: float, 
-                 color: Tuple[int, int, int], lifetime: float):
-        pygame.font.init()
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = random.uniform(2, 6)
-    
+class ParticleSystem:
+    """Particles for visual effects, stored as fixed-capacity NumPy arrays"""
+    def __init__(self, capacity: int = 16384, np_random: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.np_random = np_random if np_random is not None else np.random.default_rng()
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color_index = np.zeros(capacity, dtype=np.int32)
+        self.palette: List[Tuple[int, int, int]] = []
+        self._sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _color_index(self, color: Tuple[int, int, int]) -> int:
+        color = tuple(color[:3])
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def emit(self, x: float, y: float, color: Tuple[int, int, int], count: int):
+        """Append a burst at (x, y); particles beyond capacity are dropped"""
+        start = self.count
+        stop = min(self.capacity, start + count)
+        n = stop - start
+        if n <= 0:
+            return
+        self.x[start:stop] = x
+        self.y[start:stop] = y
+        self.vx[start:stop] = self.np_random.uniform(-100, 100, n)
+        self.vy[start:stop] = self.np_random.uniform(-200, -50, n)
+        self.lifetime[start:stop] = self.np_random.uniform(0.5, 1.5, n)
+        self.size[start:stop] = self.np_random.uniform(2, 6, n)
+        self.color_index[start:stop] = self._color_index(color)
+        self.count = stop
+
     def update(self, dt: float):
-        """Update particle physics"""
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vy += 50 * dt
-        self.lifetime -= dt
-        self.size *= 0.99
-    
-    def is_dead(self) -> bool:
-        return self.lifetime <= 0
+        """Drop dead particles, then integrate the survivors"""
+        n = self.count
+        alive = np.flatnonzero(self.lifetime[:n] > 0)
+        if len(alive) < n:
+            m = len(alive)
+            for buf in (self.x, self.y, self.vx, self.vy, self.lifetime, self.size, self.color_index):
+                buf[:m] = buf[alive]
+            n = self.count = m
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.vy[:n] += 50 * dt
+        self.lifetime[:n] -= dt
+        self.size[:n] *= 0.99
+
+    def _sprite(self, color_index: int, radius: int) -> pygame.Surface:
+        key = (color_index, radius)
+        if key not in self._sprites:
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self.palette[color_index], (radius, radius), radius)
+            self._sprites[key] = sprite
+        return self._sprites[key]
+
+    def draw(self, canvas: pygame.Surface):
+        """Stamp every particle with a single batched blits() call"""
+        n = self.count
+        radius = self.size[:n].astype(np.int32)
+        visible = np.flatnonzero(radius >= 1)
+        if len(visible) == 0:
+            return
+        radius = radius[visible]
+        left = self.x[visible].astype(np.int32) - radius
+        top = self.y[visible].astype(np.int32) - radius
+        # Look up each distinct (color, radius) sprite once, then map particles onto them
+        keys = self.color_index[visible].astype(np.int64) * 64 + radius
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        table = [self._sprite(int(k) // 64, int(k) % 64) for k in unique_keys]
+        sprites = map(table.__getitem__, inverse.tolist())
+        canvas.blits(zip(sprites, zip(left.tolist(), top.tolist())), doreturn=False)
 
 
 class Rendering:
-    def __init__(self, window_size: int = 800):
+    def __init__(self, window_size: int = 800, atlas_cache_dir: Optional[str] = None,
+                 np_random: Optional[np.random.Generator] = None, grid_size: int = 8):
+        if window_size < grid_size:
+            raise ValueError(f"window_size {window_size} leaves no pixels per cell of a {grid_size}x{grid_size} grid")
         self.window_size = window_size
-        self.cell_size = window_size // 8
-        self.particles = []
+        self.grid_size = grid_size
+        self.cell_size = window_size // grid_size
+        self.np_random = np_random if np_random is not None else np.random.default_rng()
+        self.particles = ParticleSystem(np_random=self.np_random)
         
         # Enhanced colors with gradients
         self.colors = {
@@ -67,12 +128,22 @@ class Rendering:
         self.fonts = {}
         self._load_fonts()
         
-        # Create enhanced graphics
-        self.graphics = self._create_enhanced_graphics()
+        # Prebuilt gradients, glow rings and icon tiles, shared by every Rendering of this size
+        self.atlas = SpriteAtlas.get(window_size, self.colors, atlas_cache_dir, grid_size)
+        self.graphics = {icon_type: self.atlas[icon_type] for icon_type in ICON_TYPES}
         
         # Visual effects
         self.screen_shake = 0
         self.flash_effect = 0
+
+        # Surfaces reused across frames, built on first use
+        self._canvas = None
+        self._ui_surf = None
+        self._static_layer = None
+        self._frame_canvas = None
+        # Progress bar fill fades from opaque at the top row
+        self._progress_alphas = [int(255 * (1 - i / PROGRESS_HEIGHT)) for i in range(PROGRESS_HEIGHT)]
+        self._text_cache = {}
         
     def _load_fonts(self):
         """Load pygame fonts for UI elements"""
@@ -85,86 +156,13 @@ class Rendering:
             self.fonts['medium'] = pygame.font.Font(None, 24)
             self.fonts['small'] = pygame.font.Font(None, 18)
     
-    def _create_enhanced_graphics(self) -> Dict:
-        """Create enhanced graphics with gradients and effects"""
-        graphics = {}
-        cell_size = self.cell_size
-        
-        # Job graphic with briefcase icon
-        job_surf = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-        for i in range(cell_size):
-            alpha = int(255 * (1 - i / cell_size))
-            color = (*self.colors['job'], alpha)
-            pygame.draw.line(job_surf, color, (0, i), (cell_size, i))
-        # Briefcase icon
-        case_width = cell_size//2
-        case_height = cell_size//2
-        handle_width = cell_size//4
-        handle_height = cell_size//8
-        pygame.draw.rect(job_surf, (255, 255, 255), 
-                        (cell_size//2 - handle_width//2, cell_size//3, handle_width, handle_height))
-        pygame.draw.rect(job_surf, (255, 255, 255),
-                        (cell_size//2 - case_width//2, cell_size//3 + handle_height, case_width, case_height))
-        graphics['job'] = job_surf
-        
-        # Phone distraction graphic
-        phone_surf = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-        for i in range(cell_size):
-            alpha = int(255 * (1 - i / cell_size))
-            color = (*self.colors['phone'], alpha)
-            pygame.draw.line(phone_surf, color, (0, i), (cell_size, i))
-        # Smartphone icon
-        phone_width = cell_size//3
-        phone_height = cell_size//2
-        pygame.draw.rect(phone_surf, (255, 255, 255),
-                        (cell_size//2 - phone_width//2, cell_size//2 - phone_height//2, phone_width, phone_height))
-        pygame.draw.rect(phone_surf, self.colors['phone'],
-                        (cell_size//2 - phone_width//3, cell_size//2 - phone_height//3, phone_width//1.5, phone_height//1.5))
-        graphics['phone'] = phone_surf
-        
-        # Drugs/Alcohol distraction graphic
-        drugs_alcohol_surf = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-        for i in range(cell_size):
-            alpha = int(255 * (1 - i / cell_size))
-            color = (*self.colors['drugs_alcohol'], alpha)
-            pygame.draw.line(drugs_alcohol_surf, color, (0, i), (cell_size, i))
-        # Bottle icon
-        bottle_width = cell_size//4
-        bottle_height = cell_size//2
-        neck_width = bottle_width//2
-        neck_height = bottle_height//3
-        pygame.draw.rect(drugs_alcohol_surf, (255, 255, 255),
-                        (cell_size//2 - neck_width//2, cell_size//2 - bottle_height//2, neck_width, neck_height))
-        pygame.draw.rect(drugs_alcohol_surf, (255, 255, 255),
-                        (cell_size//2 - bottle_width//2, cell_size//2 - bottle_height//2 + neck_height, bottle_width, bottle_height - neck_height))
-        graphics['drugs_alcohol'] = drugs_alcohol_surf
-        
-        # Social Media distraction graphic
-        social_media_surf = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-        for i in range(cell_size):
-            alpha = int(255 * (1 - i / cell_size))
-            color = (*self.colors['social_media'], alpha)
-            pygame.draw.line(social_media_surf, color, (0, i), (cell_size, i))
-        # Chat bubble icon
-        bubble_width = cell_size//2
-        bubble_height = cell_size//3
-        pygame.draw.ellipse(social_media_surf, (255, 255, 255),
-                          (cell_size//2 - bubble_width//2, cell_size//2 - bubble_height//2, bubble_width, bubble_height))
-        pygame.draw.polygon(social_media_surf, (255, 255, 255),
-                           [(cell_size//2, cell_size//2 + bubble_height//2),
-                            (cell_size//2 - bubble_width//4, cell_size//2 + bubble_height),
-                            (cell_size//2 + bubble_width//4, cell_size//2 + bubble_height)])
-        graphics['social_media'] = social_media_surf
-        
-        return graphics
-    
+    def seed(self, np_random: np.random.Generator):
+        """Draw screen shake and particles from np_random from now on"""
+        self.np_random = self.particles.np_random = np_random
+
     def add_particles(self, x: float, y: float, color: Tuple[int, int, int], count: int = 10):
         """Add particle burst effect"""
-        for _ in range(count):
-            vx = random.uniform(-100, 100)
-            vy = random.uniform(-200, -50)
-            lifetime = random.uniform(0.5, 1.5)
-            self.particles.append(Particle(x, y, vx, vy, color, lifetime))
+        self.particles.emit(x, y, color, count)
     
     def update_animations(self, dt: float):
         """Update animation timers and particles"""
@@ -173,9 +171,7 @@ class Rendering:
         self.rotation_animation += dt * 0.75
 
         # Update particles
-        self.particles = [p for p in self.particles if not p.is_dead()]
-        for particle in self.particles:
-            particle.update(dt)
+        self.particles.update(dt)
         
         # Update effects
         self.screen_shake = max(0, self.screen_shake - dt * 5)
@@ -189,16 +185,25 @@ class Rendering:
         """Trigger flash effect"""
         self.flash_effect = intensity
     
+    def _shake_offset(self) -> Tuple[float, float]:
+        if self.screen_shake <= 0:
+            return 0, 0
+        return tuple(self.np_random.uniform(-self.screen_shake, self.screen_shake, 2).tolist())
+
     def draw_environment(self, window, agent_location: List[int], 
                        opportunity_cells: List[Dict], distraction_cells: List[Dict],
                        readiness_score: int, steps_taken: int, max_steps: int) -> pygame.Surface:
-        """Draw the enhanced environment with advanced effects"""
-        canvas = pygame.Surface((self.window_size, self.window_size), pygame.SRCALPHA)
+        """Draw the enhanced environment with advanced effects.
+
+        The returned surface is reused between calls.
+        """
+        if self._canvas is None:
+            self._canvas = pygame.Surface((self.window_size, self.window_size), pygame.SRCALPHA)
+        canvas = self._canvas
         canvas.fill(self.colors['background'])
         
         # Apply screen shake
-        shake_x = random.uniform(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        shake_y = random.uniform(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        shake_x, shake_y = self._shake_offset()
         
         # Draw background pattern with parallax effect
         self._draw_background_pattern(canvas, shake_x * 0.1, shake_y * 0.1)
@@ -221,38 +226,80 @@ class Rendering:
         
         # Apply flash effect
         if self.flash_effect > 0:
-            flash_surf = pygame.Surface((self.window_size, self.window_size), pygame.SRCALPHA)
-            flash_surf.fill((255, 255, 255, int(255 * self.flash_effect)))
-            canvas.blit(flash_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            canvas.fill((255, 255, 255, int(255 * self.flash_effect)), special_flags=pygame.BLEND_RGBA_ADD)
         
         return canvas
     
+    def draw_frame(self, agent_location: List[int], opportunity_cells: List[Dict],
+                   distraction_cells: List[Dict], readiness_score: int,
+                   steps_taken: int, max_steps: int) -> pygame.Surface:
+        """Draw the environment offscreen on top of the cached static layer.
+
+        The background pattern and grid are composited once (at rest) and
+        only the entities, particles and UI are drawn per frame. The returned
+        surface is opaque and reused between calls.
+        """
+        if self._static_layer is None:
+            self._static_layer = self._build_static_layer()
+            self._frame_canvas = pygame.Surface((self.window_size, self.window_size))
+        canvas = self._frame_canvas
+
+        shake_x, shake_y = self._shake_offset()
+        if shake_x or shake_y:
+            canvas.fill(self.colors['background'])
+        canvas.blit(self._static_layer, (shake_x, shake_y))
+
+        self._draw_opportunities(canvas, opportunity_cells, shake_x, shake_y)
+        self._draw_distractions(canvas, distraction_cells, shake_x, shake_y)
+        self._draw_agent(canvas, agent_location, shake_x, shake_y)
+        self._draw_particles(canvas)
+        self._draw_enhanced_ui(canvas, readiness_score, steps_taken, max_steps)
+
+        if self.flash_effect > 0:
+            canvas.fill((255, 255, 255, int(255 * self.flash_effect)), special_flags=pygame.BLEND_RGBA_ADD)
+        return canvas
+
+    def _build_static_layer(self) -> pygame.Surface:
+        """Pre-composite the background, background pattern and grid at rest"""
+        layer = pygame.Surface((self.window_size, self.window_size))
+        layer.fill(self.colors['background'])
+        float_animation, pulse_animation = self.float_animation, self.pulse_animation
+        self.float_animation = self.pulse_animation = 0
+        self._draw_background_pattern(layer)
+        self._draw_grid(layer)
+        self.float_animation, self.pulse_animation = float_animation, pulse_animation
+        return layer
+
+    def _text(self, font: str, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Rendered text, cached so unchanged labels are not re-rasterized every frame"""
+        key = (font, text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 512:
+                self._text_cache.clear()
+            surf = self._text_cache[key] = self.fonts[font].render(text, True, color)
+        return surf
+
     def _draw_background_pattern(self, canvas, offset_x: float = 0, offset_y: float = 0):
         """Draw animated background pattern"""
+        dots = []
         for i in range(0, self.window_size, 40):
+            size = int(2 + math.sin(self.float_animation + i * 0.01) * 1)
+            if size < 1:
+                continue
+            dot = self.atlas[f"dot_{size}"]
             for j in range(0, self.window_size, 40):
-                x = i + offset_x
-                y = j + offset_y
                 if (i + j) % 80 == 0:
-                    size = 2 + math.sin(self.float_animation + i * 0.01) * 1
-                    pygame.draw.circle(canvas, (245, 245, 245), (int(x), int(y)), int(size))
+                    dots.append((dot, (int(i + offset_x) - size, int(j + offset_y) - size)))
+        canvas.blits(dots, doreturn=False)
     
     def _draw_grid(self, canvas, shake_x: float = 0, shake_y: float = 0):
         """Draw animated grid lines"""
-        grid_size = 8
-        for i in range(grid_size + 1):
+        for i in range(self.grid_size + 1):
             pos = i * self.cell_size
             alpha = int(200 + 55 * math.sin(self.pulse_animation + i * 0.5))
-            color = (*self.colors['grid'], alpha)
-            
-            # Create temporary surface for alpha blending
-            line_surf = pygame.Surface((self.window_size, 2), pygame.SRCALPHA)
-            pygame.draw.line(line_surf, color, (0, 0), (self.window_size, 0), 1)
-            canvas.blit(line_surf, (shake_x, pos + shake_y))
-            
-            line_surf = pygame.Surface((2, self.window_size), pygame.SRCALPHA)
-            pygame.draw.line(line_surf, color, (0, 0), (0, self.window_size), 1)
-            canvas.blit(line_surf, (pos + shake_x, shake_y))
+            canvas.blit(self.atlas[f"grid_h_{alpha}"], (shake_x, pos + shake_y))
+            canvas.blit(self.atlas[f"grid_v_{alpha}"], (pos + shake_x, shake_y))
     
     def _draw_opportunities(self, canvas, opportunity_cells, shake_x: float = 0, shake_y: float = 0):
         """Draw opportunity cells with enhanced animations"""
@@ -268,16 +315,13 @@ class Rendering:
             # Add rotation effect
             rotation = math.sin(self.rotation_animation + i + j) * 5
             
-            # Draw the graphic with rotation
-            graphic = self.graphics[opp["type"]]
-            rotated_graphic = pygame.transform.rotate(graphic, rotation)
-            canvas.blit(rotated_graphic, (x, y))
+            # Draw the graphic with rotation (prebuilt per whole degree)
+            canvas.blit(self.atlas[f"{opp['type']}_rot{round(rotation)}"], (x, y))
             
             # Add pulse effect
             pulse_alpha = int(128 + 64 * math.sin(self.pulse_animation + i + j))
-            pulse_surf = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-            pulse_surf.fill((255, 255, 255, pulse_alpha))
-            canvas.blit(pulse_surf, (x, y), special_flags=pygame.BLEND_RGBA_MULT)
+            canvas.fill((255, 255, 255, pulse_alpha), (x, y, self.cell_size, self.cell_size),
+                        special_flags=pygame.BLEND_RGBA_MULT)
     
     def _draw_distractions(self, canvas, distraction_cells, shake_x: float = 0, shake_y: float = 0):
         """Draw distraction cells with warning effects"""
@@ -288,9 +332,8 @@ class Rendering:
             
             # Add warning animation
             warning_alpha = int(128 + 64 * math.sin(self.pulse_animation * 2 + i + j))
-            warning_surf = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-            warning_surf.fill((255, 0, 0, warning_alpha))
-            canvas.blit(warning_surf, (x, y), special_flags=pygame.BLEND_RGBA_MULT)
+            canvas.fill((255, 0, 0, warning_alpha), (x, y, self.cell_size, self.cell_size),
+                        special_flags=pygame.BLEND_RGBA_MULT)
             
             # Draw the graphic
             graphic = self.graphics[dist["type"]]
@@ -303,19 +346,15 @@ class Rendering:
         
         # Draw multiple glow layers for depth
         for i in range(3):
-            glow_radius = int(self.cell_size // 2 + 5 * math.sin(self.pulse_animation) + i * 5)
+            glow_radius = max(1, int(self.cell_size // 2 + 5 * math.sin(self.pulse_animation) + i * 5))
             glow_alpha = 50 - i * 15
-            glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*self.colors['agent_glow'], glow_alpha), 
-                             (glow_radius, glow_radius), glow_radius)
-            canvas.blit(glow_surf, (x - glow_radius, y - glow_radius))
+            canvas.blit(self.atlas[f"glow_{glow_alpha}_{glow_radius}"], (x - glow_radius, y - glow_radius))
         
         # Draw main agent circle with gradient
         radius = self.cell_size // 3
-        for i in range(radius):
-            alpha = int(255 * (1 - i / radius))
-            color = (*self.colors['agent'], alpha)
-            pygame.draw.circle(canvas, color, (int(x), int(y)), radius - i)
+        body_position = (int(x) - radius, int(y) - radius)
+        canvas.blit(self.atlas["agent_body_hole"], body_position, special_flags=pygame.BLEND_RGBA_MULT)
+        canvas.blit(self.atlas["agent_body"], body_position, special_flags=pygame.BLEND_RGBA_ADD)
         
         # Draw agent details (eyes with animation)
         eye_offset = self.cell_size // 8
@@ -328,38 +367,28 @@ class Rendering:
     
     def _draw_particles(self, canvas):
         """Draw particle effects"""
-        for particle in self.particles:
-            color = particle.color
-            pygame.draw.circle(canvas, color, (int(particle.x), int(particle.y)), int(particle.size))
+        self.particles.draw(canvas)
     
     def _draw_enhanced_ui(self, canvas, readiness_score, steps_taken, max_steps):
         """Draw enhanced UI elements"""
-        ui_height = 120
-        ui_surf = pygame.Surface((self.window_size, ui_height), pygame.SRCALPHA)
+        ui_height = UI_HEIGHT
+        if self._ui_surf is None:
+            self._ui_surf = pygame.Surface((self.window_size, ui_height), pygame.SRCALPHA)
+        ui_surf = self._ui_surf
         
-        # Gradient background
-        for i in range(ui_height):
-            alpha = int(200 * (1 - i / ui_height))
-            color = (*self.colors['ui_bg'][:3], alpha)
-            pygame.draw.line(ui_surf, color, (0, i), (self.window_size, i))
+        # Gradient background with the empty progress bar baked in
+        ui_surf.fill((0, 0, 0, 0))
+        ui_surf.blit(self.atlas["ui_panel"], (0, 0))
         
         # Draw readiness score with glow
-        score_text = self.fonts['large'].render(f"Readiness Score: {readiness_score}", True, self.colors['text'])
-        text_glow = self.fonts['large'].render(f"Readiness Score: {readiness_score}", True, (255, 255, 255))
+        score_text = self._text('large', f"Readiness Score: {readiness_score}", self.colors['text'])
+        text_glow = self._text('large', f"Readiness Score: {readiness_score}", (255, 255, 255))
         ui_surf.blit(text_glow, (22, 22))  # Glow effect
         ui_surf.blit(score_text, (20, 20))
         
         # Draw animated progress bar
         progress_width = self.window_size - 40
-        progress_height = 20
-        progress_x, progress_y = 20, 60
-        
-        # Background with gradient
-        for i in range(progress_height):
-            alpha = int(255 * (1 - i / progress_height))
-            color = (*self.colors['progress_bg'], alpha)
-            pygame.draw.line(ui_surf, color, (progress_x, progress_y + i), 
-                           (progress_x + progress_width, progress_y + i))
+        progress_x, progress_y = PROGRESS_X, PROGRESS_Y
         
         # Progress with animation
         progress_ratio = min(1.0, steps_taken / max_steps)
@@ -367,14 +396,14 @@ class Rendering:
         
         # Animated progress bar
         animation_offset = math.sin(self.pulse_animation) * 2
-        for i in range(progress_height):
-            alpha = int(255 * (1 - i / progress_height))
-            color = (*self.colors['progress_bar'], alpha)
-            pygame.draw.line(ui_surf, color, (progress_x, progress_y + i + animation_offset), 
-                           (progress_x + progress_fill_width, progress_y + i + animation_offset))
+        # Lines straight onto the panel: they replace its RGBA rather than blend, as the bar always has
+        for i, alpha in enumerate(self._progress_alphas):
+            pygame.draw.line(ui_surf, (*self.colors['progress_bar'], alpha),
+                             (progress_x, progress_y + i + animation_offset),
+                             (progress_x + progress_fill_width, progress_y + i + animation_offset))
         
         # Progress text
-        progress_text = self.fonts['small'].render(f"Progress: {steps_taken}/{max_steps}", True, self.colors['text'])
+        progress_text = self._text('small', f"Progress: {steps_taken}/{max_steps}", self.colors['text'])
         ui_surf.blit(progress_text, (progress_x, progress_y + 25))
         
         # Draw animated legend
@@ -392,7 +421,7 @@ class Rendering:
             pulse = math.sin(self.pulse_animation + x_offset * 0.1) * 0.2 + 0.8
             size = int(15 * pulse)
             pygame.draw.rect(ui_surf, color, (x_offset, legend_y, size, size))
-            legend_text = self.fonts['small'].render(text, True, self.colors['text'])
+            legend_text = self._text('small', text, self.colors['text'])
             ui_surf.blit(legend_text, (x_offset + 20, legend_y))
             x_offset += 150
         
@@ -0,0 +1,59 @@
+import hashlib
+import numpy as np
+from typing import Iterable, List
+
+
+def spawn_seeds(seed: int, n: int) -> List[int]:
+    """n independent seeds, one child of SeedSequence(seed) per worker process.
+
+    Each worker seeds its own VecEnv from its seed with seed_vec_env;
+    seeding the workers ``seed + k`` instead would let worker k's envs
+    overlap worker k + 1's.
+    """
+    return [int(child.generate_state(1, np.uint64)[0]) for child in np.random.SeedSequence(seed).spawn(n)]
+
+
+def seed_vec_env(venv, seed: int) -> List[int]:
+    """Seed venv through VecEnv.seed() from a SeedSequence-hashed base; takes effect on the next reset().
+
+    Env i still gets ``base + i``, but bases of different seeds are spread
+    over 63 bits, so nearby seeds no longer share environment streams.
+    """
+    base = int(np.random.SeedSequence(seed).generate_state(1, np.uint64)[0] >> 1)
+    return venv.seed(base)
+
+
+def rollout_digest(env, seed: int, actions: Iterable[int], render: bool = False) -> str:
+    """SHA-256 over every observation, reward and done flag (and rgb frame if render) of a seeded rollout.
+
+    Two runs with the same seed and actions must produce the same digest,
+    which makes it usable as a cache key for the trajectory.
+    """
+    digest = hashlib.sha256()
+    obs, _ = env.reset(seed=seed)
+    digest.update(obs.tobytes())
+    for action in actions:
+        obs, reward, terminated, truncated, _ = env.step(action)
+        digest.update(obs.tobytes())
+        digest.update(np.float64(reward).tobytes())
+        digest.update(bytes([terminated, truncated]))
+        if render:
+            digest.update(env.render().tobytes())
+        if terminated or truncated:
+            obs, _ = env.reset()
+            digest.update(obs.tobytes())
+    return digest.hexdigest()
+
+
+def vec_rollout_digest(venv, seed: int, actions: np.ndarray) -> str:
+    """rollout_digest for a VecEnv seeded with seed_vec_env; actions is (n_steps, num_envs)"""
+    digest = hashlib.sha256()
+    seed_vec_env(venv, seed)
+    digest.update(venv.reset().tobytes())
+    for step_actions in actions:
+        obs, rewards, dones, _ = venv.step(step_actions)
+        digest.update(obs.tobytes())
+        digest.update(np.asarray(rewards, dtype=np.float32).tobytes())
+        digest.update(np.asarray(dones, dtype=bool).tobytes())
+    return digest.hexdigest()
+
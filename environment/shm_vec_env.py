@@ -0,0 +1,205 @@
+import multiprocessing as mp
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper, VecEnv
+
+
+class _SharedBuffers:
+    """Preallocated shared-memory arrays for actions, observations, rewards and done flags"""
+    def __init__(self, ctx, num_envs: int, observation_space, action_space):
+        self.specs = {
+            "actions": (action_space.dtype, (num_envs, *action_space.shape)),
+            "obs": (observation_space.dtype, (num_envs, *observation_space.shape)),
+            "terminal_obs": (observation_space.dtype, (num_envs, *observation_space.shape)),
+            "rewards": (np.float32, (num_envs,)),
+            "dones": (np.bool_, (num_envs,)),
+            "truncated": (np.bool_, (num_envs,)),
+        }
+        self.raw = {name: ctx.RawArray("b", max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                    for name, (dtype, shape) in self.specs.items()}
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """NumPy views onto the shared buffers (valid in the parent and in every worker)"""
+        return {name: np.frombuffer(self.raw[name], dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+                for name, (dtype, shape) in self.specs.items()}
+
+
+def _shm_worker(remote, parent_remote, env_fn_wrappers: CloudpickleWrapper, start: int,
+                buffers: _SharedBuffers) -> None:
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    envs = [env_fn() for env_fn in env_fn_wrappers.var]
+    stop = start + len(envs)
+    shared = {name: array[start:stop] for name, array in buffers.arrays().items()}
+    actions, obs, terminal_obs = shared["actions"], shared["obs"], shared["terminal_obs"]
+    rewards, dones, truncated_buf = shared["rewards"], shared["dones"], shared["truncated"]
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                infos = {}
+                for i, env in enumerate(envs):
+                    observation, reward, terminated, truncated, info = env.step(actions[i])
+                    done = terminated or truncated
+                    rewards[i] = reward
+                    dones[i] = done
+                    truncated_buf[i] = truncated and not terminated
+                    if done:
+                        terminal_obs[i] = observation
+                        observation, _ = env.reset()
+                    obs[i] = observation
+                    if info:
+                        infos[i] = info
+                remote.send(infos)  # only non-empty infos travel through the pipe
+            elif cmd == "reset":
+                seeds, options = data
+                reset_infos = []
+                for i, env in enumerate(envs):
+                    maybe_options = {"options": options[i]} if options[i] else {}
+                    obs[i], reset_info = env.reset(seed=seeds[i], **maybe_options)
+                    reset_infos.append(reset_info)
+                remote.send(reset_infos)
+            elif cmd == "render":
+                remote.send([env.render() for env in envs])
+            elif cmd == "close":
+                for env in envs:
+                    env.close()
+                remote.close()
+                break
+            elif cmd == "env_method":
+                indices, name, args, kwargs = data
+                remote.send([envs[i].get_wrapper_attr(name)(*args, **kwargs) for i in indices])
+            elif cmd == "get_attr":
+                indices, name = data
+                remote.send([envs[i].get_wrapper_attr(name) for i in indices])
+            elif cmd == "set_attr":
+                indices, name, value = data
+                for i in indices:
+                    setattr(envs[i], name, value)
+                remote.send(None)
+            elif cmd == "is_wrapped":
+                indices, wrapper_class = data
+                remote.send([is_wrapped(envs[i], wrapper_class) for i in indices])
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+        except (EOFError, KeyboardInterrupt):
+            break
+
+
+class ShmVecEnv(VecEnv):
+    """Multiprocess VecEnv whose workers each step a slice of the environments.
+
+    Actions, observations, rewards and done flags live in shared-memory arrays
+    allocated up front; the pipes only carry one small command per worker per
+    step plus any non-empty info dicts (e.g. Monitor episode stats).
+
+    :param env_fns: Environments to run in subprocesses
+    :param n_workers: Number of worker processes (default: one per env, capped at the CPU count)
+    :param start_method: multiprocessing start method, as for SubprocVecEnv
+    """
+    def __init__(self, env_fns: List[Callable], n_workers: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        self.waiting = False
+        self.closed = False
+        num_envs = len(env_fns)
+        n_workers = min(num_envs, n_workers or mp.cpu_count())
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        # Buffers must exist before the workers start, so read the spaces from a throwaway env
+        probe = env_fns[0]()
+        observation_space, action_space = probe.observation_space, probe.action_space
+        probe.close()
+        self._buffers = _SharedBuffers(ctx, num_envs, observation_space, action_space)
+        self._shared = self._buffers.arrays()
+
+        bounds = np.linspace(0, num_envs, n_workers + 1).astype(int)
+        self._slices = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_workers)])
+        self.processes = []
+        for work_remote, remote, env_slice in zip(self.work_remotes, self.remotes, self._slices):
+            args = (work_remote, remote, CloudpickleWrapper(env_fns[env_slice]), env_slice.start, self._buffers)
+            process = ctx.Process(target=_shm_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        super().__init__(num_envs, observation_space, action_space)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._shared["actions"][:] = np.asarray(actions).reshape(self._shared["actions"].shape)
+        for remote in self.remotes:
+            remote.send(("step", None))
+        self.waiting = True
+
+    def step_wait(self):
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        for remote, env_slice in zip(self.remotes, self._slices):
+            for i, info in remote.recv().items():
+                infos[env_slice.start + i] = info
+        self.waiting = False
+        dones = self._shared["dones"].copy()
+        for i in np.flatnonzero(dones):
+            infos[i]["TimeLimit.truncated"] = bool(self._shared["truncated"][i])
+            infos[i]["terminal_observation"] = self._shared["terminal_obs"][i].copy()
+        return self._shared["obs"].copy(), self._shared["rewards"].copy(), dones, infos
+
+    def reset(self):
+        for remote, env_slice in zip(self.remotes, self._slices):
+            remote.send(("reset", (self._seeds[env_slice], self._options[env_slice])))
+        self.reset_infos = [info for remote in self.remotes for info in remote.recv()]
+        self._reset_seeds()
+        self._reset_options()
+        return self._shared["obs"].copy()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        for remote in self.remotes:
+            remote.send(("render", None))
+        return [frame for remote in self.remotes for frame in remote.recv()]
+
+    def _call(self, cmd: str, indices, *data) -> List[Any]:
+        """Send cmd to the workers owning indices and gather results in index order"""
+        indices = list(self._get_indices(indices))
+        calls = []
+        for remote, env_slice in zip(self.remotes, self._slices):
+            local = [i - env_slice.start for i in indices if env_slice.start <= i < env_slice.stop]
+            if local:
+                remote.send((cmd, (local, *data)))
+                calls.append(remote)
+        results = {}
+        for remote, env_slice in zip(self.remotes, self._slices):
+            if remote in calls:
+                local = [i for i in indices if env_slice.start <= i < env_slice.stop]
+                results.update(zip(local, remote.recv()))
+        return [results[i] for i in indices]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._call("get_attr", indices, attr_name)
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        indices = list(self._get_indices(indices))
+        for remote, env_slice in zip(self.remotes, self._slices):
+            local = [i - env_slice.start for i in indices if env_slice.start <= i < env_slice.stop]
+            if local:
+                remote.send(("set_attr", (local, attr_name, value)))
+                remote.recv()
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        return self._call("env_method", indices, method_name, method_args, method_kwargs)
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return self._call("is_wrapped", indices, wrapper_class)
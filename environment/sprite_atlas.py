@@ -0,0 +1,193 @@
+import os
+import pygame
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+# Bump when the tile set or any tile's drawing code changes so stale disk caches are ignored
+ATLAS_VERSION = 2
+
+UI_HEIGHT = 120
+PROGRESS_HEIGHT = 20
+PROGRESS_X, PROGRESS_Y = 20, 60
+ICON_TYPES = ("job", "phone", "drugs_alcohol", "social_media")
+ROTATIONS = range(-5, 6)
+GRID_ALPHAS = range(145, 256)
+GLOW_ALPHAS = (50, 35, 20)
+DOT_COLOR = (245, 245, 245)
+
+_ATLASES: Dict[Tuple[int, int], "SpriteAtlas"] = {}
+
+
+def _vertical_gradient(surf, color: Tuple[int, int, int], max_alpha: int, rect: Tuple[int, int, int, int]):
+    """Fill rect row by row, fading alpha from max_alpha at the top towards 0"""
+    x, y, width, height = rect
+    for i in range(height):
+        alpha = int(max_alpha * (1 - i / height))
+        pygame.draw.line(surf, (*color, alpha), (x, y + i), (x + width, y + i))
+
+
+def _create_icon_tiles(cell_size: int, colors: Dict) -> Dict[str, pygame.Surface]:
+    """Gradient cell tiles with the job and distraction icons"""
+    tiles = {}
+    for icon_type in ICON_TYPES:
+        surf = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
+        _vertical_gradient(surf, colors[icon_type], 255, (0, 0, cell_size, cell_size))
+        tiles[icon_type] = surf
+
+    # Briefcase icon
+    case_width = cell_size//2
+    case_height = cell_size//2
+    handle_width = cell_size//4
+    handle_height = cell_size//8
+    pygame.draw.rect(tiles['job'], (255, 255, 255),
+                    (cell_size//2 - handle_width//2, cell_size//3, handle_width, handle_height))
+    pygame.draw.rect(tiles['job'], (255, 255, 255),
+                    (cell_size//2 - case_width//2, cell_size//3 + handle_height, case_width, case_height))
+
+    # Smartphone icon
+    phone_width = cell_size//3
+    phone_height = cell_size//2
+    pygame.draw.rect(tiles['phone'], (255, 255, 255),
+                    (cell_size//2 - phone_width//2, cell_size//2 - phone_height//2, phone_width, phone_height))
+    pygame.draw.rect(tiles['phone'], colors['phone'],
+                    (cell_size//2 - phone_width//3, cell_size//2 - phone_height//3, phone_width//1.5, phone_height//1.5))
+
+    # Bottle icon
+    bottle_width = cell_size//4
+    bottle_height = cell_size//2
+    neck_width = bottle_width//2
+    neck_height = bottle_height//3
+    pygame.draw.rect(tiles['drugs_alcohol'], (255, 255, 255),
+                    (cell_size//2 - neck_width//2, cell_size//2 - bottle_height//2, neck_width, neck_height))
+    pygame.draw.rect(tiles['drugs_alcohol'], (255, 255, 255),
+                    (cell_size//2 - bottle_width//2, cell_size//2 - bottle_height//2 + neck_height, bottle_width, bottle_height - neck_height))
+
+    # Chat bubble icon
+    bubble_width = cell_size//2
+    bubble_height = cell_size//3
+    pygame.draw.ellipse(tiles['social_media'], (255, 255, 255),
+                      (cell_size//2 - bubble_width//2, cell_size//2 - bubble_height//2, bubble_width, bubble_height))
+    pygame.draw.polygon(tiles['social_media'], (255, 255, 255),
+                       [(cell_size//2, cell_size//2 + bubble_height//2),
+                        (cell_size//2 - bubble_width//4, cell_size//2 + bubble_height),
+                        (cell_size//2 + bubble_width//4, cell_size//2 + bubble_height)])
+
+    for icon_type in ICON_TYPES:
+        for angle in ROTATIONS:
+            tiles[f"{icon_type}_rot{angle}"] = pygame.transform.rotate(tiles[icon_type], angle)
+    return tiles
+
+
+def _create_agent_tiles(cell_size: int, colors: Dict) -> Dict[str, pygame.Surface]:
+    """Glow rings for every radius the pulse can reach, plus the gradient body"""
+    tiles = {}
+    for layer, alpha in enumerate(GLOW_ALPHAS):
+        # Small cells would put the smallest rings at zero or negative radius; Rendering clamps those to 1
+        for glow_radius in range(max(1, cell_size // 2 - 5 + layer * 5), cell_size // 2 + 6 + layer * 5):
+            surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*colors['agent_glow'], alpha), (glow_radius, glow_radius), glow_radius)
+            tiles[f"glow_{alpha}_{glow_radius}"] = surf
+
+    radius = cell_size // 3
+    body = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    for i in range(radius):
+        alpha = int(255 * (1 - i / radius))
+        pygame.draw.circle(body, (*colors['agent'], alpha), (radius, radius), radius - i)
+    tiles["agent_body"] = body
+    # The body was drawn straight onto the canvas, replacing its pixels rather than blending:
+    # Rendering clears the disc with this mask (BLEND_RGBA_MULT) and then adds the body (BLEND_RGBA_ADD)
+    hole = pygame.Surface(body.get_size(), pygame.SRCALPHA)
+    hole.fill((255, 255, 255, 255))
+    pygame.draw.circle(hole, (0, 0, 0, 0), (radius, radius), radius)
+    tiles["agent_body_hole"] = hole
+    return tiles
+
+
+def _create_background_tiles(window_size: int, colors: Dict) -> Dict[str, pygame.Surface]:
+    """Background dots and grid line strips for every alpha the pulse can reach"""
+    tiles = {}
+    for radius in range(1, 4):
+        dot = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(dot, DOT_COLOR, (radius, radius), radius)
+        tiles[f"dot_{radius}"] = dot
+    for alpha in GRID_ALPHAS:
+        horizontal = pygame.Surface((window_size, 2), pygame.SRCALPHA)
+        pygame.draw.line(horizontal, (*colors['grid'], alpha), (0, 0), (window_size, 0), 1)
+        tiles[f"grid_h_{alpha}"] = horizontal
+        vertical = pygame.Surface((2, window_size), pygame.SRCALPHA)
+        pygame.draw.line(vertical, (*colors['grid'], alpha), (0, 0), (0, window_size), 1)
+        tiles[f"grid_v_{alpha}"] = vertical
+    return tiles
+
+
+def _create_ui_tiles(window_size: int, colors: Dict) -> Dict[str, pygame.Surface]:
+    """UI panel with the empty progress bar baked in; the fill is drawn per frame by Rendering"""
+    progress_width = window_size - 40
+    panel = pygame.Surface((window_size, UI_HEIGHT), pygame.SRCALPHA)
+    _vertical_gradient(panel, colors['ui_bg'][:3], 200, (0, 0, window_size, UI_HEIGHT))
+    _vertical_gradient(panel, colors['progress_bg'], 255,
+                       (PROGRESS_X, PROGRESS_Y, progress_width, PROGRESS_HEIGHT))
+    return {"ui_panel": panel}
+
+
+class SpriteAtlas:
+    """Every gradient, glow ring and icon tile used by Rendering, built once per window and grid size"""
+    def __init__(self, window_size: int, tiles: Dict[str, pygame.Surface], grid_size: int = 8):
+        self.window_size = window_size
+        self.grid_size = grid_size
+        self.tiles = tiles
+
+    def __getitem__(self, name: str) -> pygame.Surface:
+        return self.tiles[name]
+
+    @classmethod
+    def build(cls, window_size: int, colors: Dict, grid_size: int = 8) -> "SpriteAtlas":
+        cell_size = window_size // grid_size
+        tiles = {}
+        tiles.update(_create_icon_tiles(cell_size, colors))
+        tiles.update(_create_agent_tiles(cell_size, colors))
+        tiles.update(_create_background_tiles(window_size, colors))
+        tiles.update(_create_ui_tiles(window_size, colors))
+        return cls(window_size, tiles, grid_size)
+
+    @classmethod
+    def get(cls, window_size: int, colors: Dict, cache_dir: Optional[str] = None,
+            grid_size: int = 8) -> "SpriteAtlas":
+        """Return the atlas for window_size and grid_size from memory, then cache_dir, building it if needed"""
+        key = (window_size, grid_size)
+        atlas = _ATLASES.get(key)
+        if atlas is not None:
+            return atlas
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"sprite_atlas_{window_size}x{grid_size}_v{ATLAS_VERSION}.npz")
+        if path is not None and os.path.exists(path):
+            atlas = cls.load(path)
+        else:
+            atlas = cls.build(window_size, colors, grid_size)
+            if path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                atlas.save(path)
+        _ATLASES[key] = atlas
+        return atlas
+
+    def save(self, path: str):
+        """Write every tile as an RGBA array into one .npz file"""
+        arrays = {"window_size": np.array(self.window_size), "grid_size": np.array(self.grid_size)}
+        for name, surf in self.tiles.items():
+            width, height = surf.get_size()
+            data = np.frombuffer(pygame.image.tobytes(surf, "RGBA"), dtype=np.uint8)
+            arrays[name] = data.reshape(height, width, 4)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "SpriteAtlas":
+        with np.load(path) as data:
+            tiles = {}
+            for name in data.files:
+                if name in ("window_size", "grid_size"):
+                    continue
+                rgba = data[name]
+                tiles[name] = pygame.image.frombytes(rgba.tobytes(), (rgba.shape[1], rgba.shape[0]), "RGBA")
+            return cls(int(data["window_size"]), tiles, int(data["grid_size"]))
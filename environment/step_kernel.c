@@ -0,0 +1,126 @@
+/* CustomCareerEnv.step over an int32 state record, see step_kernel.py for the layout.
+ * Built on first use by step_kernel.load_kernel(); python_step() there is the reference. */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+enum { ROW, COL, READINESS, STEPS, STREAK, JOB_ROW, JOB_COL, JOB_ALIVE, GRID, MAX_STEPS, N_DISTRACTIONS,
+       DISTRACTIONS };
+enum { TERMINATED = 1, TRUNCATED = 2 };
+
+static int distance(const int32_t *s)
+{
+    if (!s[JOB_ALIVE])
+        return 0;
+    return abs(s[ROW] - s[JOB_ROW]) + abs(s[COL] - s[JOB_COL]);
+}
+
+static double step(int32_t *s, long action, int *flags)
+{
+    double reward = -0.01;
+    int old_distance, new_distance, k;
+
+    s[STEPS] += 1;
+    old_distance = distance(s);
+
+    if (action == 0 && s[ROW] > 0)
+        s[ROW] -= 1;
+    else if (action == 1 && s[ROW] < s[GRID] - 1)
+        s[ROW] += 1;
+    else if (action == 2 && s[COL] > 0)
+        s[COL] -= 1;
+    else if (action == 3 && s[COL] < s[GRID] - 1)
+        s[COL] += 1;
+    else if (action == 4 && s[JOB_ALIVE] && s[ROW] == s[JOB_ROW] && s[COL] == s[JOB_COL]) {
+        reward += 50.0;
+        s[READINESS] += 50;
+        s[JOB_ALIVE] = 0;
+    }
+
+    new_distance = distance(s);
+    if (new_distance < old_distance)
+        reward += 0.5;
+    else if (new_distance > old_distance)
+        reward -= 0.1;
+
+    for (k = 0; k < s[N_DISTRACTIONS]; k++) {
+        if (s[ROW] == s[DISTRACTIONS + 2 * k] && s[COL] == s[DISTRACTIONS + 2 * k + 1]) {
+            reward = -2.0;
+            s[READINESS] = s[READINESS] > 2 ? s[READINESS] - 2 : 0;
+            break;
+        }
+    }
+
+    if (reward > 0) {
+        s[STREAK] += 1;
+        if (s[STREAK] >= 3) {
+            reward += 2.0;
+            s[STREAK] = 0;
+        }
+    } else {
+        s[STREAK] = 0;
+    }
+
+    *flags = 0;
+    if (s[STEPS] >= s[MAX_STEPS])
+        *flags |= TRUNCATED;
+    if (!s[JOB_ALIVE]) {
+        *flags |= TERMINATED;
+        reward += 50.0;
+    }
+    return reward;
+}
+
+/* step(state, action, obs) -> (reward, flags); writes the new observation into obs (float32[3]) */
+static PyObject *kernel_step(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    Py_buffer state, obs;
+    long action;
+    int flags;
+    double reward;
+    int32_t *s;
+    float *o;
+
+    if (nargs != 3) {
+        PyErr_SetString(PyExc_TypeError, "step(state, action, obs) takes 3 arguments");
+        return NULL;
+    }
+    action = PyLong_AsLong(args[1]);
+    if (action == -1 && PyErr_Occurred())
+        return NULL;
+    if (PyObject_GetBuffer(args[0], &state, PyBUF_WRITABLE) < 0)
+        return NULL;
+    if (PyObject_GetBuffer(args[2], &obs, PyBUF_WRITABLE) < 0) {
+        PyBuffer_Release(&state);
+        return NULL;
+    }
+    s = (int32_t *)state.buf;
+    if (state.len < (Py_ssize_t)(DISTRACTIONS * sizeof(int32_t)) || obs.len < (Py_ssize_t)(3 * sizeof(float)) ||
+        state.len < (Py_ssize_t)((DISTRACTIONS + 2 * s[N_DISTRACTIONS]) * sizeof(int32_t))) {
+        PyBuffer_Release(&state);
+        PyBuffer_Release(&obs);
+        PyErr_SetString(PyExc_ValueError, "state or obs buffer too small");
+        return NULL;
+    }
+    reward = step(s, action, &flags);
+    o = (float *)obs.buf;
+    o[0] = (float)s[ROW];
+    o[1] = (float)s[COL];
+    o[2] = (float)s[READINESS];
+    PyBuffer_Release(&state);
+    PyBuffer_Release(&obs);
+    return Py_BuildValue("(di)", reward, flags);
+}
+
+static PyMethodDef methods[] = {
+    {"step", (PyCFunction)(void (*)(void))kernel_step, METH_FASTCALL, "Advance the state record by one action"},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef module = {PyModuleDef_HEAD_INIT, "_career_step", NULL, -1, methods};
+
+PyMODINIT_FUNC PyInit__career_step(void)
+{
+    return PyModule_Create(&module);
+}
@@ -0,0 +1,103 @@
+import hashlib
+import importlib.util
+import os
+import shlex
+import subprocess
+import sysconfig
+import warnings
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Fields of the int32 state record, followed by N_DISTRACTIONS (row, col) pairs.
+# Must match the enum in step_kernel.c.
+ROW, COL, READINESS, STEPS, STREAK, JOB_ROW, JOB_COL, JOB_ALIVE, GRID, MAX_STEPS, N_DISTRACTIONS, DISTRACTIONS = range(12)
+TERMINATED = 1
+TRUNCATED = 2
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "step_kernel.c")
+BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+
+
+def state_size(num_distractions: int) -> int:
+    return DISTRACTIONS + 2 * num_distractions
+
+
+def python_step(s, action, obs) -> Tuple[float, int]:
+    """Reference implementation of the compiled kernel; same rules as CustomCareerEnv.step"""
+    reward = -0.01
+    s[STEPS] += 1
+    old_distance = abs(s[ROW] - s[JOB_ROW]) + abs(s[COL] - s[JOB_COL]) if s[JOB_ALIVE] else 0
+
+    if action == 0 and s[ROW] > 0:
+        s[ROW] -= 1
+    elif action == 1 and s[ROW] < s[GRID] - 1:
+        s[ROW] += 1
+    elif action == 2 and s[COL] > 0:
+        s[COL] -= 1
+    elif action == 3 and s[COL] < s[GRID] - 1:
+        s[COL] += 1
+    elif action == 4 and s[JOB_ALIVE] and s[ROW] == s[JOB_ROW] and s[COL] == s[JOB_COL]:
+        reward += 50.0
+        s[READINESS] += 50
+        s[JOB_ALIVE] = 0
+
+    new_distance = abs(s[ROW] - s[JOB_ROW]) + abs(s[COL] - s[JOB_COL]) if s[JOB_ALIVE] else 0
+    if new_distance < old_distance:
+        reward += 0.5
+    elif new_distance > old_distance:
+        reward -= 0.1
+
+    for k in range(DISTRACTIONS, DISTRACTIONS + 2 * s[N_DISTRACTIONS], 2):
+        if s[ROW] == s[k] and s[COL] == s[k + 1]:
+            reward = -2.0
+            s[READINESS] = max(0, s[READINESS] - 2)
+            break
+
+    if reward > 0:
+        s[STREAK] += 1
+        if s[STREAK] >= 3:
+            reward += 2.0
+            s[STREAK] = 0
+    else:
+        s[STREAK] = 0
+
+    flags = TRUNCATED if s[STEPS] >= s[MAX_STEPS] else 0
+    if not s[JOB_ALIVE]:
+        flags |= TERMINATED
+        reward += 50.0
+    obs[0], obs[1], obs[2] = s[ROW], s[COL], s[READINESS]
+    return reward, flags
+
+
+def build_kernel(build_dir: str = BUILD_DIR) -> str:
+    """Compile step_kernel.c into an extension module with the compiler Python was built with.
+
+    The output name carries a hash of the source, so edits trigger a rebuild
+    and concurrent workers never load a half-written file.
+    """
+    with open(SOURCE, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    target = os.path.join(build_dir, f"_career_step_{digest}{sysconfig.get_config_var('EXT_SUFFIX')}")
+    if os.path.exists(target):
+        return target
+    os.makedirs(build_dir, exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    ldshared = shlex.split(sysconfig.get_config_var("LDSHARED") or "cc -shared")
+    subprocess.run(ldshared + ["-O2", "-fPIC", f"-I{sysconfig.get_paths()['include']}", SOURCE, "-o", tmp],
+                   check=True, capture_output=True)
+    os.replace(tmp, target)
+    return target
+
+
+@lru_cache(maxsize=None)
+def load_kernel() -> Optional[object]:
+    """The compiled kernel module, or None (with a warning) if it cannot be built here"""
+    try:
+        path = build_kernel()
+        spec = importlib.util.spec_from_file_location("_career_step", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    except (OSError, ImportError, subprocess.CalledProcessError) as e:
+        warnings.warn(f"Compiled step kernel unavailable ({e!r}), using the Python kernel")
+        return None
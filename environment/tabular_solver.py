@@ -0,0 +1,164 @@
+import numpy as np
+from typing import Sequence
+from .actions import ACTION_DELTAS, USE_ACTION
+
+STREAK_LEVELS = 3  # consecutive_positive_rewards is always 0, 1 or 2 between steps
+
+
+class CareerMDP:
+    """Exact tabular model of CustomCareerEnv for a batch of L fixed layouts.
+
+    A state is (row, col, streak) while the job is still available, plus one
+    absorbing terminal state (index ``n_states``) reached by using the job.
+    Readiness only shows up in the observation and the step limit truncates
+    rather than terminates, so neither is part of the state. Dynamics are
+    deterministic, so the transition tensor is stored as next-state indices:
+    ``next_state[l, a, s]`` and ``rewards[l, a, s]`` both have shape (L, A, S),
+    action-major so backups reduce over contiguous (L, S) slices.
+    """
+    def __init__(self, jobs: np.ndarray, distractions: np.ndarray, grid_size: int = 8):
+        jobs = np.asarray(jobs, dtype=np.int64).reshape(-1, 2)
+        distractions = np.asarray(distractions, dtype=np.int64).reshape(len(jobs), -1, 2)
+        self.grid_size = grid_size
+        self.n_layouts = len(jobs)
+        self.n_states = grid_size * grid_size * STREAK_LEVELS
+        self.n_actions = len(ACTION_DELTAS)
+        self.terminal = self.n_states
+        self.jobs = jobs
+        self.distractions = distractions
+        self.rewards, self.next_state = self._build(jobs, distractions)
+        # next_state offset into a flattened (L, S + 1) value table, for a single np.take per backup
+        offsets = (np.arange(self.n_layouts) * (self.n_states + 1))[:, None, None]
+        self._flat_next = (self.next_state + offsets).astype(np.intp)
+
+    @classmethod
+    def from_envs(cls, envs: Sequence) -> "CareerMDP":
+        """Model the current layout of each (reset) CustomCareerEnv"""
+        for env in envs:
+            if env.num_jobs != 1 or len(env.opportunity_cells) != 1:
+                raise ValueError(f"CareerMDP models a single uncollected job, got num_jobs={env.num_jobs} with "
+                                 f"{len(env.opportunity_cells)} left; reset the env with num_jobs=1")
+        jobs = [env.opportunity_cells[0]["pos"] for env in envs]
+        distractions = [[dist["pos"] for dist in env.distraction_cells] for env in envs]
+        return cls(np.array(jobs), np.array(distractions), envs[0].grid_size)
+
+    def state_index(self, row, col, streak=0):
+        return (np.asarray(row) * self.grid_size + col) * STREAK_LEVELS + streak
+
+    def _build(self, jobs: np.ndarray, distractions: np.ndarray):
+        G, L = self.grid_size, self.n_layouts
+        # Per-(row, col, streak, action) geometry, shared by all layouts
+        row, col, streak, action = np.meshgrid(
+            np.arange(G), np.arange(G), np.arange(STREAK_LEVELS), np.arange(self.n_actions), indexing="ij")
+        new_row = np.clip(row + ACTION_DELTAS[action, 0], 0, G - 1)
+        new_col = np.clip(col + ACTION_DELTAS[action, 1], 0, G - 1)
+
+        job_row = jobs[:, 0].reshape(L, 1, 1, 1, 1)
+        job_col = jobs[:, 1].reshape(L, 1, 1, 1, 1)
+        on_job = (row == job_row) & (col == job_col)
+        collected = on_job & (action == USE_ACTION)
+
+        # Same arithmetic, in the same order, as CustomCareerEnv.step
+        reward = np.where(collected, -0.01 + 50.0, -0.01)
+        old_distance = np.abs(row - job_row) + np.abs(col - job_col)
+        new_distance = np.where(collected, 0, np.abs(new_row - job_row) + np.abs(new_col - job_col))
+        reward = np.where(new_distance < old_distance, reward + 0.5, reward)
+        reward = np.where(new_distance > old_distance, reward - 0.1, reward)
+
+        distraction_mask = np.zeros((L, G, G), dtype=bool)
+        layout = np.repeat(np.arange(L), distractions.shape[1])
+        distraction_mask[layout, distractions[..., 0].ravel(), distractions[..., 1].ravel()] = True
+        distracted = distraction_mask[np.arange(L).reshape(L, 1, 1, 1, 1), new_row, new_col]
+        reward = np.where(distracted, -2.0, reward)
+
+        new_streak = np.where(reward > 0, streak + 1, 0)
+        bonus = new_streak >= 3
+        reward = np.where(bonus, reward + 2.0, reward)
+        new_streak = np.where(bonus, 0, new_streak)
+        reward = np.where(collected, reward + 50.0, reward)
+
+        next_state = np.where(collected, self.terminal, self.state_index(new_row, new_col, new_streak))
+        next_state = np.broadcast_to(next_state, reward.shape)
+        shape = (L, self.n_actions, self.n_states)
+        return (np.ascontiguousarray(np.moveaxis(reward, -1, 1)).reshape(shape),
+                np.ascontiguousarray(np.moveaxis(next_state, -1, 1)).reshape(shape))
+
+    def q_values(self, values: np.ndarray, gamma: float) -> np.ndarray:
+        """One Bellman backup: Q[l, a, s] = R[l, a, s] + gamma * V[l, next_state[l, a, s]]"""
+        padded = np.zeros((self.n_layouts, self.n_states + 1))  # terminal value 0
+        padded[:, :self.n_states] = values
+        return self.rewards + gamma * padded.ravel().take(self._flat_next)
+
+
+class TabularSolution:
+    """Optimal Q-table (L, S, A), values and greedy policy for every layout of a CareerMDP"""
+    def __init__(self, mdp: CareerMDP, q: np.ndarray, iterations: int):
+        self.mdp = mdp
+        self.q = np.moveaxis(q, 1, 2)
+        self.values = q.max(axis=1)
+        self.policy = q.argmax(axis=1).astype(np.uint8)
+        self.iterations = iterations
+
+    def act(self, layout: int, row: int, col: int, streak: int = 0) -> int:
+        """O(1) table lookup of the optimal action"""
+        return int(self.policy[layout, self.mdp.state_index(row, col, streak)])
+
+    def start_values(self) -> np.ndarray:
+        """Optimal discounted return from the reset state (0, 0, streak 0) of each layout"""
+        return self.values[:, self.mdp.state_index(0, 0, 0)]
+
+
+def value_iteration(mdp: CareerMDP, gamma: float = 0.99, tol: float = 1e-8,
+                    max_iterations: int = 10000) -> TabularSolution:
+    """Batched value iteration over all layouts at once"""
+    values = np.zeros((mdp.n_layouts, mdp.n_states))
+    for iteration in range(1, max_iterations + 1):
+        q = mdp.q_values(values, gamma)
+        new_values = q.max(axis=1)
+        delta = np.abs(new_values - values).max()
+        values = new_values
+        if delta < tol:
+            break
+    return TabularSolution(mdp, mdp.q_values(values, gamma), iteration)
+
+
+def evaluate_policy(mdp: CareerMDP, policy: np.ndarray, gamma: float = 0.99,
+                    tol: float = 1e-8) -> np.ndarray:
+    """Discounted values (L, S) of a deterministic policy (L, S), e.g. a trained agent's greedy actions.
+
+    Each layout's policy is a function on states, so values are summed along
+    it by pointer doubling: after k rounds every state's value covers its next
+    2**k steps, which takes ~log2(horizon) rounds instead of ~horizon sweeps.
+    """
+    L, S = mdp.n_layouts, mdp.n_states
+    policy = np.asarray(policy, dtype=np.int64)[:, None, :]
+    rewards = np.zeros((L, S + 1))
+    rewards[:, :S] = np.take_along_axis(mdp.rewards, policy, axis=1)[:, 0]
+    successor = np.empty((L, S + 1), dtype=np.intp)
+    successor[:, :S] = np.take_along_axis(mdp._flat_next, policy, axis=1)[:, 0]
+    successor[:, S] = np.arange(L) * (S + 1) + S  # terminal loops on itself with reward 0
+    rewards, successor = rewards.ravel(), successor.ravel()
+
+    remaining = np.abs(rewards).max() / (1 - gamma)
+    discount = gamma
+    while discount * remaining >= tol:
+        rewards = rewards + discount * rewards.take(successor)
+        successor = successor.take(successor)
+        discount *= discount
+    return rewards.reshape(L, S + 1)[:, :S]
+
+
+def policy_iteration(mdp: CareerMDP, gamma: float = 0.99, tol: float = 1e-8,
+                     max_iterations: int = 100) -> TabularSolution:
+    """Batched policy iteration; stops once no layout's policy changes"""
+    policy = np.zeros((mdp.n_layouts, mdp.n_states), dtype=np.int64)
+    for iteration in range(1, max_iterations + 1):
+        values = evaluate_policy(mdp, policy, gamma, tol)
+        q = mdp.q_values(values, gamma)
+        # Keep the current action on ties so the loop terminates
+        current = np.take_along_axis(q, policy[:, None, :], axis=1)[:, 0]
+        new_policy = np.where(q.max(axis=1) > current + tol, q.argmax(axis=1), policy)
+        if np.array_equal(new_policy, policy):
+            break
+        policy = new_policy
+    return TabularSolution(mdp, mdp.q_values(values, gamma), iteration)
@@ -0,0 +1,210 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from typing import Any, List, Optional, Sequence
+from .layout_sampler import get_layout_sampler
+from .distance_field import distance_field
+from .actions import ACTION_DELTAS, USE_ACTION
+from .custom_env import CustomCareerEnv
+
+# What set_attr can change: per-env state rows, and settings shared by every env (set for all at once).
+# Layouts (goal/distraction cells, masks, distance fields) only change through reset.
+SETTABLE_STATE = ("agent_location", "readiness_score", "steps_taken", "consecutive_positive_rewards")
+SETTABLE_SHARED = ("max_steps",)
+
+
+class CareerVecEnv(VecEnv):
+    """N copies of CustomCareerEnv stepped together with NumPy array ops.
+
+    Every sub-environment owns its own ``np_random`` generator, seeded the
+    same way ``DummyVecEnv`` seeds its children, so a seeded ``CareerVecEnv``
+    produces exactly the same observations, rewards and dones as a
+    ``DummyVecEnv`` of ``CustomCareerEnv`` with the same seed.
+    """
+    # What get_attr("render_modes") answers for every env, as VecEnv.__init__ asks
+    metadata = CustomCareerEnv.metadata
+    render_modes = metadata["render_modes"]
+
+    def __init__(self, num_envs: int = 1, grid_size: int = 8, max_steps: int = 200, num_jobs: int = 1,
+                 num_distractions: int = 3):
+        self.grid_size = grid_size
+        self.max_steps = max_steps
+        self.num_jobs = num_jobs
+        self.num_distractions = num_distractions
+        observation_space = spaces.Box(
+            low=np.array([0, 0, 0]),
+            high=np.array([self.grid_size-1, self.grid_size-1, max(100, 50 * num_jobs)]),
+            dtype=np.float32
+        )
+        self.render_mode = None
+        super().__init__(num_envs, observation_space, spaces.Discrete(5))
+        n = num_envs
+
+        self.agent_location = np.zeros((n, 2), dtype=np.int64)
+        # goal_cells keeps each episode's layout for inspection; goal_mask holds the goals not used yet,
+        # so collision checks are one lookup per env whatever the number of entities
+        self.goal_cells = np.zeros((n, num_jobs, 2), dtype=np.int64)
+        self.goal_mask = np.zeros((n, grid_size, grid_size), dtype=bool)
+        self.goals_left = np.zeros(n, dtype=np.int64)
+        self.distraction_cells = np.zeros((n, num_distractions, 2), dtype=np.int64)
+        self.distraction_mask = np.zeros((n, grid_size, grid_size), dtype=bool)
+        self.distance_field = np.zeros((n, grid_size, grid_size), dtype=np.int32)
+        self.readiness_score = np.zeros(n, dtype=np.int64)
+        self.consecutive_positive_rewards = np.zeros(n, dtype=np.int64)
+        self.steps_taken = np.zeros(n, dtype=np.int64)
+        self._rngs: List[Optional[np.random.Generator]] = [None] * n
+        self._arange = np.arange(n)
+        self._actions = np.zeros(n, dtype=np.int64)
+
+        self._sampler = get_layout_sampler(grid_size, num_distractions, num_jobs)
+
+    def _rng(self, idx: int, seed: Optional[int] = None) -> np.random.Generator:
+        if seed is not None or self._rngs[idx] is None:
+            self._rngs[idx], _ = seeding.np_random(seed)
+        return self._rngs[idx]
+
+    def _draw_layouts(self, indices: np.ndarray, seeds: Sequence[Optional[int]]):
+        """Job cells (B, num_jobs, 2) and distraction cells (B, num_distractions, 2), one draw per env generator"""
+        if self._sampler.indexed:
+            layouts = np.array([self._rng(idx, seed).integers(self._sampler.n_layouts)
+                                for idx, seed in zip(indices, seeds)], dtype=np.int64)
+            jobs, distractions = self._sampler.decode(layouts)
+            return jobs[:, None, :], distractions
+        drawn = [self._sampler.draw(self._rng(idx, seed)) for idx, seed in zip(indices, seeds)]
+        jobs = np.array([job for job, _ in drawn], dtype=np.int64).reshape(len(drawn), self.num_jobs, 2)
+        distractions = np.array([dist for _, dist in drawn], dtype=np.int64).reshape(
+            len(drawn), self.num_distractions, 2)
+        return jobs, distractions
+
+    def _reset_envs(self, indices: np.ndarray, seeds: Optional[Sequence[Optional[int]]] = None):
+        """Reset sub-environments, each drawing its layout from its own generator like CustomCareerEnv.reset"""
+        if seeds is None:
+            seeds = [None] * len(indices)
+        jobs, distractions = self._draw_layouts(indices, seeds)
+        rows = np.asarray(indices)[:, None]
+        self.agent_location[indices] = 0
+        self.steps_taken[indices] = 0
+        self.readiness_score[indices] = 0
+        self.consecutive_positive_rewards[indices] = 0
+        self.goal_cells[indices] = jobs
+        self.goal_mask[indices] = False
+        self.goal_mask[rows, jobs[..., 0], jobs[..., 1]] = True
+        self.goals_left[indices] = self.num_jobs
+        self.distraction_cells[indices] = distractions
+        self.distraction_mask[indices] = False
+        self.distraction_mask[rows, distractions[..., 0], distractions[..., 1]] = True
+        self._update_distance_fields(indices)
+
+    def _update_distance_fields(self, indices: np.ndarray):
+        """Rebuild the distance-to-closest-goal fields of the given envs from their remaining goals"""
+        self.distance_field[indices] = distance_field(self.goal_mask[indices])
+
+    def _get_observation(self) -> np.ndarray:
+        obs = np.empty((self.num_envs, 3), dtype=np.float32)
+        obs[:, :2] = self.agent_location
+        obs[:, 2] = self.readiness_score
+        return obs
+
+    def _distance_to_closest_opportunity(self) -> np.ndarray:
+        return self.distance_field[self._arange, self.agent_location[:, 0], self.agent_location[:, 1]]
+
+    def reset(self) -> np.ndarray:
+        self._reset_envs(self._arange, self._seeds)
+        self._reset_seeds()
+        self._reset_options()
+        return self._get_observation()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        actions = self._actions
+        idx = self._arange
+        self.steps_taken += 1
+        reward = np.full(self.num_envs, -0.01)
+
+        old_distance = self._distance_to_closest_opportunity()
+
+        # Move the agent; moves off the grid leave it in place
+        loc = np.clip(self.agent_location + ACTION_DELTAS[actions], 0, self.grid_size - 1)
+        self.agent_location = loc
+
+        # Use opportunity
+        collected = (actions == USE_ACTION) & self.goal_mask[idx, loc[:, 0], loc[:, 1]]
+        reward = np.where(collected, reward + 50.0, reward)
+        self.readiness_score += 50 * collected
+        if collected.any():
+            used = np.flatnonzero(collected)
+            self.goal_mask[used, loc[used, 0], loc[used, 1]] = False
+            self.goals_left[used] -= 1
+            self._update_distance_fields(used)
+
+        # Distance-based shaping
+        new_distance = self._distance_to_closest_opportunity()
+        reward = np.where(new_distance < old_distance, reward + 0.5, reward)
+        reward = np.where(new_distance > old_distance, reward - 0.1, reward)
+
+        # Distraction penalty
+        distracted = self.distraction_mask[idx, loc[:, 0], loc[:, 1]]
+        reward = np.where(distracted, -2.0, reward)
+        self.readiness_score = np.where(
+            distracted, np.maximum(0, self.readiness_score - 2), self.readiness_score)
+
+        # Reward streak bonus
+        positive = reward > 0
+        streak = np.where(positive, self.consecutive_positive_rewards + 1, 0)
+        bonus = streak >= 3
+        reward = np.where(bonus, reward + 2.0, reward)
+        self.consecutive_positive_rewards = np.where(bonus, 0, streak)
+
+        # Termination
+        truncated = self.steps_taken >= self.max_steps
+        terminated = self.goals_left == 0
+        reward = np.where(terminated, reward + 50.0, reward)
+        dones = terminated | truncated
+
+        obs = self._get_observation()
+        infos: List[dict] = [{} for _ in range(self.num_envs)]
+        done_idx = np.flatnonzero(dones)
+        for i in done_idx:
+            infos[i]["TimeLimit.truncated"] = bool(truncated[i] and not terminated[i])
+            infos[i]["terminal_observation"] = obs[i].copy()
+        if len(done_idx):
+            self._reset_envs(done_idx)
+            obs[done_idx, :2] = self.agent_location[done_idx]
+            obs[done_idx, 2] = self.readiness_score[done_idx]
+        return obs, reward.astype(np.float32), dones, infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        value = getattr(self, attr_name)
+        return [value[i] if isinstance(value, np.ndarray) else value
+                for i in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        rows = list(self._get_indices(indices))
+        if attr_name in SETTABLE_STATE:
+            getattr(self, attr_name)[rows] = value
+        elif attr_name in SETTABLE_SHARED:
+            if len(set(rows)) != self.num_envs:
+                raise ValueError(f"{attr_name} is shared by every env of a CareerVecEnv; set it with indices=None")
+            setattr(self, attr_name, value)
+        else:
+            raise AttributeError(f"CareerVecEnv.set_attr supports {', '.join(SETTABLE_STATE + SETTABLE_SHARED)}; "
+                                 f"got {attr_name!r}")
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        """Only reset(seed=None, options=None) exists per env: returns (obs, info) for each env reset"""
+        if method_name != "reset":
+            raise AttributeError(f"CareerVecEnv.env_method supports 'reset' only; got {method_name!r}")
+        seed = method_kwargs.get("seed", method_args[0] if method_args else None)
+        rows = np.array(list(self._get_indices(indices)), dtype=np.int64)
+        self._reset_envs(rows, [seed] * len(rows))
+        obs = self._get_observation()
+        return [(obs[i], {}) for i in rows]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
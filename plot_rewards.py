@@ -1,38 +1,77 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import os
+from analysis.monitor_aggregator import MonitorAggregator
+from analysis.downsample import cached_pyramid
+
+METHODS = {
+    "DQN":      ("./logs/monitor.csv", True),
+    "PPO":      ("./logs/ppo_monitor.csv", True),
+    "A2C":      ("./logs/a2c_monitor.csv", True),
+    "REINFORCE":("./logs/reinforce_rewards.csv", False),
+}
 
 def load_rewards(file_path, is_monitor=True):
+    """Cumulative reward per episode, parsing only rows appended since the last call"""
     if not os.path.exists(file_path):
         return None
-    if is_monitor:
-        df = pd.read_csv(file_path, skiprows=1)
-    else:
-        df = pd.read_csv(file_path)
-    return df['r'].cumsum()
-
-def plot_rewards():
-    methods = {
-        "DQN":      ("./logs/monitor.csv", True),
-        "PPO":      ("./logs/ppo_monitor.csv", True),
-        "A2C":      ("./logs/a2c_monitor.csv", True),
-        "REINFORCE":("./logs/reinforce_rewards.csv", False),
-    }
-
-    plt.figure(figsize=(12, 6))
+    aggregator = MonitorAggregator(file_path, is_monitor)
+    aggregator.update()
+    return aggregator.column("cumulative_r")
+
+def draw_curve(ax, pyramid, label, n_pixels):
+    """Draw one curve at screen resolution: mean line plus a min/max band per pixel bucket"""
+    view = pyramid.view(n_pixels)
+    line, = ax.plot(view["x"], view["mean"], label=label)
+    if len(view["x"]) < pyramid.n:
+        ax.fill_between(view["x"], view["min"], view["max"], color=line.get_color(), alpha=0.25, linewidth=0)
+
+def draw_rewards(fig, methods, column="cumulative_r"):
+    ax = fig.add_subplot()
+    n_pixels = int(fig.get_figwidth() * fig.dpi)
     for name, (path, is_monitor) in methods.items():
-        rewards = load_rewards(path, is_monitor)
-        if rewards is not None:
-            plt.plot(rewards, label=name)
-
-    plt.title("Cumulative Reward Over Episodes")
-    plt.xlabel("Episode")
-    plt.ylabel("Cumulative Reward")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("cumulative_rewards_plot.png")
-    plt.show()
+        if not os.path.exists(path):
+            continue
+        pyramid = cached_pyramid(MonitorAggregator(path, is_monitor), column)
+        if pyramid is not None:
+            draw_curve(ax, pyramid, name, n_pixels)
+
+    ax.set_title("Cumulative Reward Over Episodes" if column == "cumulative_r" else f"{column} Over Episodes")
+    ax.set_xlabel("Episode")
+    ax.set_ylabel("Cumulative Reward" if column == "cumulative_r" else column)
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+
+def export_plot(methods, output, column="cumulative_r"):
+    """Render one figure straight to a file with the Agg canvas (no display or pyplot state needed)"""
+    fig = Figure(figsize=(12, 6))
+    draw_rewards(fig, methods, column)
+    fig.savefig(output)
+    return output
+
+def export_plots(jobs, workers=None):
+    """Headless batch export of many runs in parallel; jobs are (methods, output[, column]) tuples.
+
+    Each log should appear in only one job, since its cache is updated by
+    whichever worker plots it.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(export_plot, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+def plot_rewards(methods=METHODS, output="cumulative_rewards_plot.png", show=True):
+    fig = plt.figure(figsize=(12, 6))
+    draw_rewards(fig, methods)
+    fig.savefig(output)
+    if show:
+        plt.show()
 
 if __name__ == "__main__":
-    plot_rewards()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Plot cumulative rewards from the monitor logs")
+    parser.add_argument("--output", default="cumulative_rewards_plot.png")
+    parser.add_argument("--no-show", action="store_true", help="only write the PNG")
+    args = parser.parse_args()
+    plot_rewards(output=args.output, show=not args.no_show)
@@ -0,0 +1,213 @@
+import numpy as np
+import sys
+import os
+from typing import Dict, List, Optional, Tuple
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Where export_all writes the .npz files, one per entry of MODEL_PATHS
+EXPORT_DIR = "models/numpy"
+
+# Algorithms whose checkpoints from before training.rollout_utils.NORMALIZED_MARKER trained on normalized
+# observations (older PPO/A2C/REINFORCE ones trained on raw ones); newer checkpoints carry the marker
+ALWAYS_NORMALIZED = {"dqn"}
+
+
+class MissingNormalizationError(ValueError):
+    """A model trained on normalized observations was saved without its statistics"""
+
+
+def required_normalization(name: str, path: str) -> Optional[str]:
+    """Statistics saved for the model at path, or None if it trained on raw observations.
+
+    Raises MissingNormalizationError for a checkpoint marked as trained on
+    normalized observations (or an older ALWAYS_NORMALIZED one) with no
+    statistics: feeding it raw observations would give wrong actions.
+    """
+    if path.endswith(".npz"):
+        return None  # exports carry their own statistics
+    from training.rollout_utils import find_normalization, is_marked_normalized
+    stats_path = find_normalization(path)
+    if stats_path is None and (is_marked_normalized(path) or name in ALWAYS_NORMALIZED):
+        raise MissingNormalizationError(f"{name}: no observation statistics saved with {path}; "
+                                        f"copy its vecnormalize.pkl next to it or retrain it")
+    return stats_path
+
+
+_ACTIVATIONS = {
+    "identity": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+    "tanh": lambda x: np.tanh(x, out=x),
+}
+
+
+class NumpyPolicy:
+    """Torch-free MLP policy loaded from an exported .npz file.
+
+    Holds the weights of a saved agent's action head (Q-network, actor or
+    PolicyNetwork) plus any VecNormalize observation statistics, and runs
+    batched forward passes with plain NumPy.
+    """
+    def __init__(self, weights: List[np.ndarray], biases: List[np.ndarray], activations: List[str],
+                 obs_mean: Optional[np.ndarray] = None, obs_var: Optional[np.ndarray] = None,
+                 clip_obs: float = 10.0, epsilon: float = 1e-8):
+        # Stored transposed so a forward pass is x @ W + b without copies
+        self.weights = [np.ascontiguousarray(w.T, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.obs_mean = obs_mean
+        self.obs_std = None if obs_var is None else np.sqrt(obs_var + epsilon)
+        self.obs_var = obs_var
+        self.clip_obs = clip_obs
+        self.epsilon = epsilon
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyPolicy":
+        with np.load(path) as data:
+            n_layers = int(data["n_layers"])
+            weights = [data[f"weight_{i}"] for i in range(n_layers)]
+            biases = [data[f"bias_{i}"] for i in range(n_layers)]
+            normalized = "obs_mean" in data.files
+            return cls(weights, biases, [str(a) for a in data["activations"]],
+                       data["obs_mean"] if normalized else None,
+                       data["obs_var"] if normalized else None,
+                       float(data["clip_obs"]), float(data["epsilon"]))
+
+    def save(self, path: str):
+        arrays = {
+            "n_layers": np.array(len(self.weights)),
+            "activations": np.array(self.activations),
+            "clip_obs": np.array(self.clip_obs),
+            "epsilon": np.array(self.epsilon),
+        }
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"weight_{i}"] = w.T
+            arrays[f"bias_{i}"] = b
+        if self.obs_mean is not None:
+            arrays["obs_mean"] = self.obs_mean
+            arrays["obs_var"] = self.obs_var
+        np.savez_compressed(path, **arrays)
+
+    def normalize(self, obs: np.ndarray) -> np.ndarray:
+        if self.obs_mean is None:
+            return obs
+        return np.clip((obs - self.obs_mean) / self.obs_std, -self.clip_obs, self.clip_obs).astype(np.float32)
+
+    def forward(self, obs: np.ndarray) -> np.ndarray:
+        """Action scores (B, n_actions): Q-values or logits, before any softmax"""
+        x = self.normalize(np.asarray(obs, dtype=np.float32).reshape(-1, self.weights[0].shape[0]))
+        for w, b, activation in zip(self.weights, self.biases, self.activations):
+            x = _ACTIVATIONS[activation](x @ w + b)
+        return x
+
+    def act(self, obs: np.ndarray) -> np.ndarray:
+        """Greedy actions (B,) for a batch of observations"""
+        return self.forward(obs).argmax(axis=1)
+
+
+def _linear_layers(modules) -> Tuple[List[np.ndarray], List[np.ndarray], List[str]]:
+    """Weights, biases and following activation of each Linear in a flat sequence of torch modules"""
+    import torch.nn as nn
+    weights, biases, activations = [], [], []
+    for module in modules:
+        if isinstance(module, nn.Linear):
+            weights.append(module.weight.detach().numpy().copy())
+            biases.append(module.bias.detach().numpy().copy())
+            activations.append("identity")
+        elif isinstance(module, nn.ReLU):
+            activations[-1] = "relu"
+        elif isinstance(module, nn.Tanh):
+            activations[-1] = "tanh"
+        elif isinstance(module, (nn.Softmax, nn.Flatten)):
+            continue  # monotonic / no-op for greedy actions
+        else:
+            raise ValueError(f"Cannot export layer {module!r}")
+    return weights, biases, activations
+
+
+def export_policy(name: str, path: str, vecnormalize_path: Optional[str] = None) -> NumpyPolicy:
+    """Read a saved agent (SB3 zip or REINFORCE .pth) into a NumpyPolicy"""
+    if name == "reinforce":
+        from training.reinfore_pg_training import load_policy_network
+        modules = list(load_policy_network(path).fc)
+    else:
+        from stable_baselines3 import A2C, DQN, PPO
+        policy = {"dqn": DQN, "ppo": PPO, "a2c": A2C}[name].load(path, device="cpu").policy
+        if name == "dqn":
+            modules = list(policy.q_net.q_net)
+        else:
+            modules = list(policy.mlp_extractor.policy_net) + [policy.action_net]
+    weights, biases, activations = _linear_layers(modules)
+
+    normalization = {}
+    if vecnormalize_path is not None:
+        import pickle
+        with open(vecnormalize_path, "rb") as f:
+            vec_normalize = pickle.load(f)
+        if vec_normalize.norm_obs:
+            normalization = dict(obs_mean=vec_normalize.obs_rms.mean, obs_var=vec_normalize.obs_rms.var,
+                                 clip_obs=vec_normalize.clip_obs, epsilon=vec_normalize.epsilon)
+    return NumpyPolicy(weights, biases, activations, **normalization)
+
+
+def model_observation_space(name: str, path: str):
+    """Observation space a saved model was trained on; REINFORCE checkpoints record none, so the default env's"""
+    if name == "reinforce":
+        from environment.custom_env import CustomCareerEnv
+        return CustomCareerEnv().observation_space
+    from stable_baselines3.common.save_util import load_from_zip_file
+    data, _, _ = load_from_zip_file(path, device="cpu", load_data=True)
+    return data["observation_space"]
+
+
+def check_parity(name: str, path: str, policy: NumpyPolicy, n_random: int = 4096,
+                 observation_space=None) -> Dict[str, float]:
+    """Compare a NumpyPolicy against the original model on every grid cell plus random observations.
+
+    The grid and readiness range come from observation_space, by default the
+    one the model was trained on.
+    """
+    from serving.policy_server import load_batch_policy
+    if observation_space is None:
+        observation_space = model_observation_space(name, path)
+    low, high = observation_space.low.astype(np.int64), observation_space.high.astype(np.int64)
+    rows, cols = np.meshgrid(np.arange(low[0], high[0] + 1), np.arange(low[1], high[1] + 1), indexing="ij")
+    grid = np.stack([rows.ravel(), cols.ravel()], axis=1)
+    obs = np.concatenate(
+        [np.column_stack([grid, np.full(len(grid), readiness)]) for readiness in (low[2], (low[2] + high[2]) // 2)]
+        + [np.random.default_rng(0).uniform(low, high, size=(n_random, 3))]
+    ).astype(np.float32)
+    reference = load_batch_policy(name, path)(obs)
+    actions = policy.act(obs)
+    return {"observations": len(obs), "action_mismatches": int((actions != reference).sum())}
+
+
+def export_all(models: Optional[Dict[str, str]] = None, out_dir: str = EXPORT_DIR,
+               verify: bool = True) -> Dict[str, str]:
+    """Export every saved model to out_dir/<name>.npz, checking actions against the original"""
+    from serving.policy_server import MODEL_PATHS
+    models = MODEL_PATHS if models is None else models
+    os.makedirs(out_dir, exist_ok=True)
+    exported = {}
+    for name, path in models.items():
+        try:
+            vecnormalize_path = required_normalization(name, path)
+        except MissingNormalizationError as e:
+            print(f"{e}, skipping")
+            continue
+        if vecnormalize_path is None:
+            print(f"{name}: no observation statistics saved with {path}, exporting for raw observations")
+        policy = export_policy(name, path, vecnormalize_path)
+        out_path = os.path.join(out_dir, f"{name}.npz")
+        policy.save(out_path)
+        exported[name] = out_path
+        if verify:
+            parity = check_parity(name, path, NumpyPolicy.load(out_path))
+            print(f"{name}: {out_path} ({os.path.getsize(out_path)} bytes), "
+                  f"{parity['action_mismatches']}/{parity['observations']} action mismatches")
+            if parity["action_mismatches"]:
+                raise RuntimeError(f"Exported {name} policy disagrees with {path}")
+    return exported
+
+
+if __name__ == "__main__":
+    export_all()
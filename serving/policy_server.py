@@ -0,0 +1,251 @@
+import pickle
+import queue
+import socketserver
+import sys
+import os
+import threading
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Saved models served by default, keyed by the name clients ask for
+MODEL_PATHS = {
+    "dqn": "models/dqn/custom_env_dqn.zip",
+    "ppo": "models/ppo/custom_env_ppo.zip",
+    "a2c": "models/a2c/custom_env_a2c.zip",
+    "reinforce": "models/reinforce_policy.pth",
+}
+
+
+def load_batch_policy(name: str, path: str) -> Callable[[np.ndarray], np.ndarray]:
+    """Load a saved model once and return a function mapping raw (B, obs) float32 -> (B,) greedy actions.
+
+    Observations are normalized with the statistics saved next to the model
+    (training.rollout_utils.find_normalization) before they reach the network;
+    .npz exports carry their own. Raises MissingNormalizationError for a model
+    that needs statistics but was saved without them.
+    """
+    if path.endswith(".npz"):
+        from serving.numpy_policy import NumpyPolicy
+        return NumpyPolicy.load(path).act  # exported by serving.numpy_policy, no torch needed
+
+    from serving.numpy_policy import required_normalization
+    stats_path = required_normalization(name, path)
+    act = _load_network(name, path)
+    if stats_path is None:
+        return act  # trained on raw observations
+    with open(stats_path, "rb") as f:
+        stats = pickle.load(f)
+    mean, std = stats.obs_rms.mean, np.sqrt(stats.obs_rms.var + stats.epsilon)
+    clip_obs = stats.clip_obs
+
+    def normalized_act(obs):
+        return act(np.clip((obs - mean) / std, -clip_obs, clip_obs).astype(np.float32))
+    return normalized_act
+
+
+def _load_network(name: str, path: str) -> Callable[[np.ndarray], np.ndarray]:
+    import torch
+    if name == "reinforce":
+        from training.reinfore_pg_training import load_policy_network
+        network = load_policy_network(path)
+
+        def act(obs):
+            with torch.no_grad():
+                return network(torch.from_numpy(obs)).argmax(dim=1).numpy()
+        return act
+
+    from stable_baselines3 import A2C, DQN, PPO
+    model = {"dqn": DQN, "ppo": PPO, "a2c": A2C}[name].load(path, device="cpu")
+    policy = model.policy
+    policy.set_training_mode(False)
+
+    def act(obs):
+        # policy._predict is the batched MLP forward behind predict(), without its per-call checks
+        with torch.no_grad():
+            return policy._predict(torch.from_numpy(obs), deterministic=True).numpy()
+    return act
+
+
+def servable_models(models: Dict[str, str]) -> Dict[str, str]:
+    """The entries of models that can be served, warning about those saved without required statistics"""
+    from serving.numpy_policy import MissingNormalizationError, required_normalization
+    servable = {}
+    for name, path in models.items():
+        try:
+            required_normalization(name, path)
+        except MissingNormalizationError as e:
+            print(f"Warning: not serving {e}")
+            continue
+        servable[name] = path
+    return servable
+
+
+class LatencyStats:
+    """Rolling window of request latencies and batch sizes for one model"""
+    def __init__(self, window: int = 100000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def record(self, latencies, batch_size: int):
+        with self._lock:
+            self.latencies.extend(latencies)
+            self.batch_sizes.append(batch_size)
+            self.requests += batch_size
+            self.batches += 1
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            latencies = np.array(self.latencies)
+            batch_sizes = np.array(self.batch_sizes)
+        if not len(latencies):
+            return {"requests": 0, "batches": 0}
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": float(batch_sizes.mean()),
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+        }
+
+
+class _ModelWorker:
+    """Micro-batching loop for one model: one forward pass per batch of queued requests"""
+    def __init__(self, name: str, act: Callable, obs_size: int, max_batch: int, max_latency: float):
+        self.name = name
+        self.act = act
+        self.obs_size = obs_size
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.stats = LatencyStats()
+        self.requests = queue.Queue()
+        self._obs = np.zeros((max_batch, obs_size), dtype=np.float32)
+        self._thread = threading.Thread(target=self._run, name=f"PolicyServer-{name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            first = self.requests.get()
+            if first is None:
+                break
+            batch = [first]
+            # Wait for more requests until the batch is full or the oldest one hits its deadline
+            deadline = first[2] + self.max_latency
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self.requests.get(timeout=timeout) if timeout > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self.requests.put(None)  # finish this batch, stop on the next loop
+                    break
+                batch.append(request)
+
+            n = len(batch)
+            for i, (obs, _, _) in enumerate(batch):
+                self._obs[i] = obs
+            try:
+                actions = self.act(self._obs[:n])
+            except BaseException as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            for (_, future, _), action in zip(batch, actions):
+                future.set_result(int(action))
+            self.stats.record([done - enqueued for _, _, enqueued in batch], n)
+
+    def close(self):
+        self.requests.put(None)
+        self._thread.join()
+
+
+class PolicyServer:
+    """In-process inference service that micro-batches concurrent requests per model.
+
+    Each model is loaded once and gets its own batching thread. A request
+    waits at most ``max_latency_ms`` for others to share its forward pass, or
+    less if ``max_batch`` requests arrive first.
+    """
+    def __init__(self, models: Optional[Dict[str, str]] = None, max_batch: int = 256,
+                 max_latency_ms: float = 2.0, obs_size: int = 3):
+        if models is None:
+            models = servable_models(MODEL_PATHS)
+        self._workers = {
+            name: _ModelWorker(name, load_batch_policy(name, path), obs_size, max_batch, max_latency_ms / 1000)
+            for name, path in models.items()
+        }
+
+    @property
+    def models(self):
+        return list(self._workers)
+
+    def submit(self, model: str, obs) -> Future:
+        """Queue one observation; the future resolves to the greedy action"""
+        worker = self._workers[model]
+        obs = np.asarray(obs, dtype=np.float32).reshape(worker.obs_size)
+        future = Future()
+        worker.requests.put((obs, future, time.perf_counter()))
+        return future
+
+    def act(self, model: str, obs) -> int:
+        return self.submit(model, obs).result()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Requests served, mean batch size and p50/p99 latency (ms) per model"""
+        return {name: worker.stats.summary() for name, worker in self._workers.items()}
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.close()
+
+
+class _ActionRequestHandler(socketserver.StreamRequestHandler):
+    """Line protocol: ``<model> <x> <y> <readiness>`` in, ``<action>`` (or ``error <msg>``) out"""
+    def handle(self):
+        for line in self.rfile:
+            try:
+                model, *values = line.split()
+                action = self.server.policy_server.act(model.decode(), np.array(values, dtype=np.float32))
+                self.wfile.write(b"%d\n" % action)
+            except Exception as e:
+                self.wfile.write(f"error {e!r}\n".encode())
+
+
+class PolicyTCPServer(socketserver.ThreadingTCPServer):
+    """Exposes a PolicyServer on a local TCP port, one handler thread per client connection"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, policy_server: PolicyServer, host: str = "127.0.0.1", port: int = 8765):
+        self.policy_server = policy_server
+        super().__init__((host, port), _ActionRequestHandler)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the saved policies on a local TCP port")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = PolicyServer(max_batch=args.max_batch, max_latency_ms=args.max_latency_ms)
+    with PolicyTCPServer(server, port=args.port) as tcp_server:
+        print(f"Serving {', '.join(server.models)} on 127.0.0.1:{args.port}")
+        try:
+            tcp_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for name, stats in server.metrics().items():
+                print(name, stats)
+            server.close()
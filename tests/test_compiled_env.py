@@ -0,0 +1,14 @@
+import numpy as np
+from environment.compiled_env import CompiledCareerEnv
+
+
+def test_step_observations_are_not_overwritten():
+    env = CompiledCareerEnv()
+    env.reset(seed=0)
+    held = [env.step(action)[0] for action in (1, 3, 1)]  # down, right, down: three distinct cells
+    expected = [obs.copy() for obs in held]
+    env.step(0)
+    env.step(2)
+    for obs, kept in zip(held, expected):
+        np.testing.assert_array_equal(obs, kept)
+    assert len({tuple(obs[:2]) for obs in held}) == 3
@@ -0,0 +1,61 @@
+import shutil
+import numpy as np
+import pytest
+import torch
+from stable_baselines3 import PPO
+from environment.vec_env import CareerVecEnv
+from serving.numpy_policy import MissingNormalizationError, check_parity, export_policy
+from serving.policy_server import MODEL_PATHS, load_batch_policy, servable_models
+from training.rollout_utils import (find_normalization, is_marked_normalized, mark_normalized, normalize_observations,
+                                    save_normalization)
+
+
+@pytest.mark.parametrize("name", ["ppo", "a2c", "reinforce"])
+def test_check_parity(name):
+    path = MODEL_PATHS[name]
+    policy = export_policy(name, path, find_normalization(path))
+    parity = check_parity(name, path, policy)
+    assert parity["observations"] > 0
+    assert parity["action_mismatches"] == 0
+
+
+def test_check_parity_with_saved_statistics(tmp_path):
+    path = str(tmp_path / "custom_env_ppo.zip")
+    shutil.copy(MODEL_PATHS["ppo"], path)
+    venv = normalize_observations(CareerVecEnv(8))
+    venv.reset()
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        venv.step(rng.integers(0, 5, size=8))
+    save_normalization(venv, str(tmp_path))
+    stats_path = find_normalization(path)
+    assert stats_path is not None
+
+    policy = export_policy("ppo", path, stats_path)
+    np.testing.assert_array_equal(policy.obs_mean, venv.obs_rms.mean)
+    parity = check_parity("ppo", path, policy)
+    assert parity["action_mismatches"] == 0
+    # The loader applies the statistics itself, so raw observations go in
+    obs = np.random.default_rng(1).uniform([0, 0, 0], [7, 7, 100], size=(256, 3)).astype(np.float32)
+    np.testing.assert_array_equal(load_batch_policy("ppo", path)(obs), policy.act(obs))
+
+
+def test_dqn_without_statistics_is_refused(tmp_path):
+    path = str(tmp_path / "custom_env_dqn.zip")
+    shutil.copy(MODEL_PATHS["dqn"], path)
+    assert find_normalization(path) is None
+    with pytest.raises(MissingNormalizationError):
+        load_batch_policy("dqn", path)
+    assert servable_models({"dqn": path, "ppo": MODEL_PATHS["ppo"]}) == {"ppo": MODEL_PATHS["ppo"]}
+
+
+def test_marked_checkpoints_without_statistics_are_refused(tmp_path):
+    ppo_path = str(tmp_path / "custom_env_ppo.zip")
+    mark_normalized(PPO.load(MODEL_PATHS["ppo"], device="cpu")).save(ppo_path)
+    reinforce_path = str(tmp_path / "reinforce_policy.pth")
+    torch.save(mark_normalized(torch.load(MODEL_PATHS["reinforce"], map_location="cpu")), reinforce_path)
+    assert not is_marked_normalized(MODEL_PATHS["ppo"])
+    for name, path in (("ppo", ppo_path), ("reinforce", reinforce_path)):
+        assert is_marked_normalized(path)
+        with pytest.raises(MissingNormalizationError):
+            load_batch_policy(name, path)
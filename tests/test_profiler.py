@@ -0,0 +1,40 @@
+import os
+import pickle
+from stable_baselines3 import A2C
+from training.env_factory import make_training_env
+from training.profiler import ProfilerCallback
+from training.rollout_utils import normalize_observations, save_normalization
+
+
+def test_profiled_a2c_on_normalized_env(tmp_path):
+    env = normalize_observations(make_training_env(2, "dummy", seed=0))
+    model = A2C("MlpPolicy", env, n_steps=5, verbose=1, seed=0)
+    # log_interval=1 dumps the logger, stdout included, after every iteration
+    model.learn(total_timesteps=50, callback=ProfilerCallback(str(tmp_path / "profile")), log_interval=1)
+    assert os.path.exists(tmp_path / "profile" / "trace.json")
+    # Patches are undone, so the model and the statistics pickle
+    model.save(str(tmp_path / "a2c"))
+    save_normalization(env, str(tmp_path))
+    env.close()
+
+
+def test_profiled_reinforce_saves(tmp_path, monkeypatch):
+    from training.reinfore_pg_training import train_reinforce
+    monkeypatch.setenv("CAREER_PROFILE", str(tmp_path / "profile"))
+    train_reinforce(episodes=8, n_envs=4, seed=0, output_dir=str(tmp_path))
+    assert os.path.exists(tmp_path / "profile" / "trace.json")
+    assert os.path.exists(tmp_path / "vecnormalize.pkl")
+
+
+def test_async_eval_while_profiling(tmp_path):
+    from training.evaluation import AsyncEvalCallback
+    env = normalize_observations(make_training_env(2, "dummy", seed=0))
+    model = A2C("MlpPolicy", env, n_steps=5, seed=0)
+    evaluation = AsyncEvalCallback(str(tmp_path / "eval"), eval_freq=20, n_episodes=4, n_envs=2)
+    model.learn(total_timesteps=40, callback=[ProfilerCallback(str(tmp_path / "profile")), evaluation])
+    assert evaluation.results and evaluation.results[0]["episodes"] == 4
+    snapshot = os.path.join(tmp_path, "eval", "eval_20", "vecnormalize.pkl")
+    with open(snapshot, "rb") as f:
+        stats = pickle.load(f)
+    assert stats.obs_rms.count > 0 and "step_wait" not in vars(stats)
+    env.close()
@@ -0,0 +1,12 @@
+import numpy as np
+from environment.recorder import FrameRecorder
+
+
+def test_full_queue_waits_instead_of_dropping(tmp_path):
+    recorder = FrameRecorder(str(tmp_path / "frames.gif"), max_queue=1)
+    frames = np.random.default_rng(0).integers(0, 256, size=(50, 32, 32, 3), dtype=np.uint8)
+    for frame in frames:
+        recorder.add(frame)
+    recorder.close()
+    assert recorder.dropped == 0
+    assert recorder.frames_written == len(frames)
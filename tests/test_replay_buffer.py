@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from gymnasium import spaces
+from stable_baselines3 import DQN
+from training.dqn_training import DQN_DEFAULTS
+from training.env_factory import make_training_env
+from training.replay_buffer import CompactReplayBuffer
+
+
+def _buffer(n_envs=2):
+    observation_space = spaces.Box(0, 100, (3,), np.float32)
+    return CompactReplayBuffer(100, observation_space, spaces.Discrete(5), device="cpu", n_envs=n_envs)
+
+
+def test_sample_single_transition():
+    buffer = _buffer()
+    obs = np.array([[0, 0, 0], [3, 4, 50]], dtype=np.float32)
+    next_obs = np.array([[1, 0, 0], [3, 5, 48]], dtype=np.float32)
+    buffer.add(obs, next_obs, np.array([1, 3]), np.array([0.5, -0.01]), np.array([False, False]), [{}, {}])
+    assert buffer.size() == 1
+    samples = buffer.sample(32)
+    for sampled_obs, sampled_next in zip(samples.observations.numpy(), samples.next_observations.numpy()):
+        env_idx = int(sampled_obs[2] == 50)
+        np.testing.assert_array_equal(sampled_obs, obs[env_idx])
+        np.testing.assert_array_equal(sampled_next, next_obs[env_idx])
+
+
+@pytest.mark.parametrize("high", [[299, 299, 100], [7, 7, 50 * 700]])  # grid_size=300, num_jobs=700
+def test_rejects_observations_that_do_not_fit(high):
+    observation_space = spaces.Box(np.zeros(3), np.array(high), dtype=np.float32)
+    with pytest.raises(ValueError, match="ReplayBuffer"):
+        CompactReplayBuffer(100, observation_space, spaces.Discrete(5), device="cpu")
+
+
+def test_dqn_trains_from_the_first_step():
+    env = make_training_env(2, "dummy", seed=0)
+    config = {**DQN_DEFAULTS, "learning_starts": 0, "train_freq": 1, "batch_size": 8}
+    model = DQN("MlpPolicy", env, seed=0, **config)
+    model.learn(total_timesteps=20)
+    assert isinstance(model.replay_buffer, CompactReplayBuffer)
+    env.close()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import torch as th
+from gymnasium import spaces
+from stable_baselines3.common.buffers import RolloutBuffer
+from training.rollout_utils import GAERolloutBuffer, discounted_returns, gae
+
+
+def _reference_gae(rewards, values, dones, last_values, gamma, gae_lambda):
+    """Step-by-step GAE, as in SB3's RolloutBuffer; returns (advantages, returns)"""
+    advantages = np.zeros_like(rewards, dtype=np.float64)
+    running = np.zeros(rewards.shape[1])
+    for t in reversed(range(len(rewards))):
+        next_values = last_values if t == len(rewards) - 1 else values[t + 1]
+        running = rewards[t] - values[t] + (1 - dones[t]) * (gamma * next_values + gamma * gae_lambda * running)
+        advantages[t] = running
+    return advantages, advantages + values
+
+
+@pytest.mark.parametrize("T, N", [(1, 1), (7, 3), (200, 16), (1000, 2)])
+def test_gae_matches_reference(T, N):
+    rng = np.random.default_rng(T * N)
+    rewards = rng.normal(size=(T, N))
+    values = rng.normal(size=(T, N))
+    dones = rng.random((T, N)) < 0.05
+    last_values = rng.normal(size=N)
+    expected_advantages, expected_returns = _reference_gae(rewards, values, dones, last_values, 0.99, 0.95)
+
+    advantages, returns = gae(rewards, values, dones, last_values, 0.99, 0.95)
+    np.testing.assert_allclose(advantages, expected_advantages, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(returns, expected_returns, rtol=0, atol=1e-9)
+    torch_advantages, _ = gae(th.from_numpy(rewards), th.from_numpy(values), th.from_numpy(dones),
+                              th.from_numpy(last_values), 0.99, 0.95)
+    np.testing.assert_allclose(torch_advantages.numpy(), expected_advantages, rtol=0, atol=1e-9)
+
+    expected_mc, _ = _reference_gae(rewards, np.zeros_like(rewards), dones, np.zeros(N), 0.9, 1.0)
+    np.testing.assert_allclose(discounted_returns(rewards, dones, 0.9), expected_mc, rtol=0, atol=1e-9)
+
+
+def test_gae_rollout_buffer_matches_sb3():
+    rng = np.random.default_rng(0)
+    observation_space = spaces.Box(0, 1, (3,), np.float32)
+    reference, buffer = (cls(256, observation_space, spaces.Discrete(5), n_envs=4, gamma=0.99, gae_lambda=0.95)
+                         for cls in (RolloutBuffer, GAERolloutBuffer))
+    rewards, values, episode_starts = rng.normal(size=(256, 4)), rng.normal(size=(256, 4)), rng.random((256, 4)) < 0.05
+    for rollout in (reference, buffer):
+        rollout.rewards[:], rollout.values[:], rollout.episode_starts[:] = rewards, values, episode_starts
+    last_values, last_dones = th.from_numpy(rng.normal(size=(4, 1))), rng.random(4) < 0.5
+    reference.compute_returns_and_advantage(last_values, last_dones)
+    buffer.compute_returns_and_advantage(last_values, last_dones)
+    np.testing.assert_allclose(buffer.advantages, reference.advantages, rtol=0, atol=1e-4)
+    assert buffer.returns.dtype == np.float32 and buffer.advantages.shape == (256, 4)
+
+
+def test_discounted_returns_cut_at_done():
+    rewards = np.ones((3, 1))
+    dones = np.array([[0], [1], [0]])
+    np.testing.assert_allclose(discounted_returns(rewards, dones, 0.5), [[1.5], [1.0], [1.0]])
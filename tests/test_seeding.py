@@ -0,0 +1,52 @@
+import functools
+import numpy as np
+import pytest
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from environment.compiled_env import CompiledCareerEnv
+from environment.custom_env import CustomCareerEnv
+from environment.seeding import rollout_digest, seed_vec_env, vec_rollout_digest
+from environment.shm_vec_env import ShmVecEnv
+from environment.vec_env import CareerVecEnv
+
+N_STEPS = 300
+N_ENVS = 4
+ACTIONS = np.random.default_rng(0).integers(0, 5, size=(N_STEPS, N_ENVS))
+
+
+def test_same_seed_gives_same_trajectory():
+    digest = rollout_digest(CustomCareerEnv(), 0, ACTIONS[:, 0])
+    assert rollout_digest(CustomCareerEnv(), 0, ACTIONS[:, 0]) == digest
+    assert rollout_digest(CustomCareerEnv(), 1, ACTIONS[:, 0]) != digest
+    assert rollout_digest(CompiledCareerEnv(), 0, ACTIONS[:, 0]) == digest
+
+
+def test_same_seed_gives_same_frames():
+    digests = [rollout_digest(CustomCareerEnv(render_mode="rgb_array"), 0, ACTIONS[:200, 0], render=True)
+               for _ in range(2)]
+    assert digests[0] == digests[1]
+
+
+@pytest.mark.parametrize("backend", ["subproc", "shm", "vector"])
+def test_backends_match_dummy(backend):
+    env_fns = [functools.partial(CustomCareerEnv) for _ in range(N_ENVS)]
+    make = {
+        "subproc": lambda: SubprocVecEnv(env_fns),
+        "shm": lambda: ShmVecEnv(env_fns, n_workers=2),
+        "vector": lambda: CareerVecEnv(N_ENVS),
+    }[backend]
+    digests = []
+    for venv in (DummyVecEnv(env_fns), make()):
+        try:
+            digests.append(vec_rollout_digest(venv, 0, ACTIONS))
+        finally:
+            venv.close()
+    assert digests[0] == digests[1]
+
+
+def test_seed_vec_env_uses_public_seed():
+    venv = CareerVecEnv(4)
+    seeds = seed_vec_env(venv, 0)
+    assert seeds == venv.seed(seeds[0])
+    assert seeds == [seeds[0] + i for i in range(4)]
+    # Neighbouring run seeds must not share environment streams
+    assert set(seed_vec_env(CareerVecEnv(4), 1)).isdisjoint(seeds)
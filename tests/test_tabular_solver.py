@@ -0,0 +1,37 @@
+import pytest
+from environment.custom_env import CustomCareerEnv
+from environment.tabular_solver import STREAK_LEVELS, CareerMDP
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_model_matches_env_step(seed):
+    env = CustomCareerEnv()
+    env.reset(seed=seed)
+    mdp = CareerMDP.from_envs([env])
+    for row in range(env.grid_size):
+        for col in range(env.grid_size):
+            for streak in range(STREAK_LEVELS):
+                state = mdp.state_index(row, col, streak)
+                for action in range(mdp.n_actions):
+                    env.reset(seed=seed)
+                    env.agent_location = [row, col]
+                    env.consecutive_positive_rewards = streak
+                    obs, reward, terminated, _, _ = env.step(action)
+                    expected = mdp.terminal if terminated else mdp.state_index(
+                        int(obs[0]), int(obs[1]), env.consecutive_positive_rewards)
+                    assert mdp.next_state[0, action, state] == expected
+                    assert mdp.rewards[0, action, state] == pytest.approx(reward, abs=1e-12)
+
+
+def test_from_envs_rejects_multiple_or_collected_jobs():
+    env = CustomCareerEnv(num_jobs=2)
+    env.reset(seed=0)
+    with pytest.raises(ValueError):
+        CareerMDP.from_envs([env])
+
+    env = CustomCareerEnv()
+    env.reset(seed=0)
+    env.agent_location = list(env.opportunity_cells[0]["pos"])
+    env.step(4)
+    with pytest.raises(ValueError):
+        CareerMDP.from_envs([env])
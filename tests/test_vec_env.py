@@ -0,0 +1,11 @@
+import warnings
+from environment.custom_env import CustomCareerEnv
+from environment.vec_env import CareerVecEnv
+
+
+def test_render_modes_come_from_custom_env():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        venv = CareerVecEnv(3)
+    assert venv.get_attr("render_modes") == [CustomCareerEnv.metadata["render_modes"]] * 3
+    assert venv.metadata["render_modes"] == CustomCareerEnv.metadata["render_modes"]
@@ -2,28 +2,45 @@ from stable_baselines3 import A2C
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from environment.custom_env import CustomCareerEnv
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv
+from training.env_factory import make_training_env
+from training.evaluation import evaluation_from_env
+from training.profiler import profiler_from_env
+from training.rollout_utils import GAERolloutBuffer, mark_normalized, normalize_observations, save_normalization
 
-def train_a2c():
-    env = DummyVecEnv([lambda: Monitor(CustomCareerEnv(render_mode="rgb_array"), filename="./logs/a2c_monitor.csv")])
+A2C_DEFAULTS = dict(
+    learning_rate=7e-4,
+    gamma=0.99,
+    n_steps=5,
+    ent_coef=0.01,
+    vf_coef=0.5,
+    rollout_buffer_class=GAERolloutBuffer,
+)
+
+def train_a2c(n_envs=1, backend="dummy", total_timesteps=25000, seed=None, output_dir=None, callback=None,
+              **hyperparams):
+    """Train A2C; hyperparams override A2C_DEFAULTS, output_dir redirects every file (for sweeps)"""
+    monitor_file = "./logs/a2c_monitor.csv" if output_dir is None else os.path.join(output_dir, "monitor.csv")
+    model_dir = "models/a2c" if output_dir is None else output_dir
+    log_dir = "./logs/a2c" if output_dir is None else output_dir
+    env = normalize_observations(make_training_env(n_envs, backend, monitor_file=monitor_file, seed=seed))
 
     model = A2C(
         "MlpPolicy",
         env,
         verbose=1,
-        learning_rate=7e-4,
-        gamma=0.99,
-        n_steps=5,
-        ent_coef=0.01,
-        vf_coef=0.5,
-        tensorboard_log="./a2c_tensorboard/"
+        **{**A2C_DEFAULTS, **hyperparams},
+        seed=seed,
+        tensorboard_log="./a2c_tensorboard/" if output_dir is None else None
     )
+    mark_normalized(model)
 
-    model.learn(total_timesteps=25000)
-    model.save("models/a2c/custom_env_a2c")
+    model.learn(total_timesteps=total_timesteps,
+                callback=[c for c in (callback, profiler_from_env(), evaluation_from_env(log_dir)) if c is not None])
+    model.save(os.path.join(model_dir, "custom_env_a2c"))
+    save_normalization(env, model_dir)  # observation statistics the policy was trained on
+    env.close()
     print("A2C training complete and model saved!")
+    return monitor_file
 
 if __name__ == "__main__":
     train_a2c()
\ No newline at end of file
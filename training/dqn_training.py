@@ -1,35 +1,44 @@
 from stable_baselines3 import DQN
-from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import DummyVecEnv
-from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.callbacks import EvalCallback
-from stable_baselines3.common.vec_env import VecNormalize
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from environment.custom_env import CustomCareerEnv
+from training.env_factory import make_training_env
+from training.evaluation import evaluation_from_env
+from training.profiler import profiler_from_env
+from training.replay_buffer import CompactReplayBuffer
+from training.rollout_utils import mark_normalized, normalize_observations, save_normalization
 
-def train_dqn():
-    log_dir = "./logs/dqn"
+DQN_DEFAULTS = dict(
+    learning_rate=5e-4,
+    buffer_size=20000,
+    learning_starts=5000,
+    batch_size=64,
+    gamma=0.99,
+    exploration_initial_eps=1.0,
+    exploration_fraction=0.2,
+    exploration_final_eps=0.05,
+    replay_buffer_class=CompactReplayBuffer,
+)
+
+def train_dqn(n_envs=1, backend="dummy", total_timesteps=200000, seed=None, output_dir=None, callback=None,
+              **hyperparams):
+    """Train DQN; hyperparams override DQN_DEFAULTS, output_dir redirects every file (for sweeps)"""
+    log_dir = "./logs/dqn" if output_dir is None else output_dir
+    model_dir = "models/dqn" if output_dir is None else output_dir
     os.makedirs(log_dir, exist_ok=True)
 
     # Create a vectorized environment with monitoring
-    env = DummyVecEnv([
-        lambda: Monitor(CustomCareerEnv(render_mode="rgb_array"), filename=os.path.join(log_dir, "monitor.csv"))
-    ])
-    env = VecNormalize(env, norm_obs=True, norm_reward=False)
-    eval_env = DummyVecEnv([
-        lambda: Monitor(CustomCareerEnv(render_mode="rgb_array"))
-    ])
-    eval_env = VecNormalize(eval_env, norm_obs=True, norm_reward=False)
+    env = normalize_observations(
+        make_training_env(n_envs, backend, monitor_file=os.path.join(log_dir, "monitor.csv"), seed=seed))
+    eval_env = normalize_observations(make_training_env(1, seed=None if seed is None else seed + 10000))
     eval_env.training = False
-    eval_env.norm_reward = False
 
     eval_callback = EvalCallback(
        eval_env,
-        best_model_save_path='./models/dqn/best_model/',
-        log_path='./logs/',
-        eval_freq=5000,
+        best_model_save_path=os.path.join(model_dir, "best_model"),
+        log_path='./logs/' if output_dir is None else output_dir,
+        eval_freq=max(5000 // n_envs, 1),  # EvalCallback counts calls, one per n_envs steps
         n_eval_episodes=5,
         deterministic=True,
         render=False,
@@ -38,25 +47,25 @@ def train_dqn():
     model = DQN(
         policy="MlpPolicy",
         env=env,
-        learning_rate=5e-4,
-        buffer_size=20000,
-        learning_starts=5000,
-        batch_size=64,
-        gamma=0.99,
-        exploration_initial_eps=1.0,
-        exploration_fraction=0.2,
-        exploration_final_eps=0.05,
+        **{**DQN_DEFAULTS, **hyperparams},
+        seed=seed,
         verbose=1,
-        tensorboard_log="./dqn_tensorboard/"
+        tensorboard_log="./dqn_tensorboard/" if output_dir is None else None
     )
+    mark_normalized(model)  # before training, so EvalCallback's best_model carries the marker too
 
     model.learn(
-        total_timesteps=200000,
-        callback=eval_callback
+        total_timesteps=total_timesteps,
+        callback=[c for c in (eval_callback, callback, profiler_from_env(), evaluation_from_env(log_dir))
+                  if c is not None]
     )
 
-    model.save("models/dqn/custom_env_dqn")
+    model.save(os.path.join(model_dir, "custom_env_dqn"))
+    save_normalization(env, model_dir)  # observation statistics the policy was trained on
+    env.close()
+    eval_env.close()
     print("DQN training complete and model saved!")
+    return os.path.join(log_dir, "monitor.csv")
 
 if __name__ == "__main__":
     train_dqn()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import functools
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from environment.custom_env import CustomCareerEnv
+from environment.compiled_env import CompiledCareerEnv
+from environment.vec_env import CareerVecEnv
+from environment.shm_vec_env import ShmVecEnv
+from environment.seeding import seed_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
+
+# dummy:   all envs stepped in this process (DummyVecEnv)
+# subproc: one process per env, results pickled through pipes (SubprocVecEnv)
+# shm:     worker processes each stepping a slice of envs, results in shared memory (ShmVecEnv)
+# vector:  all envs stepped together with NumPy array ops in this process (CareerVecEnv)
+BACKENDS = ("dummy", "subproc", "shm", "vector")
+
+
+def make_training_env(n_envs=1, backend="dummy", monitor_file=None, seed=None, n_workers=None, compiled=False):
+    """Build the vectorized CustomCareerEnv used by the trainers, wrapped in a VecMonitor.
+
+    compiled=True steps each env with CompiledCareerEnv's C kernel (ignored by the vector backend).
+    """
+    if backend == "vector":
+        venv = CareerVecEnv(n_envs)
+    else:
+        env_fns = [functools.partial(CompiledCareerEnv if compiled else CustomCareerEnv, render_mode="rgb_array") for _ in range(n_envs)]
+        if backend == "dummy":
+            venv = DummyVecEnv(env_fns)
+        elif backend == "subproc":
+            venv = SubprocVecEnv(env_fns)
+        elif backend == "shm":
+            venv = ShmVecEnv(env_fns, n_workers=n_workers)
+        else:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if seed is not None:
+        seed_vec_env(venv, seed)
+    return VecMonitor(venv, filename=monitor_file)
@@ -0,0 +1,286 @@
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from stable_baselines3.common.callbacks import BaseCallback
+from environment.seeding import seed_vec_env, spawn_seeds
+from environment.vec_env import CareerVecEnv
+from serving.numpy_policy import MissingNormalizationError, required_normalization
+from training.rollout_utils import save_normalization
+from training.sweep import THREAD_ENV_VARS
+
+ALGORITHMS = ("dqn", "ppo", "a2c", "reinforce")
+MODEL_SUFFIXES = (".zip", ".pth", ".npz")
+Z_95 = 1.959963984540054
+
+# CAREER_EVAL_FREQ=<steps> makes the SB3 trainers attach an AsyncEvalCallback;
+# CAREER_EVAL_EPISODES=<n> sets the episodes per evaluation
+EVAL_FREQ_VAR = "CAREER_EVAL_FREQ"
+EVAL_EPISODES_VAR = "CAREER_EVAL_EPISODES"
+
+
+def algorithm_of(path: str) -> Optional[str]:
+    """Algorithm a saved model belongs to, from the nearest path component naming one"""
+    for part in reversed(os.path.normpath(path).lower().split(os.sep)):
+        for algorithm in ALGORITHMS:
+            if algorithm in part:
+                return algorithm
+    return None
+
+
+def find_models(root: str = "models") -> Dict[str, str]:
+    """Every saved model (SB3 zip, REINFORCE .pth, exported .npz) under root, keyed by relative path"""
+    models = {}
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if name.endswith(MODEL_SUFFIXES) and algorithm_of(path) is not None:
+                models[os.path.relpath(path, root)] = path
+    return models
+
+
+def load_policy(path: str, algorithm: Optional[str] = None) -> Callable[[np.ndarray], np.ndarray]:
+    """Greedy (B, obs) float32 -> (B,) action function for a saved model, with its observation statistics applied.
+
+    Raises serving.numpy_policy.MissingNormalizationError if the model needs statistics that were not saved.
+    """
+    from serving.policy_server import load_batch_policy
+    return load_batch_policy(algorithm or algorithm_of(path), path)
+
+
+def evaluate(act: Callable[[np.ndarray], np.ndarray], n_episodes: int, n_envs: int = 256, seed: int = 0,
+             env_kwargs: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """Run n_episodes seeded episodes of act across one CareerVecEnv; per-episode returns, lengths, successes.
+
+    Every env slot runs a fixed quota of episodes, so short (successful)
+    episodes are not over-represented when the run stops.
+    """
+    n_envs = max(1, min(n_envs, n_episodes))
+    venv = CareerVecEnv(n_envs, **(env_kwargs or {}))
+    seed_vec_env(venv, seed)
+    quota = np.full(n_envs, n_episodes // n_envs)
+    quota[:n_episodes % n_envs] += 1
+    finished = np.zeros(n_envs, dtype=np.int64)
+    running_return = np.zeros(n_envs)
+    running_length = np.zeros(n_envs, dtype=np.int64)
+    returns, lengths, successes = [], [], []
+
+    obs = venv.reset()
+    while (finished < quota).any():
+        obs, rewards, dones, infos = venv.step(act(obs))
+        running_return += rewards
+        running_length += 1
+        done_idx = np.flatnonzero(dones)
+        if not len(done_idx):
+            continue
+        counted = done_idx[finished[done_idx] < quota[done_idx]]
+        returns.append(running_return[counted])
+        lengths.append(running_length[counted])
+        successes.append(np.array([not infos[i]["TimeLimit.truncated"] for i in counted], dtype=bool))
+        finished[done_idx] += 1
+        running_return[done_idx] = 0
+        running_length[done_idx] = 0
+    venv.close()
+    return {"returns": np.concatenate(returns), "lengths": np.concatenate(lengths),
+            "successes": np.concatenate(successes)}
+
+
+def _mean_ci(values: np.ndarray) -> List[float]:
+    if len(values) < 2:
+        return [float("nan"), float("nan")]
+    half = Z_95 * values.std(ddof=1) / math.sqrt(len(values))
+    return [float(values.mean() - half), float(values.mean() + half)]
+
+
+def summarize(episodes: Dict[str, np.ndarray]) -> Dict[str, object]:
+    """Success rate (Wilson interval), mean return and steps-to-goal (normal intervals), all at 95%"""
+    n = len(episodes["returns"])
+    successes = episodes["successes"]
+    p = successes.mean()
+    denominator = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denominator
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denominator
+    steps_to_goal = episodes["lengths"][successes].astype(np.float64)
+    return {
+        "episodes": n,
+        "success_rate": float(p),
+        "success_rate_ci": [center - half, center + half],
+        "mean_return": float(episodes["returns"].mean()),
+        "mean_return_ci": _mean_ci(episodes["returns"]),
+        "mean_steps_to_goal": float(steps_to_goal.mean()) if len(steps_to_goal) else float("nan"),
+        "mean_steps_to_goal_ci": _mean_ci(steps_to_goal),
+        "mean_length": float(episodes["lengths"].mean()),
+    }
+
+
+def _init_eval_worker(cpus: Optional[Set[int]], niceness: int):
+    """One BLAS/torch thread per worker, pinned to cpus and at lower priority than the learner"""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = "1"
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def evaluate_path(path: str, n_episodes: int, n_envs: int = 256, seed: int = 0, algorithm: Optional[str] = None,
+                  env_kwargs: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """evaluate() of the model saved at path; the pool worker entry point"""
+    return evaluate(load_policy(path, algorithm), n_episodes, n_envs, seed, env_kwargs)
+
+
+def evaluate_model(path: str, n_episodes: int = 5000, n_envs: int = 256, workers: int = 1, seed: int = 0,
+                   algorithm: Optional[str] = None, pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, object]:
+    """Summary of n_episodes of the model at path, split across pool's workers (in-process if no pool).
+
+    Each worker gets its own child seed of seed, so results depend on the
+    seed and the worker count but not on scheduling.
+    """
+    start = time.perf_counter()
+    if pool is None or workers <= 1:
+        episodes = evaluate_path(path, n_episodes, n_envs, seed, algorithm)
+    else:
+        shares = [n_episodes // workers + (i < n_episodes % workers) for i in range(workers)]
+        futures = [pool.submit(evaluate_path, path, share, n_envs, worker_seed, algorithm)
+                   for share, worker_seed in zip(shares, spawn_seeds(seed, workers)) if share]
+        parts = [future.result() for future in futures]
+        episodes = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    summary = summarize(episodes)
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def make_eval_pool(workers: int, cpus: Optional[Set[int]] = None, niceness: int = 0) -> ProcessPoolExecutor:
+    ctx = mp.get_context("spawn")  # fresh interpreters: no forked torch state, thread limits apply
+    return ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_eval_worker, initargs=(cpus, niceness))
+
+
+class AsyncEvalCallback(BaseCallback):
+    """Evaluates snapshots of the model in a background process while training continues.
+
+    Every ``eval_freq`` steps the model (and its VecNormalize statistics) is
+    saved to ``output_dir/eval_<steps>/`` and handed to a one-process pool
+    running evaluate_model; results are logged as ``eval_async/*`` when they
+    come back. At most one evaluation is in flight, so a slow one delays the
+    next instead of queueing. The worker is niced and kept off
+    ``learner_cpus`` (default: the first CPU this process may use) whenever
+    other CPUs are available; pin the learner there, e.g. with ``taskset``.
+    """
+    def __init__(self, output_dir: str, eval_freq: int = 10000, n_episodes: int = 1000, n_envs: int = 256,
+                 seed: int = 0, learner_cpus: Optional[Set[int]] = None, niceness: int = 10, verbose: int = 0):
+        super().__init__(verbose)
+        self.output_dir = output_dir
+        self.eval_freq = eval_freq
+        self.n_episodes = n_episodes
+        self.n_envs = n_envs
+        self.seed = seed
+        self.learner_cpus = learner_cpus
+        self.niceness = niceness
+        self.results: List[Dict[str, object]] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Optional[Future] = None
+        self._pending_steps = 0
+        self._last_eval = 0
+
+    def _init_callback(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        learner = self.learner_cpus if self.learner_cpus is not None else set(available[:1])
+        worker_cpus = set(available) - set(learner)
+        self._pool = make_eval_pool(1, worker_cpus or None, self.niceness)
+
+    def _collect(self, wait: bool = False):
+        if self._pending is None or not (wait or self._pending.done()):
+            return
+        summary = self._pending.result()
+        self._pending = None
+        summary["timesteps"] = self._pending_steps
+        self.results.append(summary)
+        for key in ("success_rate", "mean_return", "mean_steps_to_goal"):
+            self.logger.record(f"eval_async/{key}", summary[key])
+        self.logger.record("eval_async/timesteps", self._pending_steps)
+        with open(os.path.join(self.output_dir, "async_evaluations.jsonl"), "a") as f:
+            f.write(json.dumps(summary) + "\n")
+        if self.verbose:
+            print(f"Async eval at {self._pending_steps} steps: success {summary['success_rate']:.1%}, "
+                  f"return {summary['mean_return']:.2f}")
+
+    def _on_step(self) -> bool:
+        self._collect()
+        if self._pending is None and self.num_timesteps - self._last_eval >= self.eval_freq:
+            self._last_eval = self.num_timesteps
+            snapshot_dir = os.path.join(self.output_dir, f"eval_{self.num_timesteps}")
+            os.makedirs(snapshot_dir, exist_ok=True)
+            algorithm = type(self.model).__name__.lower()
+            path = os.path.join(snapshot_dir, f"custom_env_{algorithm}.zip")
+            self.model.save(path)
+            vec_normalize = self.model.get_vec_normalize_env()
+            if vec_normalize is not None:
+                save_normalization(vec_normalize, snapshot_dir)
+            self._pending = self._pool.submit(evaluate_model, path, self.n_episodes, self.n_envs, 1, self.seed,
+                                              algorithm)
+            self._pending_steps = self.num_timesteps
+        return True
+
+    def _on_training_end(self) -> None:
+        self._collect(wait=True)
+        self._pool.shutdown()
+
+
+def evaluation_from_env(output_dir: str) -> Optional[AsyncEvalCallback]:
+    """AsyncEvalCallback configured from CAREER_EVAL_FREQ / CAREER_EVAL_EPISODES, or None if unset"""
+    eval_freq = os.environ.get(EVAL_FREQ_VAR)
+    if not eval_freq:
+        return None
+    return AsyncEvalCallback(output_dir, int(eval_freq), int(os.environ.get(EVAL_EPISODES_VAR, 1000)), verbose=1)
+
+
+def _format_ci(value: float, ci: List[float], fmt: str) -> str:
+    return f"{value:{fmt}} [{ci[0]:{fmt}}, {ci[1]:{fmt}}]"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate saved models over many seeded episodes in parallel")
+    parser.add_argument("paths", nargs="*", help="model files (default: every model under --root)")
+    parser.add_argument("--root", default="models")
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--envs", type=int, default=256, help="episodes run side by side per worker")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per available CPU")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="also write the summaries to this file")
+    args = parser.parse_args()
+
+    models = {path: path for path in args.paths} if args.paths else find_models(args.root)
+    available = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else range(mp.cpu_count())
+    workers = args.workers or len(available)
+    pool = make_eval_pool(workers) if workers > 1 else None
+    summaries = {}
+    print(f"{'model':<36} {'episodes':>8} {'success % [95% CI]':>22} {'return [95% CI]':>26} "
+          f"{'steps to goal [95% CI]':>26} {'episodes/s':>10}")
+    try:
+        for name, path in models.items():
+            try:
+                required_normalization(algorithm_of(path), path)
+            except MissingNormalizationError as e:
+                summaries[name] = {"unevaluable": str(e)}
+                print(f"{name:<36} unevaluable: no observation statistics saved with it")
+                continue
+            summary = summaries[name] = evaluate_model(path, args.episodes, args.envs, workers, args.seed, pool=pool)
+            success = [100 * x for x in summary["success_rate_ci"]]
+            print(f"{name:<36} {summary['episodes']:>8} {_format_ci(100 * summary['success_rate'], success, '.1f'):>22} "
+                  f"{_format_ci(summary['mean_return'], summary['mean_return_ci'], '.2f'):>26} "
+                  f"{_format_ci(summary['mean_steps_to_goal'], summary['mean_steps_to_goal_ci'], '.1f'):>26} "
+                  f"{summary['episodes'] / summary['seconds']:>10,.0f}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
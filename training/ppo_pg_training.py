@@ -2,35 +2,51 @@ from stable_baselines3 import PPO
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from environment.custom_env import CustomCareerEnv
-from stable_baselines3.common.callbacks import EvalCallback
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv
+from training.env_factory import make_training_env
+from training.evaluation import evaluation_from_env
+from training.profiler import profiler_from_env
+from training.rollout_utils import GAERolloutBuffer, mark_normalized, normalize_observations, save_normalization
 
-def train_pg():
-    env = DummyVecEnv([lambda: Monitor(CustomCareerEnv(render_mode="rgb_array"), filename="./logs/ppo_monitor.csv")])
+PPO_DEFAULTS = dict(
+    learning_rate=3e-4,
+    n_steps=4096,
+    batch_size=128,
+    n_epochs=10,
+    gamma=0.99,
+    gae_lambda=0.95,
+    clip_range=0.2,
+    ent_coef=0.01,
+    rollout_buffer_class=GAERolloutBuffer,
+)
+
+def train_pg(n_envs=1, backend="dummy", total_timesteps=100000, seed=None, output_dir=None, callback=None,
+             **hyperparams):
+    """Train PPO; hyperparams override PPO_DEFAULTS, output_dir redirects every file (for sweeps)"""
+    monitor_file = "./logs/ppo_monitor.csv" if output_dir is None else os.path.join(output_dir, "monitor.csv")
+    model_dir = "models/ppo" if output_dir is None else output_dir
+    log_dir = "./logs/ppo" if output_dir is None else output_dir
+    env = normalize_observations(make_training_env(n_envs, backend, monitor_file=monitor_file, seed=seed))
 
     model = PPO(
         "MlpPolicy",
         env,
         verbose=1,
-        learning_rate=3e-4,
-        n_steps=4096,
-        batch_size=128,
-        n_epochs=10,
-        gamma=0.99,
-        gae_lambda=0.95,
-        clip_range=0.2,
-        ent_coef=0.01,
-        tensorboard_log="./ppo_tensorboard/"
+        **{**PPO_DEFAULTS, **hyperparams},
+        seed=seed,
+        tensorboard_log="./ppo_tensorboard/" if output_dir is None else None
     )
+    mark_normalized(model)
 
     model.learn(
-       total_timesteps=100000
+       total_timesteps=total_timesteps,
+       callback=[c for c in (callback, profiler_from_env(), evaluation_from_env(log_dir)) if c is not None]
     )
 
-    model.save("models/ppo/custom_env_ppo")
+    model.save(os.path.join(model_dir, "custom_env_ppo"))
+    save_normalization(env, model_dir)  # observation statistics the policy was trained on
+    env.close()
     print("PPO training complete and model saved!")
+    return monitor_file
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+import gymnasium as gym
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnvWrapper
+
+# CAREER_PROFILE=<dir> makes the trainers attach a ProfilerCallback writing there;
+# CAREER_PROFILE_SAMPLE_MS=<ms> additionally turns on the sampling profiler
+PROFILE_DIR_VAR = "CAREER_PROFILE"
+SAMPLE_MS_VAR = "CAREER_PROFILE_SAMPLE_MS"
+
+
+class Profiler:
+    """Per-phase wall time and call counts, with a bounded event log for Chrome traces.
+
+    Phases nest: each phase's self time excludes the phases opened inside it,
+    so the self times of one iteration add up to its wall time. Timing is
+    meant for the training thread only; work done in subprocess workers shows
+    up as time in the parent's step_wait.
+    """
+    def __init__(self, max_events: int = 200_000):
+        self.max_events = max_events
+        self.total_ns: Dict[str, int] = defaultdict(int)
+        self.self_ns: Dict[str, int] = defaultdict(int)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.events: List[Tuple[str, int, int]] = []
+        self.dropped_events = 0
+        self.origin_ns = time.perf_counter_ns()
+        # One [name, start, child time] frame per open phase
+        self._stack: List[list] = []
+        self._patched: List[Tuple[object, str, bool, object]] = []
+
+    def begin(self, name: str):
+        self._stack.append([name, time.perf_counter_ns(), 0])
+
+    def end(self):
+        end = time.perf_counter_ns()
+        name, start, child_ns = self._stack.pop()
+        duration = end - start
+        self.total_ns[name] += duration
+        self.self_ns[name] += duration - child_ns
+        self.counts[name] += 1
+        if self._stack:
+            self._stack[-1][2] += duration
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, duration))
+        else:
+            self.dropped_events += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def wrap(self, fn: Callable, name: str) -> Callable:
+        """fn, timed as phase name on every call"""
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            self.begin(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.end()
+        return timed
+
+    def instrument(self, obj, method: str, name: Optional[str] = None):
+        """Replace obj.method on this instance only with a timed version (undone by restore())"""
+        had_own = method in getattr(obj, "__dict__", {})
+        original = getattr(obj, method)
+        self._patched.append((obj, method, had_own, original))
+        setattr(obj, method, self.wrap(original, name or f"{type(obj).__name__}.{method}"))
+
+    def restore(self):
+        """Undo every instrument() call, so instrumented objects can be pickled again"""
+        for obj, method, had_own, original in reversed(self._patched):
+            if had_own:
+                setattr(obj, method, original)
+            else:
+                delattr(obj, method)
+        self._patched.clear()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """(self time ns, count) per phase so far, for computing per-iteration deltas"""
+        return {name: (self.self_ns[name], self.counts[name]) for name in self.counts}
+
+    def summary(self) -> str:
+        wall = max(time.perf_counter_ns() - self.origin_ns, 1)
+        lines = [f"{'phase':<36} {'calls':>10} {'self s':>9} {'total s':>9} {'self %':>7} {'us/call':>9}"]
+        for name in sorted(self.counts, key=self.self_ns.get, reverse=True):
+            lines.append(f"{name:<36} {self.counts[name]:>10,} {self.self_ns[name] / 1e9:>9.2f} "
+                         f"{self.total_ns[name] / 1e9:>9.2f} {100 * self.self_ns[name] / wall:>6.1f}% "
+                         f"{self.total_ns[name] / self.counts[name] / 1e3:>9.1f}")
+        if self.dropped_events:
+            lines.append(f"({self.dropped_events:,} events beyond max_events left out of the trace)")
+        return "\n".join(lines)
+
+    def save_chrome_trace(self, path: str):
+        """Write complete ("X") events in the Chrome trace format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        trace = {
+            "displayTimeUnit": "ms",
+            "traceEvents": [{"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": 0,
+                             "ts": (start - self.origin_ns) / 1e3, "dur": duration / 1e3}
+                            for name, start, duration in self.events],
+        }
+        with open(path, "w") as f:
+            json.dump(trace, f)
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every interval and counts identical stacks.
+
+    Output is the collapsed-stack format read by flamegraph.pl and speedscope.
+    """
+    def __init__(self, interval_ms: float = 5.0, thread_id: Optional[int] = None):
+        self.interval = interval_ms / 1000
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def save_folded(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfiledEnv(gym.Wrapper):
+    """Times step/reset/render of the wrapped environment as env.step/env.reset/env.render"""
+    def __init__(self, env: gym.Env, profiler: Profiler):
+        super().__init__(env)
+        self.step = profiler.wrap(env.step, "env.step")
+        self.reset = profiler.wrap(env.reset, "env.reset")
+        self.render = profiler.wrap(env.render, "env.render")
+
+
+class ProfilerCallback(BaseCallback):
+    """Instruments an SB3 model's hot paths and logs a per-iteration time breakdown.
+
+    An iteration is one rollout plus the training and logging that follow
+    it. Only the policy, logger and env objects are patched, all of which
+    model.save() leaves out, and the patches are undone on training end.
+    Every instrumented phase's self time per iteration is logged as
+    ``profile/<phase>_ms`` (to TensorBoard when the model has a tensorboard
+    log), and the whole run is written to ``output_dir/trace.json`` plus a
+    summary table on training end.
+    """
+    def __init__(self, output_dir: str, sample_interval_ms: Optional[float] = None, max_events: int = 200_000,
+                 verbose: int = 0):
+        super().__init__(verbose)
+        self.output_dir = output_dir
+        self.profiler = Profiler(max_events)
+        self.sampler = SamplingProfiler(sample_interval_ms) if sample_interval_ms else None
+        self._last_snapshot: Dict[str, Tuple[int, int]] = {}
+        self._iteration_start = None
+        self._dummy_vec_env: Optional[DummyVecEnv] = None
+
+    def _instrument_env(self, venv):
+        """Time every VecEnv layer's step/reset, the Monitor CSV writes and (in-process) each env"""
+        while True:
+            self.profiler.instrument(venv, "step_wait")
+            self.profiler.instrument(venv, "reset")
+            results_writer = vars(venv).get("results_writer")  # not getattr: VecEnvWrapper forwards it
+            if results_writer is not None:
+                self.profiler.instrument(results_writer, "write_row", f"{type(venv).__name__}.write_row")
+            if not isinstance(venv, VecEnvWrapper):
+                break
+            venv = venv.venv
+        if isinstance(venv, DummyVecEnv):
+            self._dummy_vec_env = venv
+            venv.envs = [ProfiledEnv(env, self.profiler) for env in venv.envs]
+
+    def _on_training_start(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.profiler.instrument(self.model.policy, "forward", "policy.forward")
+        self.profiler.instrument(self.model.policy, "predict", "policy.predict")
+        self.profiler.instrument(self.model.logger, "dump", "logger.dump")
+        self._instrument_env(self.model.get_env())
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def _log_iteration(self):
+        now = time.perf_counter_ns()
+        snapshot = self.profiler.snapshot()
+        for name, (self_ns, count) in snapshot.items():
+            last_ns, last_count = self._last_snapshot.get(name, (0, 0))
+            if count > last_count:
+                # Not on stdout: its writer cuts keys to 36 characters, and long phase names
+                # (ObservationNormalizer.step_wait_ms / _calls) then collide; summary() covers it
+                self.logger.record_mean(f"profile/{name}_ms", (self_ns - last_ns) / 1e6, exclude=("stdout",))
+                self.logger.record_mean(f"profile/{name}_calls", count - last_count, exclude=("stdout",))
+        if self._iteration_start is not None:
+            self.logger.record_mean("profile/iteration_ms", (now - self._iteration_start) / 1e6)
+        self._last_snapshot = snapshot
+        self._iteration_start = now
+
+    def _on_rollout_start(self) -> None:
+        if self.profiler._stack:
+            self.profiler.end()  # "train"
+        self._log_iteration()
+        self.profiler.begin("rollout")
+
+    def _on_rollout_end(self) -> None:
+        self.profiler.end()
+        # Gradient updates and logging happen between rollouts; timed from here rather than by
+        # patching model.train, which would end up in the pickle of every model.save()
+        self.profiler.begin("train")
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_training_end(self) -> None:
+        while self.profiler._stack:  # a rollout cut short by another callback never reaches _on_rollout_end
+            self.profiler.end()
+        # Put the model back as it was so model.save() can pickle it
+        self.profiler.restore()
+        if self._dummy_vec_env is not None:
+            self._dummy_vec_env.envs = [env.env for env in self._dummy_vec_env.envs]
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler.save_folded(os.path.join(self.output_dir, "stacks.folded"))
+        self.profiler.save_chrome_trace(os.path.join(self.output_dir, "trace.json"))
+        print(self.profiler.summary())
+        print(f"Chrome trace written to {os.path.join(self.output_dir, 'trace.json')}")
+
+
+def profiler_from_env() -> Optional[ProfilerCallback]:
+    """ProfilerCallback configured from CAREER_PROFILE / CAREER_PROFILE_SAMPLE_MS, or None if unset"""
+    output_dir = os.environ.get(PROFILE_DIR_VAR)
+    if not output_dir:
+        return None
+    sample_ms = os.environ.get(SAMPLE_MS_VAR)
+    return ProfilerCallback(output_dir, float(sample_ms) if sample_ms else None)
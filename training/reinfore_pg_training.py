@@ -1,4 +1,3 @@
-import gymnasium as gym
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -8,7 +7,11 @@ import sys
 import os
 import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from environment.custom_env import CustomCareerEnv
+from environment.vec_env import CareerVecEnv
+from environment.seeding import seed_vec_env
+from training.profiler import Profiler, SamplingProfiler, PROFILE_DIR_VAR, SAMPLE_MS_VAR
+from training.rollout_utils import (NORMALIZED_MARKER, discounted_returns, mark_normalized, normalize_observations,
+                                    save_normalization)
 
 class PolicyNetwork(nn.Module):
     def __init__(self, obs_size, n_actions):
@@ -23,73 +26,140 @@ class PolicyNetwork(nn.Module):
     def forward(self, x):
         return self.fc(x)
 
-def train_reinforce(episodes=500):
-    env = CustomCareerEnv()
-    
-    # Observation and action space sizes
-    sample_obs = env.reset()
-    sample_obs = sample_obs[0] if isinstance(sample_obs, tuple) else sample_obs
-    obs_size = np.array(sample_obs).shape[0]
-    n_actions = env.action_space.n
+
+def load_policy_network(path):
+    """PolicyNetwork saved by train_reinforce (sized from its weights), in eval mode"""
+    state_dict = torch.load(path, map_location="cpu")
+    state_dict.pop(NORMALIZED_MARKER, None)
+    network = PolicyNetwork(state_dict["fc.0.weight"].shape[1], state_dict["fc.2.weight"].shape[0])
+    network.load_state_dict(state_dict)
+    network.eval()
+    return network
+
+
+class EpisodeBatch:
+    """Preallocated (T, N) trajectory storage for one synchronous batch of episodes"""
+    def __init__(self, max_steps, n_envs, obs_size):
+        self.obs = torch.zeros((max_steps, n_envs, obs_size))
+        self.actions = torch.zeros((max_steps, n_envs), dtype=torch.int64)
+        self.rewards = torch.zeros((max_steps, n_envs))
+        self.mask = torch.zeros((max_steps, n_envs))
+        self.dones = torch.zeros((max_steps, n_envs))
+        self.length = 0
+
+
+def collect_episodes(policy, venv, batch):
+    """Run one full episode in every sub-environment of venv, filling batch in place"""
+    obs = venv.reset()
+    alive = np.ones(venv.num_envs, dtype=bool)
+    batch.mask.zero_()
+    t = 0
+    with torch.no_grad():
+        while alive.any():
+            batch.obs[t] = torch.from_numpy(obs)
+            actions = Categorical(policy(batch.obs[t])).sample()
+            batch.actions[t] = actions
+            obs, rewards, dones, _ = venv.step(actions.numpy())
+            # Envs auto-reset on done; the steps after an episode ends stay masked out
+            batch.rewards[t] = torch.from_numpy(rewards * alive)
+            batch.mask[t] = torch.from_numpy(alive.astype(np.float32))
+            batch.dones[t] = torch.from_numpy((dones & alive).astype(np.float32))
+            alive &= ~dones
+            t += 1
+    batch.length = t
+    return batch.rewards[:t].sum(dim=0).numpy()
+
+
+def reinforce_update(policy, optimizer, batch, gamma):
+    """One batched forward/backward over every step of every episode in batch"""
+    T = batch.length
+    mask = batch.mask[:T]
+    returns = discounted_returns(batch.rewards[:T], batch.dones[:T], gamma)
+
+    # Normalize each episode's returns over its own steps, as in single-episode REINFORCE
+    lengths = mask.sum(dim=0)
+    mean = returns.sum(dim=0) / lengths
+    std = (((returns - mean) * mask) ** 2).sum(dim=0).div((lengths - 1).clamp(min=1)).sqrt()
+    returns = (returns - mean) / (std + 1e-9)
+
+    probs = policy(batch.obs[:T])
+    log_probs = Categorical(probs).log_prob(batch.actions[:T])
+    loss = -torch.sum(log_probs * returns * mask) / mask.shape[1]
+
+    optimizer.zero_grad()
+    loss.backward()
+    optimizer.step()
+    return loss.item()
+
+
+def train_reinforce(episodes=500, n_envs=1, learning_rate=1e-2, gamma=0.99, seed=None, output_dir=None,
+                    callback=None):
+    """REINFORCE over n_envs episodes run in parallel on a CareerVecEnv, one update per batch.
+
+    callback, if given, is called with the episode rewards so far after each
+    batch; returning False stops training early.
+    """
+    venv = CareerVecEnv(n_envs)
+    if seed is not None:
+        torch.manual_seed(seed)
+        seed_vec_env(venv, seed)
+    venv = normalize_observations(venv)
+    obs_size = venv.observation_space.shape[0]
+    n_actions = venv.action_space.n
 
     policy = PolicyNetwork(obs_size, n_actions)
-    optimizer = optim.Adam(policy.parameters(), lr=1e-2)
-    gamma = 0.99
+    optimizer = optim.Adam(policy.parameters(), lr=learning_rate)
+    batch = EpisodeBatch(venv.max_steps, n_envs, obs_size)
 
     all_rewards = []
 
-    for episode in range(episodes):
-        reset_output = env.reset()
-        state = reset_output[0] if isinstance(reset_output, tuple) else reset_output
-
-        log_probs = []
-        rewards = []
-        done = False
-
-        while not done:
-            state = np.array(state, dtype=np.float32)
-            state_tensor = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
-
-            probs = policy(state_tensor)
-            dist = Categorical(probs)
-            action = dist.sample()
-
-            step_output = env.step(action.item())
-
-            if len(step_output) == 5:
-                next_state, reward, terminated, truncated, _ = step_output
-                done = terminated or truncated
-            else:
-                next_state, reward, done, _ = step_output
-
-            log_probs.append(dist.log_prob(action))
-            rewards.append(reward)
-            state = next_state
-
-        total_reward = sum(rewards)
-        all_rewards.append(total_reward)
-        print(f"Episode {episode + 1}, Total reward: {total_reward}")
-
-        returns = []
-        G = 0
-        for r in reversed(rewards):
-            G = r + gamma * G
-            returns.insert(0, G)
-
-        returns = torch.tensor(returns, dtype=torch.float32)
-        returns = (returns - returns.mean()) / (returns.std() + 1e-9)
-
-        loss = -torch.sum(torch.stack(log_probs) * returns)
-
-        optimizer.zero_grad()
-        loss.backward()
-        optimizer.step()
-
-    torch.save(policy.state_dict(), "models/reinforce_policy.pth")
+    # Batch-level phases are always timed; $CAREER_PROFILE adds per-step timing and writes a trace
+    profiler = Profiler()
+    profile_dir = os.environ.get(PROFILE_DIR_VAR)
+    sampler = None
+    if profile_dir:
+        profiler.instrument(venv, "step_wait")
+        profiler.instrument(venv, "reset")
+        profiler.instrument(policy, "forward", "policy.forward")
+        if os.environ.get(SAMPLE_MS_VAR):
+            sampler = SamplingProfiler(float(os.environ[SAMPLE_MS_VAR]))
+            sampler.start()
+
+    try:
+        while len(all_rewards) < episodes:
+            with profiler.phase("collect_episodes"):
+                episode_rewards = collect_episodes(policy, venv, batch)
+            with profiler.phase("reinforce_update"):
+                reinforce_update(policy, optimizer, batch, gamma)
+            for total_reward in episode_rewards[:episodes - len(all_rewards)]:
+                all_rewards.append(float(total_reward))
+                print(f"Episode {len(all_rewards)}, Total reward: {total_reward}")
+            if callback is not None and not callback(all_rewards):
+                break
+    finally:
+        # Put venv and policy back as they were so the statistics and the model can be pickled
+        profiler.restore()
+        if sampler is not None:
+            sampler.stop()
+
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        if sampler is not None:
+            sampler.save_folded(os.path.join(profile_dir, "stacks.folded"))
+        profiler.save_chrome_trace(os.path.join(profile_dir, "trace.json"))
+        print(profiler.summary())
+
+    model_dir = "models" if output_dir is None else output_dir
+    os.makedirs(model_dir, exist_ok=True)
+    torch.save(mark_normalized(policy.state_dict()), os.path.join(model_dir, "reinforce_policy.pth"))
+    save_normalization(venv, model_dir)  # observation statistics the policy was trained on
     print("REINFORCE training complete and model saved!")
 
-    os.makedirs("logs/reinforce", exist_ok=True)
-    pd.DataFrame(all_rewards, columns=["r"]).to_csv("logs/reinforce/reinforce_rewards.csv", index=False)
+    log_dir = "logs/reinforce" if output_dir is None else output_dir
+    os.makedirs(log_dir, exist_ok=True)
+    rewards_file = os.path.join(log_dir, "reinforce_rewards.csv")
+    pd.DataFrame(all_rewards, columns=["r"]).to_csv(rewards_file, index=False)
+    return rewards_file
 
 if __name__ == "__main__":
     train_reinforce()
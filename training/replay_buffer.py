@@ -0,0 +1,145 @@
+import numpy as np
+import torch as th
+from gymnasium import spaces
+from typing import Any, Dict, List, Optional, Tuple, Union
+from stable_baselines3.common.buffers import BaseBuffer, ReplayBuffer
+from stable_baselines3.common.type_aliases import ReplayBufferSamples
+from stable_baselines3.common.vec_env import VecNormalize
+
+# Bits of CompactReplayBuffer.flags
+DONE = 1
+TIMEOUT = 2
+
+
+class CompactReplayBuffer(ReplayBuffer):
+    """ReplayBuffer for CustomCareerEnv that packs each transition into 10 bytes.
+
+    An observation (row, col, readiness) is stored as two uint8 coordinates
+    and an int16 score, the action as uint8, the reward as float32 and
+    done/timeout as bits of one uint8. next_obs is not stored: it is the
+    observation of the same env one row later, except after a done, where
+    the true terminal observation is kept in a small side table (one entry
+    per episode). The newest row is not sampled because its successor has
+    not been written yet, except while it is the only row: its next_obs is
+    then taken from the latest ``add``.
+
+    ``reward_dtype=np.float16`` saves two more bytes, but the shaped rewards
+    (0.49, -0.11, 1.99, 100.49, ...) are not exact in float16, so training
+    then sees slightly different rewards. SB3's default buffer needs 44 bytes
+    per transition.
+    """
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        n_envs: int = 1,
+        optimize_memory_usage: bool = False,
+        handle_timeout_termination: bool = True,
+        reward_dtype: Any = np.float32,
+    ):
+        # Skip ReplayBuffer.__init__, which would allocate the float32 arrays this class replaces
+        BaseBuffer.__init__(self, buffer_size, observation_space, action_space, device, n_envs=n_envs)
+        if self.obs_shape != (3,) or not isinstance(action_space, spaces.Discrete) or action_space.n > 256:
+            raise ValueError("CompactReplayBuffer expects (row, col, readiness) observations and < 256 actions")
+        for packed, low, high in zip((np.uint8, np.uint8, np.int16), observation_space.low, observation_space.high):
+            if low < np.iinfo(packed).min or high > np.iinfo(packed).max:
+                raise ValueError(f"Observation bounds {observation_space.low}..{observation_space.high} do not fit "
+                                 f"CompactReplayBuffer's uint8 coordinates and int16 readiness; use "
+                                 f"stable_baselines3's ReplayBuffer for this grid size / number of jobs")
+        self.buffer_size = max(buffer_size // n_envs, 1)
+        self.optimize_memory_usage = optimize_memory_usage  # next_obs is always rebuilt from indices
+        self.handle_timeout_termination = handle_timeout_termination
+        self.positions = np.zeros((self.buffer_size, n_envs, 2), dtype=np.uint8)
+        self.readiness = np.zeros((self.buffer_size, n_envs), dtype=np.int16)
+        self.actions = np.zeros((self.buffer_size, n_envs), dtype=np.uint8)
+        self.rewards = np.zeros((self.buffer_size, n_envs), dtype=reward_dtype)
+        self.flags = np.zeros((self.buffer_size, n_envs), dtype=np.uint8)
+        self.terminal_observations: Dict[Tuple[int, int], np.ndarray] = {}
+        self._newest_next_obs = np.zeros((n_envs, 3), dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the transition arrays (the terminal side table adds about one entry per episode)"""
+        return sum(a.nbytes for a in (self.positions, self.readiness, self.actions, self.rewards, self.flags))
+
+    def add(
+        self,
+        obs: np.ndarray,
+        next_obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        done: np.ndarray,
+        infos: List[Dict[str, Any]],
+    ) -> None:
+        row = self.pos
+        for env_idx in np.flatnonzero(self.flags[row] & DONE):
+            self.terminal_observations.pop((row, int(env_idx)), None)
+
+        obs = np.rint(np.asarray(obs).reshape(self.n_envs, 3))
+        self.positions[row] = obs[:, :2]
+        self.readiness[row] = obs[:, 2]
+        self.actions[row] = np.asarray(action).reshape(self.n_envs)
+        self.rewards[row] = reward
+        flags = np.asarray(done, dtype=np.uint8) * DONE
+        if self.handle_timeout_termination:
+            flags |= np.array([info.get("TimeLimit.truncated", False) for info in infos], dtype=np.uint8) * TIMEOUT
+        self.flags[row] = flags
+
+        next_obs = np.asarray(next_obs).reshape(self.n_envs, 3)
+        self._newest_next_obs[:] = np.rint(next_obs)
+        for env_idx in np.flatnonzero(flags & DONE):
+            # SB3 un-normalizes terminal observations, so round off the float error
+            self.terminal_observations[(row, int(env_idx))] = np.rint(next_obs[env_idx]).astype(np.float32)
+
+        self.pos += 1
+        if self.pos == self.buffer_size:
+            self.full = True
+            self.pos = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.flags[:] = 0
+        self.terminal_observations.clear()
+
+    def size(self) -> int:
+        stored = super().size()
+        return max(stored - 1, min(stored, 1))
+
+    def sample(self, batch_size: int, env: Optional[VecNormalize] = None) -> ReplayBufferSamples:
+        if self.full:
+            # Every row but the newest, (pos - 1), whose successor is the oldest row
+            batch_inds = (np.random.randint(0, self.buffer_size - 1, size=batch_size) + self.pos) % self.buffer_size
+        elif self.pos > 1:
+            batch_inds = np.random.randint(0, self.pos - 1, size=batch_size)
+        else:
+            # One row so far (learning_starts=0): sample it, with next_obs from the latest add
+            batch_inds = np.zeros(batch_size, dtype=np.int64)
+        return self._get_samples(batch_inds, env=env)
+
+    def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> ReplayBufferSamples:
+        env_indices = np.random.randint(0, high=self.n_envs, size=(len(batch_inds),))
+        n = len(batch_inds)
+        # obs and next_obs gathered together: rows [0, n) are the sampled rows, [n, 2n) their successors
+        rows = np.concatenate([batch_inds, (batch_inds + 1) % self.buffer_size])
+        envs = np.concatenate([env_indices, env_indices])
+        both = np.empty((2 * n, 3), dtype=np.float32)
+        both[:, :2] = self.positions[rows, envs]
+        both[:, 2] = self.readiness[rows, envs]
+        unwritten = rows[n:] == self.pos  # successor of the newest row, sampled only while it is the only one
+        if not self.full and unwritten.any():
+            both[n:][unwritten] = self._newest_next_obs[env_indices[unwritten]]
+        flags = self.flags[batch_inds, env_indices]
+        for i in np.flatnonzero(flags & DONE):
+            both[n + i] = self.terminal_observations[(int(batch_inds[i]), int(env_indices[i]))]
+        dones = (flags & DONE).astype(bool) & ~(flags & TIMEOUT).astype(bool)
+
+        data = (
+            self._normalize_obs(both[:n], env),
+            self.actions[batch_inds, env_indices].astype(np.int64).reshape(-1, 1),
+            self._normalize_obs(both[n:], env),
+            dones.astype(np.float32).reshape(-1, 1),
+            self._normalize_reward(self.rewards[batch_inds, env_indices].astype(np.float32).reshape(-1, 1), env),
+        )
+        return ReplayBufferSamples(*tuple(map(self.to_torch, data)))
@@ -0,0 +1,195 @@
+import copy
+import json
+import os
+import zipfile
+import numpy as np
+import torch as th
+from typing import Optional
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.vec_env import VecEnv, VecNormalize
+
+# Observation statistics are saved under this name in the directory of the model trained on them
+VECNORMALIZE_FILE = "vecnormalize.pkl"
+
+# Stored in a checkpoint trained on normalized observations: an attribute of SB3 models (saved in the
+# zip's "data") or an extra key of the REINFORCE state dict. Such a checkpoint is unusable without its statistics.
+NORMALIZED_MARKER = "trained_on_normalized_observations"
+
+# Elements (block steps x envs) solved in closed form per iteration of the reverse scan; buffers this
+# wide or wider are scanned one step at a time, which is already vectorized enough across envs
+SCAN_BLOCK_ELEMENTS = 512
+SCAN_LOOP_WIDTH = 64
+
+
+def discounted_scan(x: np.ndarray, dones: np.ndarray, discount: float, last: Optional[np.ndarray] = None,
+                    block: Optional[int] = None) -> np.ndarray:
+    """y[t] = x[t] + discount * (1 - dones[t]) * y[t + 1] over a (T, N) buffer, with y[T] = last.
+
+    Within a block of B steps the recurrence has the closed form
+    y[t] = sum_s discount**(s - t) * x[s] over the s >= t reached before a
+    done, one batched (N, B, B) matmul, so the Python loop runs T / B times
+    instead of T. That pays off for long, narrow buffers (PPO's n_steps x a
+    few envs); wide ones use the plain per-step scan. Computed in float64,
+    returned in x's dtype.
+    """
+    T, N = x.shape
+    out = np.empty((T, N))
+    carry = np.zeros(N) if last is None else np.asarray(last, dtype=np.float64).reshape(N)
+    if block is None:
+        block = 1 if N >= SCAN_LOOP_WIDTH else min(64, SCAN_BLOCK_ELEMENTS // N)
+    if block == 1:
+        keep = discount * (1.0 - np.asarray(dones, dtype=np.float64))
+        for t in range(T - 1, -1, -1):
+            carry = out[t] = x[t] + keep[t] * carry
+        return out.astype(x.dtype, copy=False)
+    steps = np.arange(block)
+    lag = steps[None, :] - steps[:, None]  # s - t
+    weights = np.where(lag >= 0, float(discount) ** np.maximum(lag, 0), 0.0)
+    tail = float(discount) ** (block - steps)  # discount from each step to the block's successor
+    for end in range(T, 0, -block):
+        start = max(0, end - block)
+        B = end - start
+        done = np.asarray(dones[start:end], dtype=np.int64)
+        # Steps t and s are linked when no episode ends in [t, s): equal counts of earlier dones
+        segment = np.cumsum(done, axis=0) - done
+        linked = segment.T[:, :, None] == segment.T[:, None, :]  # (N, t, s)
+        out[start:end] = np.matmul(weights[:B, :B] * linked, x[start:end].T[:, :, None])[:, :, 0].T
+        out[start:end] += tail[block - B:, None] * (segment == segment[-1] + done[-1]) * carry
+        carry = out[start]
+    return out.astype(x.dtype, copy=False)
+
+
+def _numpy(x):
+    return x.detach().cpu().numpy() if th.is_tensor(x) else np.asarray(x)
+
+
+def discounted_returns(rewards, dones, gamma: float, last_values=None):
+    """Discounted returns of a (T, N) reward buffer, cut where dones[t] is set, bootstrapped from last_values.
+
+    Accepts NumPy arrays or torch tensors and returns the same kind.
+    """
+    returns = discounted_scan(_numpy(rewards), _numpy(dones), gamma,
+                              None if last_values is None else _numpy(last_values))
+    return th.from_numpy(returns).to(rewards.device) if th.is_tensor(rewards) else returns
+
+
+def gae(rewards, values, dones, last_values, gamma: float, gae_lambda: float):
+    """GAE(lambda) advantages and lambda-returns over (T, N) buffers.
+
+    dones[t] marks an episode ending at step t, so neither values[t + 1] nor
+    later advantages flow back into it; last_values (N,) bootstraps the step
+    after the buffer. Accepts NumPy arrays or torch tensors and returns the same kind.
+    """
+    r, v, d = _numpy(rewards), _numpy(values), _numpy(dones).astype(np.float64)
+    next_values = np.concatenate([v[1:], _numpy(last_values).reshape(1, -1)]).astype(np.float64)
+    deltas = r + gamma * (1.0 - d) * next_values - v
+    advantages = discounted_scan(deltas, d, gamma * gae_lambda).astype(r.dtype, copy=False)
+    returns = advantages + v
+    if th.is_tensor(rewards):
+        return th.from_numpy(advantages).to(rewards.device), th.from_numpy(returns).to(rewards.device)
+    return advantages, returns
+
+
+class GAERolloutBuffer(RolloutBuffer):
+    """RolloutBuffer whose advantages and returns come from gae() instead of SB3's per-step loop"""
+    def compute_returns_and_advantage(self, last_values: th.Tensor, dones: np.ndarray) -> None:
+        # SB3 stores episode starts; an episode ending at step t is one starting at t + 1
+        episode_ends = np.concatenate([self.episode_starts[1:], dones.reshape(1, -1)]).astype(np.float32)
+        self.advantages, self.returns = gae(self.rewards, self.values, episode_ends,
+                                            last_values.flatten(), self.gamma, self.gae_lambda)
+
+
+class ObservationNormalizer(VecNormalize):
+    """VecNormalize for observations only, with a leaner per-step path.
+
+    Same statistics, file format and EvalCallback syncing as
+    VecNormalize(norm_obs=True, norm_reward=False), but a step skips the
+    unused reward statistics, the deepcopy of every observation and the
+    scan over every env's info, which together cost more than stepping
+    CareerVecEnv itself. Box observation spaces only.
+    """
+    def __init__(self, venv: VecEnv, clip_obs: float = 10.0, epsilon: float = 1e-8):
+        super().__init__(venv, norm_obs=True, norm_reward=False, clip_obs=clip_obs, epsilon=epsilon)
+
+    def _update_obs_stats(self, obs: np.ndarray):
+        # Batch moments in one pass each, merged with the parallel-variance update
+        batch_mean = obs.sum(axis=0, dtype=np.float64) / len(obs)
+        batch_var = np.square(obs - batch_mean).sum(axis=0) / len(obs)
+        self.obs_rms.update_from_moments(batch_mean, batch_var, len(obs))
+
+    def normalize_obs(self, obs: np.ndarray) -> np.ndarray:
+        scaled = (obs - self.obs_rms.mean) / np.sqrt(self.obs_rms.var + self.epsilon)
+        return np.clip(scaled, -self.clip_obs, self.clip_obs).astype(np.float32)
+
+    def step_wait(self):
+        obs, rewards, dones, infos = self.venv.step_wait()
+        self.old_obs = obs
+        self.old_reward = rewards
+        if self.training:
+            self._update_obs_stats(obs)
+        for i in np.flatnonzero(dones):
+            if "terminal_observation" in infos[i]:
+                infos[i]["terminal_observation"] = self.normalize_obs(infos[i]["terminal_observation"])
+        return self.normalize_obs(obs), rewards, dones, infos
+
+
+def normalize_observations(venv: VecEnv) -> ObservationNormalizer:
+    """Running mean/variance observation normalization shared by every trainer (rewards left raw)"""
+    return ObservationNormalizer(venv)
+
+
+def normalization_snapshot(venv: VecNormalize) -> VecNormalize:
+    """Detached copy of venv's settings and running statistics, safe to pickle while training uses venv.
+
+    Per-instance method patches (the profiler's timed step_wait/reset) are
+    left out and every array is copied, so later updates do not leak in.
+    """
+    state = {key: value for key, value in venv.__getstate__().items()
+             if not callable(getattr(type(venv), key, None))}
+    snapshot = type(venv).__new__(type(venv))
+    snapshot.__setstate__(copy.deepcopy(state))
+    # Dropped by __getstate__ and expected back by it when the snapshot is pickled
+    snapshot.class_attributes = {}
+    snapshot.returns = None
+    return snapshot
+
+
+def save_normalization(venv: VecNormalize, model_dir: str) -> str:
+    """Save a snapshot of venv's observation statistics next to the model trained on them"""
+    path = os.path.join(model_dir, VECNORMALIZE_FILE)
+    os.makedirs(model_dir, exist_ok=True)
+    normalization_snapshot(venv).save(path)
+    return path
+
+
+def mark_normalized(checkpoint):
+    """Tag an SB3 model or a REINFORCE state dict as trained on normalized observations; returns it"""
+    if isinstance(checkpoint, dict):
+        checkpoint[NORMALIZED_MARKER] = th.ones(())
+    else:
+        setattr(checkpoint, NORMALIZED_MARKER, True)
+    return checkpoint
+
+
+def is_marked_normalized(model_path: str) -> bool:
+    """Whether the checkpoint at model_path (SB3 zip or REINFORCE .pth) carries NORMALIZED_MARKER"""
+    if model_path.endswith(".zip"):
+        with zipfile.ZipFile(model_path) as archive:
+            return bool(json.loads(archive.read("data")).get(NORMALIZED_MARKER))
+    if model_path.endswith(".pth"):
+        return NORMALIZED_MARKER in th.load(model_path, map_location="cpu")
+    return False
+
+
+def find_normalization(model_path: str) -> Optional[str]:
+    """Statistics save_normalization stored for the model at model_path; EvalCallback's best_model/ uses its parent's"""
+    directory = os.path.dirname(model_path)
+    candidates = [directory]
+    if os.path.basename(directory) == "best_model":
+        candidates.append(os.path.dirname(directory))
+    for candidate in candidates:
+        path = os.path.join(candidate, VECNORMALIZE_FILE)
+        if os.path.exists(path):
+            return path
+    return None
+
@@ -0,0 +1,96 @@
+import sqlite3
+import time
+from contextlib import closing
+import numpy as np
+from typing import Callable, List
+from stable_baselines3.common.callbacks import BaseCallback
+
+# What each trainer's budget is counted in: SB3 trainers in environment steps, REINFORCE in episodes
+BUDGET_PARAMS = {"dqn": "total_timesteps", "ppo": "total_timesteps", "a2c": "total_timesteps",
+                 "reinforce": "episodes"}
+
+
+class ASHAScheduler:
+    """Asynchronous successive halving with early stopping, shared through the sweep's SQLite store.
+
+    Rung k sits at ``min_budget * eta**k``. When a trial reaches a rung it
+    records its current score there, and keeps training (is promoted to the
+    next rung) only if that score is in the top ``1/eta`` of all scores
+    recorded at the rung so far. Decisions never wait for other trials, so
+    the pool stays busy; trials are stopped rather than paused.
+    """
+    def __init__(self, db_path: str, sweep: str, min_budget: int, max_budget: int, eta: int = 3,
+                 min_results: int = 1):
+        self.db_path = db_path
+        self.sweep = sweep
+        self.eta = eta
+        self.min_results = min_results
+        self.rungs: List[int] = []
+        budget = min_budget
+        while budget < max_budget:
+            self.rungs.append(int(budget))
+            budget *= eta
+        with closing(self._connect()) as db, db:
+            db.execute("""CREATE TABLE IF NOT EXISTS rungs (
+                sweep TEXT, key TEXT, rung INTEGER, budget INTEGER, score REAL, recorded REAL,
+                PRIMARY KEY (sweep, key, rung))""")
+
+    def _connect(self):
+        # Every worker reports through its own connection; SQLite serializes the writes
+        return sqlite3.connect(self.db_path, timeout=60)
+
+    def report(self, key: str, rung: int, score: float) -> bool:
+        """Record score at rung and return whether the trial should continue"""
+        with closing(self._connect()) as db, db:
+            db.execute("INSERT OR REPLACE INTO rungs VALUES (?, ?, ?, ?, ?, ?)",
+                       (self.sweep, key, rung, self.rungs[rung], score, time.time()))
+            scores = [s for (s,) in db.execute(
+                "SELECT score FROM rungs WHERE sweep = ? AND rung = ? AND key != ?", (self.sweep, rung, key))]
+        if len(scores) < self.min_results:
+            return True
+        cutoff = np.percentile(scores + [score], (1 - 1 / self.eta) * 100)
+        return score >= cutoff
+
+
+class RungCallback(BaseCallback):
+    """Reports the rolling episode reward to an ASHAScheduler at each rung and stops weak trials"""
+    def __init__(self, scheduler: ASHAScheduler, key: str):
+        super().__init__()
+        self.scheduler = scheduler
+        self.key = key
+        self.rung = 0
+        self.stopped = False
+        self.budget_used = 0
+
+    def _on_step(self) -> bool:
+        rungs = self.scheduler.rungs
+        if self.rung >= len(rungs) or self.num_timesteps < rungs[self.rung]:
+            return True
+        if not self.model.ep_info_buffer:
+            return True  # no finished episode to score yet, report on a later step
+        score = float(np.mean([info["r"] for info in self.model.ep_info_buffer]))
+        self.stopped = not self.scheduler.report(self.key, self.rung, score)
+        self.rung += 1
+        return not self.stopped
+
+    def _on_training_end(self) -> None:
+        self.budget_used = self.num_timesteps
+
+
+def episode_rung_callback(scheduler: ASHAScheduler, key: str, window: int = 100) -> Callable[[List[float]], bool]:
+    """REINFORCE equivalent of RungCallback: scores the mean of the last `window` episode rewards"""
+    state = {"rung": 0, "stopped": False, "budget_used": 0}
+
+    def callback(episode_rewards: List[float]) -> bool:
+        state["budget_used"] = len(episode_rewards)
+        while state["rung"] < len(scheduler.rungs) and len(episode_rewards) >= scheduler.rungs[state["rung"]]:
+            budget = scheduler.rungs[state["rung"]]
+            score = float(np.mean(episode_rewards[max(0, budget - window):budget]))
+            if not scheduler.report(key, state["rung"], score):
+                state["stopped"] = True
+                return False
+            state["rung"] += 1
+        return True
+
+    callback.state = state
+    return callback
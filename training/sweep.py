@@ -0,0 +1,246 @@
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import sys
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Trainer entry points by algorithm name, imported in the worker so the parent never loads torch
+TRAINERS = {
+    "dqn": ("training.dqn_training", "train_dqn"),
+    "ppo": ("training.ppo_pg_training", "train_pg"),
+    "a2c": ("training.a2c_pg_training", "train_a2c"),
+    "reinforce": ("training.reinfore_pg_training", "train_reinforce"),
+}
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def _sample(rng: np.random.Generator, space):
+    """One draw from a random-search space: a list of choices or {"low", "high", "log", "int"}"""
+    if isinstance(space, list):
+        return space[rng.integers(len(space))]
+    low, high = space["low"], space["high"]
+    value = np.exp(rng.uniform(np.log(low), np.log(high))) if space.get("log") else rng.uniform(low, high)
+    return int(round(value)) if space.get("int") else float(value)
+
+
+def expand_trials(spec: Dict) -> List[Dict]:
+    """Trials of a sweep spec: each hyperparameter setting (grid or random) crossed with every seed.
+
+    The expansion is deterministic (random search draws from ``search_seed``),
+    so re-running a spec yields the same trial keys and resumes instead of
+    starting over.
+    """
+    params = spec.get("params", {})
+    names = sorted(params)
+    if spec.get("search", "grid") == "grid":
+        settings = [dict(zip(names, values)) for values in itertools.product(*(params[n] for n in names))]
+    else:
+        rng = np.random.default_rng(spec.get("search_seed", 0))
+        settings = [{name: _sample(rng, params[name]) for name in names} for _ in range(spec["n_trials"])]
+
+    trials = []
+    for setting in settings:
+        for seed in spec.get("seeds", [0]):
+            config = {**spec.get("fixed", {}), **setting}
+            body = json.dumps({"sweep": spec["name"], "algorithm": spec["algorithm"], "config": config, "seed": seed},
+                              sort_keys=True)
+            trials.append({"key": hashlib.sha1(body.encode()).hexdigest()[:16], "algorithm": spec["algorithm"],
+                           "config": config, "seed": seed})
+    return trials
+
+
+class TrialStore:
+    """SQLite record of every trial's status and result; only the sweep's parent process writes to it"""
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS trials (
+            key TEXT PRIMARY KEY, sweep TEXT, algorithm TEXT, config TEXT, seed INTEGER,
+            status TEXT, attempts INTEGER DEFAULT 0, result TEXT, error TEXT,
+            started REAL, finished REAL)""")
+        self.db.commit()
+
+    def add(self, sweep: str, trials: List[Dict]):
+        """Register trials; ones already in the store keep their status"""
+        self.db.executemany(
+            "INSERT OR IGNORE INTO trials (key, sweep, algorithm, config, seed, status) VALUES (?, ?, ?, ?, ?, 'pending')",
+            [(t["key"], sweep, t["algorithm"], json.dumps(t["config"], sort_keys=True), t["seed"]) for t in trials])
+        # Trials left 'running' belong to a sweep that crashed or was killed
+        self.db.execute("UPDATE trials SET status = 'pending' WHERE sweep = ? AND status = 'running'", (sweep,))
+        self.db.commit()
+
+    def pending(self, sweep: str, retry_failed: bool = False) -> List[Dict]:
+        statuses = ("pending", "failed") if retry_failed else ("pending",)
+        rows = self.db.execute(
+            f"SELECT key, algorithm, config, seed FROM trials WHERE sweep = ? AND status IN ({','.join('?' * len(statuses))})"
+            " ORDER BY rowid", (sweep, *statuses)).fetchall()
+        return [{"key": k, "algorithm": a, "config": json.loads(c), "seed": s} for k, a, c, s in rows]
+
+    def mark_running(self, key: str):
+        self.db.execute("UPDATE trials SET status = 'running', attempts = attempts + 1, started = ? WHERE key = ?",
+                        (time.time(), key))
+        self.db.commit()
+
+    def mark_done(self, key: str, result: Dict):
+        self.db.execute("UPDATE trials SET status = 'done', result = ?, error = NULL, finished = ? WHERE key = ?",
+                        (json.dumps(result), time.time(), key))
+        self.db.commit()
+
+    def mark_failed(self, key: str, error: str):
+        self.db.execute("UPDATE trials SET status = 'failed', error = ?, finished = ? WHERE key = ?",
+                        (error, time.time(), key))
+        self.db.commit()
+
+    def results(self, sweep: str) -> List[Dict]:
+        rows = self.db.execute("SELECT key, config, seed, status, result FROM trials WHERE sweep = ? ORDER BY rowid",
+                               (sweep,)).fetchall()
+        return [{"key": k, "config": json.loads(c), "seed": s, "status": st, "result": json.loads(r) if r else None}
+                for k, c, s, st, r in rows]
+
+
+def _init_worker(cpu_slots, threads: int):
+    """Pin this pool worker to its own CPU slot and cap BLAS/torch threads before torch is imported"""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    cpus = cpu_slots.get()
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+
+def run_trial(algorithm: str, config: Dict, seed: int, output_dir: str, threads: int = 1,
+              key: Optional[str] = None, asha: Optional[Dict] = None) -> Dict:
+    """Train one trial into output_dir and summarize its reward log.
+
+    With an ``asha`` scheduler spec the trainer reports to an ASHAScheduler
+    at each rung and may be stopped before its full budget.
+    """
+    import importlib
+    import inspect
+    import contextlib
+    import torch
+    from analysis.monitor_aggregator import MonitorAggregator
+
+    torch.set_num_threads(threads)
+    os.makedirs(output_dir, exist_ok=True)
+    module_name, function_name = TRAINERS[algorithm]
+    trainer = getattr(importlib.import_module(module_name), function_name)
+
+    callback, budget = None, {}
+    if asha is not None:
+        from training.scheduler import ASHAScheduler, BUDGET_PARAMS, RungCallback, episode_rung_callback
+        budget_param = BUDGET_PARAMS[algorithm]
+        max_budget = config.get(budget_param, inspect.signature(trainer).parameters[budget_param].default)
+        scheduler = ASHAScheduler(asha["db_path"], asha["sweep"], asha["min_budget"], max_budget,
+                                  asha.get("eta", 3), asha.get("min_results", 1))
+        callback = episode_rung_callback(scheduler, key) if algorithm == "reinforce" else RungCallback(scheduler, key)
+        budget["max_budget"] = max_budget
+
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, "train.log"), "w") as log, contextlib.redirect_stdout(log):
+        reward_log = trainer(seed=seed, output_dir=output_dir, callback=callback, **config)
+    if callback is not None:
+        state = callback.state if algorithm == "reinforce" else vars(callback)
+        budget.update(budget=state["budget_used"], stopped=state["stopped"])
+    aggregator = MonitorAggregator(reward_log, is_monitor=algorithm != "reinforce",
+                                   cache_dir=os.path.join(output_dir, "cache"))
+    aggregator.update()
+    return {**aggregator.summary(), **budget, "seconds": time.perf_counter() - start}
+
+
+def run_sweep(spec: Dict, db_path: str = "sweeps/sweeps.db", workers: Optional[int] = None,
+              threads_per_job: int = 1, pin_cpus: bool = True, retry_failed: bool = False) -> List[Dict]:
+    """Run every unfinished trial of spec on a local process pool, recording progress in db_path"""
+    sweep = spec["name"]
+    asha = None
+    if spec.get("scheduler"):
+        if spec["scheduler"].get("type", "asha") != "asha":
+            raise ValueError(f"Unknown scheduler {spec['scheduler']['type']!r}")
+        asha = {**spec["scheduler"], "db_path": os.path.abspath(db_path), "sweep": sweep}
+    store = TrialStore(db_path)
+    store.add(sweep, expand_trials(spec))
+    todo = store.pending(sweep, retry_failed)
+    sweep_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), sweep)
+    print(f"Sweep {sweep}: {len(todo)} trials to run")
+
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(mp.cpu_count()))
+    workers = workers or max(1, len(available) // threads_per_job)
+    ctx = mp.get_context("spawn")  # fresh interpreters: no forked torch state, thread limits apply
+    cpu_slots = ctx.Queue()
+    for i in range(workers):
+        slot = available[(i * threads_per_job) % len(available):][:threads_per_job] if pin_cpus else None
+        cpu_slots.put(set(slot) if slot else None)
+
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(cpu_slots, threads_per_job)) as pool:
+        queue, running = list(todo), {}
+        while queue or running:
+            while queue and len(running) < workers:
+                trial = queue.pop(0)
+                store.mark_running(trial["key"])
+                future = pool.submit(run_trial, trial["algorithm"], trial["config"], trial["seed"],
+                                     os.path.join(sweep_dir, trial["key"]), threads_per_job, trial["key"], asha)
+                running[future] = trial
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    store.mark_failed(trial["key"], repr(e))
+                    print(f"[failed] {trial['key']} {trial['config']} seed={trial['seed']}: {e!r}")
+                else:
+                    store.mark_done(trial["key"], result)
+                    label = "[stopped]" if result.get("stopped") else "[done]   "
+                    print(f"{label} {trial['key']} {trial['config']} seed={trial['seed']}: "
+                          f"rolling reward {result.get('rolling_r', float('nan')):.2f}")
+    results = store.results(sweep)
+    if asha is not None:
+        _print_compute_saved(results)
+    return results
+
+
+def _print_compute_saved(results: List[Dict]):
+    """Budget actually spent by the scheduled trials against running each one to its full budget"""
+    scheduled = [t["result"] for t in results if t["status"] == "done" and "max_budget" in t["result"]]
+    if not scheduled:
+        return
+    used = sum(r["budget"] for r in scheduled)
+    full = sum(r["max_budget"] for r in scheduled)
+    stopped = sum(r["stopped"] for r in scheduled)
+    print(f"ASHA: stopped {stopped}/{len(scheduled)} trials early, used {used}/{full} budget "
+          f"({100 * (1 - used / full):.1f}% compute saved)")
+
+
+def _print_leaderboard(results: List[Dict], top: int = 10):
+    """Settings ranked by the mean over seeds of each trial's final rolling reward (full-budget trials only)"""
+    by_config = {}
+    for trial in results:
+        if trial["status"] == "done" and "rolling_r" in trial["result"] and not trial["result"].get("stopped"):
+            by_config.setdefault(json.dumps(trial["config"], sort_keys=True), []).append(trial["result"]["rolling_r"])
+    ranked = sorted(by_config.items(), key=lambda item: -np.mean(item[1]))
+    for config, scores in ranked[:top]:
+        print(f"{np.mean(scores):8.2f} (+/- {np.std(scores):.2f}, {len(scores)} seeds)  {config}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a resumable hyperparameter sweep on a local process pool")
+    parser.add_argument("spec", help="JSON sweep spec: name, algorithm, search, params, fixed, seeds[, n_trials, scheduler]")
+    parser.add_argument("--db", default="sweeps/sweeps.db")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per threads-per-job CPUs")
+    parser.add_argument("--threads-per-job", type=int, default=1)
+    parser.add_argument("--no-pin", action="store_true", help="do not pin workers to CPUs")
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        sweep_spec = json.load(f)
+    _print_leaderboard(run_sweep(sweep_spec, args.db, args.workers, args.threads_per_job,
+                                 not args.no_pin, args.retry_failed))